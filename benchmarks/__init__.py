@@ -0,0 +1,7 @@
+"""
+Benchmarks for Momentum Track
+Seeded synthetic datasets and timed runs of the database and backup hot paths.
+
+    python -m benchmarks.run --size 100k
+    python -m benchmarks.events            # event dispatch cost
+"""
@@ -0,0 +1,263 @@
+"""
+Benchmark Cases - the database and backup hot paths
+
+Each case runs against a working copy of a generated dataset. Only run() is
+timed; setup(), before_each() and after_each() prepare and restore state
+outside the measurement.
+"""
+
+import random
+import sqlite3
+from pathlib import Path
+
+from database.db_manager import DatabaseManager
+from utils.backup_manager import BackupManager
+
+
+class BenchmarkContext:
+    """Shared state for all cases of one run"""
+
+    def __init__(self, db_path, work_dir, seed=42):
+        self.db_path = str(db_path)
+        self.work_dir = Path(work_dir)
+        self.rng = random.Random(seed)
+
+        self.db = DatabaseManager(db_name=self.db_path, trace=False)
+        self.backups = BackupManager(self.db, backup_dir=self.work_dir / "backups")
+
+        conn = self.db.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT id FROM task_lists ORDER BY id')
+            self.list_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute("SELECT id FROM task_lists WHERE category = 'daily' ORDER BY id")
+            self.daily_list_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute('SELECT id FROM tasks WHERE parent_id IS NULL ORDER BY id')
+            self.top_level_ids = [row[0] for row in cursor.fetchall()]
+            cursor.execute('SELECT MAX(id) FROM tasks')
+            self.max_task_id = cursor.fetchone()[0] or 0
+        finally:
+            conn.close()
+
+    def snapshot(self, name):
+        """Copy the working database aside (untimed), for restore()"""
+        path = self.work_dir / f"{name}_snapshot.db"
+        self._copy_database(self.db_path, path)
+        return path
+
+    def restore(self, path):
+        """Put the working database back to a snapshot's state"""
+        self._copy_database(path, self.db_path)
+
+    @staticmethod
+    def _copy_database(source_path, target_path):
+        source = sqlite3.connect(str(source_path))
+        target = sqlite3.connect(str(target_path))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+
+class BenchmarkCase:
+    """Base case: override run() and, if needed, the untimed hooks"""
+
+    name = None
+    iterations = 50
+    warmup = 2
+
+    def __init__(self, context):
+        self.ctx = context
+
+    def setup(self):
+        pass
+
+    def before_each(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+    def after_each(self):
+        pass
+
+    def teardown(self):
+        pass
+
+
+class GetTasksByListCase(BenchmarkCase):
+    """Load a full list with subtasks, as MainScreen does on every switch"""
+
+    name = "get_tasks_by_list"
+    iterations = 30
+
+    def before_each(self):
+        self.list_id = self.ctx.rng.choice(self.ctx.list_ids)
+
+    def run(self):
+        self.ctx.db.get_tasks_by_list(self.list_id)
+
+
+class GetTaskByIdCase(BenchmarkCase):
+    name = "get_task_by_id"
+    iterations = 200
+
+    def before_each(self):
+        self.task_id = self.ctx.rng.choice(self.ctx.top_level_ids)
+
+    def run(self):
+        self.ctx.db.get_task_by_id(self.task_id)
+
+
+class SearchTasksCase(BenchmarkCase):
+    """Common word, two-word phrase, short prefix and a miss"""
+
+    name = "search_tasks"
+    iterations = 40
+    terms = ("budget", "review project", "ca", "no-such-task")
+
+    def setup(self):
+        self.index = 0
+
+    def before_each(self):
+        self.term = self.terms[self.index % len(self.terms)]
+        self.index += 1
+
+    def run(self):
+        self.ctx.db.search_tasks(self.term)
+
+
+class ToggleTaskCase(BenchmarkCase):
+    name = "toggle_task"
+    iterations = 200
+
+    def before_each(self):
+        self.task_id = self.ctx.rng.randint(1, self.ctx.max_task_id)
+
+    def run(self):
+        self.ctx.db.toggle_task_completed(self.task_id)
+
+    def after_each(self):
+        # Toggle back so the completed/open mix stays the same across iterations
+        self.ctx.db.toggle_task_completed(self.task_id)
+
+
+class BatchUpdateCase(BenchmarkCase):
+    """Update 100 random tasks in one transaction"""
+
+    name = "batch_update_tasks"
+    iterations = 30
+    batch_size = 100
+
+    def before_each(self):
+        rng = self.ctx.rng
+        self.updates = [
+            (rng.randint(1, self.ctx.max_task_id),
+             {'completed': rng.random() < 0.5, 'position': rng.randint(0, 1000)})
+            for _ in range(self.batch_size)
+        ]
+
+    def run(self):
+        self.ctx.db.batch_update_tasks(self.updates)
+
+
+class CreateFullBackupCase(BenchmarkCase):
+    name = "create_full_backup"
+    iterations = 5
+    warmup = 1
+
+    def run(self):
+        self.path = self.ctx.backups.create_full_backup()
+
+    def after_each(self):
+        if self.path:
+            Path(self.path).unlink(missing_ok=True)
+
+
+class ImportBackupCase(BenchmarkCase):
+    """
+    Merge-import a backup of the same data (the idempotent re-import path).
+    Every iteration starts from the same database state, untimed.
+    """
+
+    name = "import_backup"
+    iterations = 12
+    warmup = 1
+
+    def setup(self):
+        self.path = self.ctx.backups.create_full_backup()
+        self.snapshot = self.ctx.snapshot(self.name)
+
+    def before_each(self):
+        self.ctx.restore(self.snapshot)
+
+    def run(self):
+        self.ctx.backups.import_from_backup(self.path, mode="merge")
+
+    def teardown(self):
+        if self.path:
+            Path(self.path).unlink(missing_ok=True)
+        self.snapshot.unlink(missing_ok=True)
+
+
+class CleanupCompletedCase(BenchmarkCase):
+    """
+    Archive completed daily tasks. Each iteration restores the same database
+    state and re-seeds 1% of the dataset (at least 100) as completed daily
+    tasks, untimed, so the archive does not grow from one iteration to the next.
+    """
+
+    name = "cleanup_completed_daily"
+    iterations = 20
+    warmup = 1
+
+    def setup(self):
+        # Start from a steady state: the dataset's own completed daily tasks
+        self.ctx.db.cleanup_completed_daily_tasks()
+        self.batch_size = max(100, len(self.ctx.top_level_ids) // 100)
+        self.snapshot = self.ctx.snapshot(self.name)
+
+    def before_each(self):
+        self.ctx.restore(self.snapshot)
+        rng = self.ctx.rng
+        rows = [
+            (rng.choice(self.ctx.daily_list_ids), f"Done task {i}", 1, i, DatabaseManager._new_uuid())
+            for i in range(self.batch_size)
+        ]
+        with self.ctx.db.get_connection_context() as conn:
+            conn.executemany('''
+                INSERT INTO tasks (list_id, title, completed, position, uuid, modified_at)
+                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', rows)
+
+    def run(self):
+        self.ctx.db.cleanup_completed_daily_tasks()
+
+    def teardown(self):
+        self.snapshot.unlink(missing_ok=True)
+
+
+# Read-only cases first; cleanup last since it deletes rows
+CASES = (
+    GetTasksByListCase,
+    GetTaskByIdCase,
+    SearchTasksCase,
+    ToggleTaskCase,
+    BatchUpdateCase,
+    CreateFullBackupCase,
+    ImportBackupCase,
+    CleanupCompletedCase,
+)
+
+
+def get_cases(names=None):
+    """Case classes in run order, optionally filtered by name"""
+    if not names:
+        return list(CASES)
+
+    by_name = {case.name: case for case in CASES}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown benchmark case(s): {', '.join(unknown)}")
+    return [case for case in CASES if case.name in names]
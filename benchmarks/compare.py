@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark Regression Gate
+Stores baselines on disk and compares new runs against them on p50 and p95.
+
+A case regresses only when the slowdown is larger than the threshold, larger
+than the spread between rounds of either run, and statistically significant.
+
+Samples taken inside one process are not independent: they share its caches,
+allocator state, CPU frequency and whatever else the machine was doing, and
+drift together, so two runs of identical code can differ by 20% with a
+p-value of zero if iterations are treated as samples. The gate therefore only
+looks at per-round statistics (each round is a separate process, see
+benchmarks.run). On shared machines whole runs can also be faster or slower
+for a while, so when both runs recorded a calibration the per-round values
+are speed-adjusted (sample / reference workload time measured just before
+it) and shown scaled to the baseline's speed:
+
+    p50, p95: median over rounds of the per-round value; a regression needs
+              current/baseline > 1 + threshold, a difference beyond the
+              between-round range of both runs, and a one-sided Mann-Whitney U
+              test on the per-round values with p < alpha (only with at least
+              MIN_ROUNDS rounds per side)
+
+    python -m benchmarks.compare benchmarks/results/bench_100k_20260101_120000.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import mann_whitney_greater, percentile
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+DEFAULT_THRESHOLD = 0.10    # 10% slower
+DEFAULT_ALPHA = 0.05
+MIN_DELTA_MS = 0.05         # ignore differences below timer noise
+MIN_ROUNDS = 5
+
+# Dataset fields that must match for a comparison to be meaningful
+DATASET_KEYS = ('size', 'seed', 'indexes', 'lists', 'tasks')
+ENVIRONMENT_KEYS = ('python', 'sqlite', 'machine', 'cpu_count')
+
+
+def baseline_path(dataset, baseline_dir=BASELINE_DIR):
+    suffix = "_idx" if dataset.get('indexes') else ""
+    return Path(baseline_dir) / f"baseline_{dataset['size']}_seed{dataset['seed']}{suffix}.json"
+
+
+def save_baseline(results, baseline_dir=BASELINE_DIR):
+    """Store a results dict as the baseline for its dataset"""
+    path = baseline_path(results['dataset'], baseline_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return path
+
+
+def load_results(filepath):
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_baseline(dataset, baseline_dir=BASELINE_DIR):
+    """Baseline results for a dataset, or None if none was saved"""
+    path = baseline_path(dataset, baseline_dir)
+    if not path.exists():
+        return None
+    return load_results(path)
+
+
+def round_values(baseline, current, metric):
+    """
+    Per-round values of a metric for both sides (results without rounds count
+    as one round). Speed-adjusted and scaled to the baseline's calibration
+    when every round of both runs has one, raw milliseconds otherwise.
+    """
+    base_rounds = baseline.get('rounds') or [baseline['summary']]
+    cur_rounds = current.get('rounds') or [current['summary']]
+
+    if all('adjusted' in summary for summary in base_rounds + cur_rounds):
+        scale = percentile(sorted(summary['calibration_ms'] for summary in base_rounds), 50)
+        return ([summary['adjusted'][metric] * scale for summary in base_rounds],
+                [summary['adjusted'][metric] * scale for summary in cur_rounds])
+    return [summary[metric] for summary in base_rounds], [summary[metric] for summary in cur_rounds]
+
+
+def compare_case(name, baseline, current, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA):
+    """
+    Compare one case's per-round statistics.
+
+    Returns:
+        Dict with per-metric rows and the overall status
+        ("regressed", "improved" or "ok")
+    """
+    metrics = []
+    for metric in ('p50', 'p95'):
+        base_values, cur_values = round_values(baseline, current, metric)
+        before = percentile(sorted(base_values), 50)
+        after = percentile(sorted(cur_values), 50)
+        change = (after - before) / before if before else 0.0
+        meaningful = abs(after - before) >= MIN_DELTA_MS
+
+        if min(len(base_values), len(cur_values)) < MIN_ROUNDS:
+            slower = faster = False
+            evidence = f"rounds<{MIN_ROUNDS}, not tested"
+        else:
+            _, p_slower = mann_whitney_greater(base_values, cur_values)
+            _, p_faster = mann_whitney_greater(cur_values, base_values)
+            # Noise floor: neither run's rounds may disagree by as much as the change
+            spread = max(max(base_values) - min(base_values), max(cur_values) - min(cur_values))
+            slower = p_slower < alpha and after - before > spread
+            faster = p_faster < alpha and before - after > spread
+            p_value = p_slower if change >= 0 else p_faster
+            evidence = f"p={p_value:.3f} spread {spread:.2f}ms"
+
+        if meaningful and change > threshold and slower:
+            status = "regressed"
+        elif meaningful and change < -threshold and faster:
+            status = "improved"
+        else:
+            status = "ok"
+
+        metrics.append({
+            'metric': metric,
+            'baseline': before,
+            'current': after,
+            'change': change,
+            'evidence': evidence,
+            'status': status,
+        })
+
+    statuses = {m['status'] for m in metrics}
+    if "regressed" in statuses:
+        overall = "regressed"
+    elif "improved" in statuses:
+        overall = "improved"
+    else:
+        overall = "ok"
+
+    return {'case': name, 'status': overall, 'metrics': metrics}
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD, alpha=DEFAULT_ALPHA):
+    """
+    Compare two results dicts case by case.
+
+    Returns:
+        Dict with comparisons, warnings, missing/new case names and
+        `regressed` (True if any case regressed)
+    """
+    warnings = []
+
+    for key in DATASET_KEYS:
+        if baseline['dataset'].get(key) != current['dataset'].get(key):
+            warnings.append(f"dataset {key} differs: baseline={baseline['dataset'].get(key)} "
+                            f"current={current['dataset'].get(key)}")
+
+    for key in ENVIRONMENT_KEYS:
+        if baseline['environment'].get(key) != current['environment'].get(key):
+            warnings.append(f"environment {key} differs: baseline={baseline['environment'].get(key)} "
+                            f"current={current['environment'].get(key)}")
+
+    base_cases = baseline['cases']
+    cur_cases = current['cases']
+
+    comparisons = [
+        compare_case(name, base_cases[name], cur_cases[name], threshold, alpha)
+        for name in cur_cases if name in base_cases
+    ]
+
+    return {
+        'baseline_commit': baseline['environment'].get('git_commit'),
+        'current_commit': current['environment'].get('git_commit'),
+        'threshold': threshold,
+        'alpha': alpha,
+        'comparisons': comparisons,
+        'missing': [name for name in base_cases if name not in cur_cases],
+        'new': [name for name in cur_cases if name not in base_cases],
+        'warnings': warnings,
+        'regressed': any(c['status'] == "regressed" for c in comparisons),
+    }
+
+
+STATUS_LABELS = {
+    "regressed": "❌ REGRESSED",
+    "improved": "🚀 improved",
+    "ok": "✅ ok",
+}
+
+
+def format_report(report):
+    """Readable diff of a compare_results() report"""
+    lines = [
+        f"Baseline {report['baseline_commit'] or '?'} -> current {report['current_commit'] or '?'} "
+        f"(threshold {report['threshold']:.0%}, alpha {report['alpha']})",
+        "",
+    ]
+
+    for warning in report['warnings']:
+        lines.append(f"⚠️  {warning}")
+    if report['warnings']:
+        lines.append("")
+
+    header = f"{'Case':<26} {'Metric':<6} {'Baseline':>11} {'Current':>11} {'Change':>8}  {'Evidence':<26} Status"
+    lines.append(header)
+    lines.append("-" * len(header))
+
+    for comparison in report['comparisons']:
+        for index, row in enumerate(comparison['metrics']):
+            name = comparison['case'] if index == 0 else ""
+            lines.append(
+                f"{name:<26} {row['metric']:<6} {row['baseline']:>9.2f}ms {row['current']:>9.2f}ms "
+                f"{row['change']:>+7.1%}  {row['evidence']:<26} {STATUS_LABELS[row['status']]}"
+            )
+
+    if report['missing']:
+        lines.append("")
+        lines.append(f"⚠️  Not run (in baseline): {', '.join(report['missing'])}")
+    if report['new']:
+        lines.append(f"ℹ️  No baseline yet: {', '.join(report['new'])}")
+
+    regressed = [c['case'] for c in report['comparisons'] if c['status'] == "regressed"]
+    lines.append("")
+    if regressed:
+        lines.append(f"❌ {len(regressed)} regression(s): {', '.join(regressed)}")
+    else:
+        lines.append("✅ No regressions")
+
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare a benchmark run against its baseline")
+    parser.add_argument("current", help="Results JSON written by benchmarks.run")
+    parser.add_argument("--baseline", help="Baseline results JSON (default: stored baseline for the dataset)")
+    parser.add_argument("--baseline-dir", default=str(BASELINE_DIR))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression (default 0.10)")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store the current results as the new baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    current = load_results(args.current)
+
+    if args.save_baseline:
+        path = save_baseline(current, args.baseline_dir)
+        print(f"💾 Baseline saved: {path}")
+        return 0
+
+    if args.baseline:
+        baseline = load_results(args.baseline)
+    else:
+        baseline = load_baseline(current['dataset'], args.baseline_dir)
+        if baseline is None:
+            print(f"❌ No baseline at {baseline_path(current['dataset'], args.baseline_dir)}")
+            print("   Save one with --save-baseline")
+            return 2
+
+    report = compare_results(baseline, current, args.threshold, args.alpha)
+    print(format_report(report))
+    return 1 if report['regressed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Synthetic Dataset Generator
+Builds a seeded, reproducible Momentum Track database of a given size.
+
+The same (size, seed) always produces the same rows, so runs on different
+machines or commits compare like with like.
+"""
+
+import itertools
+import random
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from database.db_manager import DatabaseManager
+from database.models import TaskCategory
+
+
+SIZES = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+}
+
+# Fixed reference time so timestamps do not depend on when data was generated
+REFERENCE_TIME = datetime(2025, 1, 1, 9, 0, 0)
+
+INSERT_CHUNK = 20_000
+
+WORDS = (
+    "call email review write plan buy fix clean read book pay send update prepare "
+    "schedule meeting report groceries gym laundry invoice budget project draft "
+    "design deploy garden dentist car insurance taxes birthday gift trip flight "
+    "hotel presentation slides backup photos study exam course practice guitar "
+    "run yoga doctor bank renew passport paint kitchen sort files organize desk"
+).split()
+
+MOTIVATIONS = (
+    "You've got this!", "One step at a time", "Future you says thanks",
+    "Small wins add up", "Done is better than perfect"
+)
+
+# (recurrence_type, probability) for top-level tasks; the rest are one-off
+RECURRENCE_WEIGHTS = (
+    ("today", 0.10),
+    ("week", 0.05),
+    ("month", 0.03),
+    ("year", 0.01),
+    ("custom", 0.01),
+)
+
+# Relative share of lists per category
+CATEGORY_WEIGHTS = {
+    TaskCategory.DAILY: 0.45,
+    TaskCategory.WEEKEND: 0.20,
+    TaskCategory.MONTHLY: 0.20,
+    TaskCategory.YEARLY: 0.15,
+}
+
+PARENT_WITH_SUBTASKS = 0.15     # share of top-level tasks that have subtasks
+MAX_SUBTASKS = 5
+PARENT_COMPLETED = 0.35
+SUBTASK_COMPLETED = 0.50
+HAS_DUE_DATE = 0.60
+HAS_START_TIME = 0.45
+REMINDER_IF_TIMED = 0.60
+HAS_NOTES = 0.40
+HAS_MOTIVATION = 0.15
+
+
+def parse_size(size):
+    """Accept a named size ('1k', '100k', '1m') or a plain task count"""
+    key = str(size).lower()
+    if key in SIZES:
+        return SIZES[key]
+    return int(key)
+
+
+class DatasetGenerator:
+    """Generate lists, tasks and subtasks with realistic distributions"""
+
+    def __init__(self, num_tasks, seed=42):
+        self.num_tasks = num_tasks
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def _uuid(self):
+        return f"{self.rng.getrandbits(128):032x}"
+
+    def _stamp(self, days_back):
+        moment = REFERENCE_TIME - timedelta(days=days_back, seconds=self.rng.randrange(86400))
+        return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+    def _title(self):
+        return " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(2, 5))).capitalize()
+
+    def _clock(self, hour_low=6, hour_high=22):
+        return f"{self.rng.randint(hour_low, hour_high):02d}:{self.rng.choice((0, 15, 30, 45)):02d}"
+
+    def _recurrence(self):
+        roll = self.rng.random()
+        for recurrence_type, probability in RECURRENCE_WEIGHTS:
+            if roll < probability:
+                interval = self.rng.randint(2, 14) if recurrence_type == "custom" else 1
+                return recurrence_type, interval
+            roll -= probability
+        return None, 1
+
+    def list_count(self):
+        """Roughly one list per 2,000 tasks, at least one per category"""
+        return max(len(CATEGORY_WEIGHTS) * 2, min(500, self.num_tasks // 2000))
+
+    def generate_lists(self):
+        """Yield list rows (id, name, category, position, created_at, uuid, modified_at)"""
+        categories = list(CATEGORY_WEIGHTS)
+        weights = [CATEGORY_WEIGHTS[c] for c in categories]
+        positions = {c: 0 for c in categories}
+
+        for list_id in range(1, self.list_count() + 1):
+            # Guarantee every category is represented
+            if list_id <= len(categories):
+                category = categories[list_id - 1]
+            else:
+                category = self.rng.choices(categories, weights)[0]
+
+            created = self._stamp(self.rng.randint(30, 720))
+            yield (list_id, f"{self._title()} {list_id}", category, positions[category],
+                   created, self._uuid(), created)
+            positions[category] += 1
+
+    def generate_tasks(self, list_ids):
+        """
+        Yield task rows in insert order; subtasks follow their parent.
+
+        List sizes are skewed (a few big lists, many small ones), as real
+        users keep one or two catch-all lists.
+        """
+        # Zipf-like weights: list k gets weight 1/k
+        cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(list_ids))))
+        positions = dict.fromkeys(list_ids, 0)
+
+        task_id = 0
+        while task_id < self.num_tasks:
+            list_id = self.rng.choices(list_ids, cum_weights=cum_weights)[0]
+            task_id += 1
+            parent_id = task_id
+
+            completed = self.rng.random() < PARENT_COMPLETED
+            recurrence_type, interval = self._recurrence()
+            age = self.rng.randint(0, 365)
+            created = self._stamp(age)
+
+            due_date = None
+            if self.rng.random() < HAS_DUE_DATE:
+                due_date = (REFERENCE_TIME + timedelta(days=self.rng.randint(-30, 60))).date().isoformat()
+
+            start_time = end_time = reminder_time = None
+            if self.rng.random() < HAS_START_TIME:
+                start_time = self._clock(6, 20)
+                if self.rng.random() < 0.5:
+                    end_time = self._clock(int(start_time[:2]) + 1, 23)
+                if self.rng.random() < REMINDER_IF_TIMED:
+                    reminder_time = start_time
+
+            last_completed = None
+            if recurrence_type and completed:
+                last_completed = (REFERENCE_TIME - timedelta(days=self.rng.randint(0, 30))).date().isoformat()
+
+            notes = " ".join(self.rng.choice(WORDS) for _ in range(self.rng.randint(4, 20))) \
+                if self.rng.random() < HAS_NOTES else ""
+            motivation = self.rng.choice(MOTIVATIONS) if self.rng.random() < HAS_MOTIVATION else ""
+
+            yield (task_id, list_id, self._title(), notes, due_date, start_time, end_time,
+                   reminder_time, int(completed), None, positions[list_id], recurrence_type,
+                   interval, last_completed, motivation, created, self._uuid(), created)
+            positions[list_id] += 1
+
+            if self.rng.random() >= PARENT_WITH_SUBTASKS:
+                continue
+
+            for sub_position in range(self.rng.randint(1, MAX_SUBTASKS)):
+                if task_id >= self.num_tasks:
+                    break
+                task_id += 1
+                yield (task_id, list_id, self._title(), "", None, None, None, None,
+                       int(completed or self.rng.random() < SUBTASK_COMPLETED), parent_id,
+                       sub_position, None, 1, None, "", created, self._uuid(), created)
+
+    def build(self, db_path, create_indexes=False):
+        """
+        Write the dataset to a fresh database at db_path.
+
+        Args:
+            db_path: Destination file (replaced if it exists)
+            create_indexes: Also create the DatabaseOptimizer indexes
+
+        Returns:
+            Dict describing the generated dataset
+        """
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{db_path}{suffix}").unlink(missing_ok=True)
+
+        # Create the schema exactly as the app does, then replace the defaults
+        db = DatabaseManager(db_name=str(db_path), trace=False)
+
+        conn = sqlite3.connect(db.db_name)
+        conn.execute('PRAGMA synchronous=OFF')
+        try:
+            conn.execute('DELETE FROM task_lists')
+            conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('task_lists', 'tasks')")
+
+            lists = list(self.generate_lists())
+            conn.executemany('''
+                INSERT INTO task_lists (id, name, category, position, created_at, uuid, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', lists)
+
+            task_sql = '''
+                INSERT INTO tasks (id, list_id, title, notes, due_date, start_time, end_time,
+                                   reminder_time, completed, parent_id, position, recurrence_type,
+                                   recurrence_interval, last_completed_date, motivation,
+                                   created_at, uuid, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            '''
+            chunk = []
+            for row in self.generate_tasks([row[0] for row in lists]):
+                chunk.append(row)
+                if len(chunk) >= INSERT_CHUNK:
+                    conn.executemany(task_sql, chunk)
+                    chunk = []
+            if chunk:
+                conn.executemany(task_sql, chunk)
+
+            conn.commit()
+        finally:
+            conn.close()
+
+        if create_indexes:
+            from database.db_optimizer import DatabaseOptimizer
+            DatabaseOptimizer(db_name=str(db_path)).create_indexes()
+
+        info = describe_dataset(db_path)
+        info.update(seed=self.seed, indexes=create_indexes)
+        return info
+
+
+def describe_dataset(db_path):
+    """Row counts of an existing dataset, recorded alongside the results"""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT COUNT(*),
+                   COUNT(parent_id),
+                   SUM(completed),
+                   COUNT(recurrence_type),
+                   COUNT(reminder_time)
+            FROM tasks
+        ''')
+        tasks, subtasks, completed, recurring, reminders = cursor.fetchone()
+        cursor.execute('SELECT COUNT(*) FROM task_lists')
+        lists = cursor.fetchone()[0]
+    finally:
+        conn.close()
+
+    return {
+        'lists': lists,
+        'tasks': tasks,
+        'subtasks': subtasks,
+        'completed': completed or 0,
+        'recurring': recurring,
+        'reminders': reminders,
+    }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Event Dispatch Benchmark
+Measures EventDispatcher cost at high event rates: dispatch with 0..N
+listeners, dispatch while another thread subscribes and unsubscribes, and
+subscribe/unsubscribe churn.
+
+    python -m benchmarks.events
+    python -m benchmarks.events --events 200000 --listeners 1,10,100
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import summarize
+from utils.event_system import EventDispatcher
+
+EVENT = 'on_task_updated'
+
+
+class _Listener:
+    """Bound-method listener like the screens register"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def handle(self, task_id, fields):
+        self.calls += 1
+
+
+def _time_dispatch(dispatcher, events):
+    fields = {'completed': True}
+    start = time.perf_counter()
+    for task_id in range(events):
+        dispatcher.dispatch(EVENT, task_id, fields)
+    return time.perf_counter() - start
+
+
+def bench_dispatch(num_listeners, events, repeats):
+    """Nanoseconds per dispatch with num_listeners inline listeners"""
+    dispatcher = EventDispatcher()
+    listeners = [_Listener() for _ in range(num_listeners)]
+    for listener in listeners:
+        dispatcher.on(EVENT, listener.handle)
+
+    samples = [_time_dispatch(dispatcher, events) / events * 1e9 for _ in range(repeats)]
+    assert all(listener.calls == events * repeats for listener in listeners)
+    return samples
+
+
+def bench_dispatch_with_churn(num_listeners, events, repeats):
+    """Dispatch while a second thread keeps subscribing and unsubscribing"""
+    dispatcher = EventDispatcher()
+    listeners = [_Listener() for _ in range(num_listeners)]
+    for listener in listeners:
+        dispatcher.on(EVENT, listener.handle)
+
+    stop = threading.Event()
+    churn_listener = _Listener()
+
+    def churn():
+        while not stop.is_set():
+            dispatcher.on(EVENT, churn_listener.handle)
+            dispatcher.off(EVENT, churn_listener.handle)
+
+    thread = threading.Thread(target=churn, daemon=True)
+    thread.start()
+    try:
+        samples = [_time_dispatch(dispatcher, events) / events * 1e9 for _ in range(repeats)]
+    finally:
+        stop.set()
+        thread.join()
+    return samples
+
+
+def bench_subscribe(num_listeners, repeats):
+    """Microseconds to subscribe and then unsubscribe num_listeners listeners"""
+    samples = []
+    for _ in range(repeats):
+        dispatcher = EventDispatcher()
+        listeners = [_Listener() for _ in range(num_listeners)]
+        start = time.perf_counter()
+        for listener in listeners:
+            dispatcher.on(EVENT, listener.handle)
+        for listener in listeners:
+            dispatcher.off(EVENT, listener.handle)
+        samples.append((time.perf_counter() - start) / num_listeners * 1e6)
+    return samples
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark event dispatch")
+    parser.add_argument("--events", type=int, default=100000, help="Dispatches per sample")
+    parser.add_argument("--listeners", default="0,1,10,100",
+                        help="Comma-separated listener counts")
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    counts = [int(n) for n in args.listeners.split(",")]
+
+    print(f"{'Case':<28} {'Listeners':>9} {'p50':>12} {'min':>12}")
+    print("-" * 64)
+
+    for count in counts:
+        stats = summarize(bench_dispatch(count, args.events, args.repeats))
+        print(f"{'dispatch':<28} {count:>9} {stats['p50']:>9.0f} ns {stats['min']:>9.0f} ns")
+
+    for count in counts:
+        stats = summarize(bench_dispatch_with_churn(count, args.events, args.repeats))
+        print(f"{'dispatch + subscribe churn':<28} {count:>9} {stats['p50']:>9.0f} ns {stats['min']:>9.0f} ns")
+
+    for count in [c for c in counts if c]:
+        stats = summarize(bench_subscribe(count, args.repeats))
+        print(f"{'subscribe + unsubscribe':<28} {count:>9} {stats['p50']:>9.2f} us {stats['min']:>9.2f} us")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Benchmark Runner
+Generates (or reuses) a seeded dataset, runs the benchmark cases against a
+working copy and writes the results as JSON.
+
+Every size is measured in several rounds, each in its own process with its
+own working copy. Timings inside one process drift together, so the
+regression gate compares per-round statistics (see benchmarks.compare).
+Before every timed iteration a fixed reference workload is timed as well, so
+the gate can factor out how fast the machine happened to be at that moment.
+
+    python -m benchmarks.run --size 1k
+    python -m benchmarks.run --size 100k --size 1m --cases get_tasks_by_list,toggle_task
+    python -m benchmarks.run --size 100k --save-baseline   # record a baseline
+    python -m benchmarks.run --size 100k --check           # exit 1 on regression
+    python -m benchmarks.run --size 1m --rounds 1          # quick look, not gateable
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Allow running as a plain script from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.cases import BenchmarkContext, get_cases
+from benchmarks.compare import (DEFAULT_THRESHOLD, MIN_ROUNDS, baseline_path, compare_results,
+                                format_report, load_baseline, load_results, save_baseline)
+from benchmarks.datagen import DatasetGenerator, describe_dataset, parse_size
+from benchmarks.stats import percentile, summarize
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+DATA_DIR = BENCH_DIR / "data"
+RESULTS_DIR = BENCH_DIR / "results"
+
+RESULTS_SCHEMA = 2
+DEFAULT_ROUNDS = MIN_ROUNDS
+
+
+def dataset_path(size_label, seed, data_dir=DATA_DIR, indexes=False):
+    suffix = "_idx" if indexes else ""
+    return Path(data_dir) / f"momentum_{size_label}_seed{seed}{suffix}.db"
+
+
+def ensure_dataset(size_label, seed, data_dir=DATA_DIR, indexes=False, regenerate=False):
+    """Generate the dataset once and reuse it across runs"""
+    path = dataset_path(size_label, seed, data_dir, indexes)
+    if path.exists() and not regenerate:
+        return path
+
+    num_tasks = parse_size(size_label)
+    print(f"🏗️  Generating {num_tasks:,} tasks (seed {seed}) -> {path}")
+    start = time.perf_counter()
+    DatasetGenerator(num_tasks, seed=seed).build(path, create_indexes=indexes)
+    print(f"✅ Dataset ready ({time.perf_counter() - start:.1f}s)")
+    return path
+
+
+def environment_info():
+    """Where the numbers came from; compared runs should match here"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+    }
+
+
+class Calibration:
+    """
+    A fixed CPU + SQLite workload (point lookups in an in-memory table).
+
+    Shared machines change speed by tens of percent for seconds at a time;
+    dividing a sample by the reference time measured right before it cancels
+    most of that, where spreading rounds over time cannot.
+    """
+
+    ROWS = 2000
+    LOOKUPS = 400
+
+    def __init__(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.execute('CREATE TABLE ref (id INTEGER PRIMARY KEY, value TEXT)')
+        self.conn.executemany('INSERT INTO ref (value) VALUES (?)',
+                              [(str(i) * 3,) for i in range(self.ROWS)])
+
+    def measure(self):
+        """Time of one pass of the reference workload (ms)"""
+        start = time.perf_counter()
+        for row_id in range(1, self.LOOKUPS + 1):
+            self.conn.execute('SELECT value FROM ref WHERE id = ?', (row_id,)).fetchone()
+        return (time.perf_counter() - start) * 1000
+
+
+def run_case(case, iterations=None, verbose=False, calibration=None):
+    """
+    Run one case: setup, warmup, timed iterations, teardown.
+
+    Returns:
+        Dict with iterations, warmup, summary, rounds (this round's summary
+        with its calibration and speed-adjusted p50/p95) and raw samples (ms)
+    """
+    iterations = iterations or case.iterations
+    calibration = calibration or Calibration()
+    samples = []
+    references = []
+
+    # The app code prints progress; keep it out of the report unless asked
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    with output:
+        case.setup()
+        try:
+            for i in range(case.warmup + iterations):
+                case.before_each()
+                reference = calibration.measure()
+                start = time.perf_counter()
+                case.run()
+                elapsed = time.perf_counter() - start
+                case.after_each()
+
+                if i >= case.warmup:
+                    samples.append(elapsed * 1000)
+                    references.append(reference)
+        finally:
+            case.teardown()
+
+    summary = summarize(samples)
+    adjusted = summarize([sample / reference for sample, reference in zip(samples, references)])
+    round_summary = dict(summary, calibration_ms=percentile(sorted(references), 50),
+                         adjusted={'p50': adjusted['p50'], 'p95': adjusted['p95']})
+    return {
+        'unit': 'ms',
+        'iterations': iterations,
+        'warmup': case.warmup,
+        'summary': summary,
+        'rounds': [round_summary],
+        'samples': samples,
+    }
+
+
+def run_benchmarks(size_label, seed=42, case_names=None, iterations=None,
+                   data_dir=DATA_DIR, indexes=False, regenerate=False, verbose=False):
+    """
+    Run the selected cases once (one round) against a fresh working copy of
+    one dataset, in this process.
+
+    Returns:
+        Results dict (see write_results for the layout)
+    """
+    source = ensure_dataset(size_label, seed, data_dir, indexes, regenerate)
+    cases = get_cases(case_names)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="momentum_bench_"))
+    try:
+        # Cases write to the database, so never touch the cached dataset
+        db_path = work_dir / "momentum_track.db"
+        shutil.copyfile(source, db_path)
+
+        dataset = describe_dataset(db_path)
+        dataset.update(size=size_label, seed=seed, indexes=indexes)
+
+        context = BenchmarkContext(db_path, work_dir, seed=seed)
+        calibration = Calibration()
+        results = {}
+
+        for case_cls in cases:
+            case = case_cls(context)
+            print(f"⏱️  {size_label:>5} | {case.name} ...", end="", flush=True)
+            result = run_case(case, iterations, verbose, calibration)
+            summary = result['summary']
+            print(f" p50 {summary['p50']:.2f}ms  p95 {summary['p95']:.2f}ms")
+            results[case.name] = result
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'schema': RESULTS_SCHEMA,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'dataset': dataset,
+        'cases': results,
+    }
+
+
+def run_rounds(size_label, rounds=DEFAULT_ROUNDS, seed=42, case_names=None, iterations=None,
+               data_dir=DATA_DIR, indexes=False, regenerate=False, verbose=False):
+    """
+    Run the selected cases `rounds` times, each round in a separate process,
+    and merge the rounds into one results dict.
+    """
+    if rounds <= 1:
+        return run_benchmarks(size_label, seed, case_names, iterations, data_dir, indexes,
+                              regenerate, verbose)
+
+    # Generate once up front, not inside the first round
+    ensure_dataset(size_label, seed, data_dir, indexes, regenerate)
+
+    round_results = []
+    with tempfile.TemporaryDirectory(prefix="momentum_rounds_") as tmp:
+        for index in range(rounds):
+            print(f"🔁 Round {index + 1}/{rounds}")
+            output = Path(tmp) / f"round_{index}.json"
+            command = [sys.executable, "-m", "benchmarks.run", "--round",
+                       "--size", size_label, "--seed", str(seed), "--data-dir", str(data_dir),
+                       "--rounds", "1", "--output", str(output)]
+            if case_names:
+                command += ["--cases", ",".join(case_names)]
+            if iterations:
+                command += ["--iterations", str(iterations)]
+            if indexes:
+                command.append("--indexes")
+            if verbose:
+                command.append("--verbose")
+            subprocess.run(command, cwd=REPO_DIR, check=True)
+            round_results.append(load_results(output))
+
+    return merge_rounds(round_results)
+
+
+def merge_rounds(round_results):
+    """Combine single-round results: samples are pooled, per-round summaries kept"""
+    merged = dict(round_results[0])
+    merged['created_at'] = datetime.now().isoformat(timespec='seconds')
+
+    cases = {}
+    for name, first in round_results[0]['cases'].items():
+        rounds = [result['cases'][name] for result in round_results if name in result['cases']]
+        samples = [sample for case in rounds for sample in case['samples']]
+        cases[name] = {
+            'unit': first['unit'],
+            'iterations': first['iterations'],
+            'warmup': first['warmup'],
+            'summary': summarize(samples),
+            'rounds': [summary for case in rounds for summary in case['rounds']],
+            'samples': samples,
+        }
+    merged['cases'] = cases
+    return merged
+
+
+def print_summary(results):
+    """One line per case: medians over rounds and the range of the round p50s"""
+    for name, case in results['cases'].items():
+        p50s = sorted(summary['p50'] for summary in case['rounds'])
+        p95s = sorted(summary['p95'] for summary in case['rounds'])
+        print(f"   {name:<26} p50 {percentile(p50s, 50):.2f}ms  p95 {percentile(p95s, 50):.2f}ms  "
+              f"(round p50 {p50s[0]:.2f}-{p50s[-1]:.2f}ms, {len(p50s)} rounds)")
+
+
+def write_results(results, filepath=None):
+    """
+    Write results JSON:
+
+        {schema, created_at, environment, dataset,
+         cases: {name: {unit, iterations, warmup, summary: {p50, p95, ...},
+                        rounds: [per-round summary + calibration_ms, adjusted], samples}}}
+    """
+    if filepath is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = RESULTS_DIR / f"bench_{results['dataset']['size']}_{timestamp}.json"
+
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return filepath
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Momentum Track benchmarks")
+    parser.add_argument("--size", action="append",
+                        help="Dataset size: 1k, 100k, 1m or a task count (repeatable, default 1k)")
+    parser.add_argument("--seed", type=int, default=42, help="Dataset seed")
+    parser.add_argument("--cases", help="Comma-separated case names (default: all)")
+    parser.add_argument("--iterations", type=int, help="Override every case's iteration count")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS,
+                        help=f"Separate processes per size (default {DEFAULT_ROUNDS}; "
+                             f"the gate needs at least {MIN_ROUNDS})")
+    parser.add_argument("--indexes", action="store_true",
+                        help="Create the DatabaseOptimizer indexes on the dataset")
+    parser.add_argument("--regenerate", action="store_true", help="Rebuild cached datasets")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Where datasets are cached")
+    parser.add_argument("--output", help="Results file (single size only)")
+    parser.add_argument("--verbose", action="store_true", help="Show app output during cases")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the baseline for the dataset")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare against the stored baseline and exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative slowdown that counts as a regression (default 0.10)")
+    # Set by run_rounds() for its worker processes
+    parser.add_argument("--round", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    args.size = args.size or ["1k"]
+    args.cases = [name.strip() for name in args.cases.split(",")] if args.cases else None
+    if args.output and len(args.size) > 1:
+        parser.error("--output can only be used with a single --size")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.round:
+        results = run_benchmarks(
+            args.size[0], seed=args.seed, case_names=args.cases, iterations=args.iterations,
+            data_dir=args.data_dir, indexes=args.indexes, verbose=args.verbose
+        )
+        write_results(results, args.output)
+        return 0
+
+    print("\n" + "=" * 60)
+    print("  MOMENTUM TRACK - BENCHMARKS")
+    print("=" * 60 + "\n")
+
+    exit_code = 0
+
+    for size_label in args.size:
+        results = run_rounds(
+            size_label, rounds=args.rounds, seed=args.seed, case_names=args.cases,
+            iterations=args.iterations, data_dir=args.data_dir, indexes=args.indexes,
+            regenerate=args.regenerate, verbose=args.verbose
+        )
+        if args.rounds > 1:
+            print_summary(results)
+        path = write_results(results, args.output)
+        print(f"💾 Results written to {path}\n")
+
+        if args.check:
+            baseline = load_baseline(results['dataset'])
+            if baseline is None:
+                print(f"⚠️  No baseline at {baseline_path(results['dataset'])}, nothing to check\n")
+            else:
+                report = compare_results(baseline, results, threshold=args.threshold)
+                print(format_report(report) + "\n")
+                if report['regressed']:
+                    exit_code = 1
+
+        if args.save_baseline:
+            print(f"💾 Baseline saved: {save_baseline(results)}\n")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Benchmark interrupted by user")
+        sys.exit(1)
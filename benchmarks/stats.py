@@ -0,0 +1,101 @@
+"""
+Benchmark statistics - percentiles, summaries and significance tests for timing samples
+"""
+
+import math
+
+
+def percentile(sorted_samples, pct):
+    """
+    Percentile with linear interpolation between closest ranks.
+
+    Args:
+        sorted_samples: Samples sorted ascending
+        pct: Percentile in [0, 100]
+    """
+    if not sorted_samples:
+        return None
+
+    rank = (len(sorted_samples) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_samples[low]
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (rank - low)
+
+
+def summarize(samples):
+    """
+    Summarize timing samples (milliseconds).
+
+    Returns:
+        Dict with count, min, max, mean, stdev and p50/p90/p95/p99
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+    if not count:
+        return {'count': 0}
+
+    mean = sum(ordered) / count
+    variance = sum((s - mean) ** 2 for s in ordered) / (count - 1) if count > 1 else 0.0
+
+    return {
+        'count': count,
+        'min': ordered[0],
+        'max': ordered[-1],
+        'mean': mean,
+        'stdev': math.sqrt(variance),
+        'p50': percentile(ordered, 50),
+        'p90': percentile(ordered, 90),
+        'p95': percentile(ordered, 95),
+        'p99': percentile(ordered, 99),
+    }
+
+
+def _rank(values):
+    """Ranks (1-based) with ties given their average rank, plus tie group sizes"""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = []
+
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        average = (i + j) / 2.0 + 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = average
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+
+    return ranks, ties
+
+
+def mann_whitney_greater(baseline, current):
+    """
+    One-sided Mann-Whitney U test: is `current` stochastically greater
+    (slower) than `baseline`? Normal approximation with tie and continuity
+    correction, which is adequate from about five samples per side.
+
+    Returns:
+        Tuple of (U statistic for current, p-value)
+    """
+    n1, n2 = len(baseline), len(current)
+    if not n1 or not n2:
+        return None, 1.0
+
+    ranks, ties = _rank(list(baseline) + list(current))
+    rank_sum = sum(ranks[n1:])
+    u_current = rank_sum - n2 * (n2 + 1) / 2.0
+
+    n = n1 + n2
+    mean = n1 * n2 / 2.0
+    tie_term = sum(t ** 3 - t for t in ties) / (n * (n - 1)) if n > 1 else 0.0
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return u_current, 1.0
+
+    z = (u_current - mean - 0.5) / math.sqrt(variance)
+    return u_current, 0.5 * math.erfc(z / math.sqrt(2))
@@ -10,14 +10,21 @@ from kivymd.uix.button import MDIconButton
 from kivy.properties import StringProperty, BooleanProperty, NumericProperty
 from kivy.metrics import dp
 from kivy.graphics import Color, RoundedRectangle
-from kivymd.app import MDApp
+from services.task_view_models import motivation_text, recurrence_text, row_height, time_text
 from utils.constants import Colors
+from utils.profiler import profiled
+from utils.theme_tokens import get_theme_tokens
 
 
 class BaseTaskItem(MDBoxLayout):
     """
     Base task item widget with all common functionality.
     Can be used directly or subclassed for RecycleView.
+
+    Child widgets are created once in build_ui(); afterwards the task_*
+    properties drive their text, visibility, colors and the row height
+    through bindings, so a recycled row is updated without new widgets.
+    Recycled rows use apply_row() with a precomputed TaskRow instead.
     """
 
     task_id = NumericProperty(0)
@@ -35,20 +42,20 @@ class BaseTaskItem(MDBoxLayout):
         self._on_task_click = on_task_click
         self._on_toggle_complete = on_toggle_complete
         self._on_delete = on_delete
+        self._syncing_checkbox = False
+        self._visible_details = None
+        self._selected = False
 
         super().__init__(**kwargs)
         self.orientation = 'horizontal'
         self.size_hint_y = None
-
-        # Calculate height based on content
-        self.height = self._calculate_height()
-
-        self.padding = [dp(12) if not self.is_subtask else dp(40), dp(8), dp(8), dp(8)]
         self.spacing = dp(12)
 
+        self.tokens = get_theme_tokens()
+
         # Add card-like background
         with self.canvas.before:
-            self.bg_color = Color(*Colors.LIGHT_CARD)
+            self.bg_color = Color(*self.tokens.card)
             self.bg_rect = RoundedRectangle(
                 pos=self.pos,
                 size=self.size,
@@ -56,17 +63,29 @@ class BaseTaskItem(MDBoxLayout):
             )
 
         self.bind(pos=self._update_rect, size=self._update_rect)
-        self.update_theme_colors()
         self.build_ui()
 
+        # Keep the children in sync with the properties from now on
+        self.bind(
+            task_title=self._on_title,
+            task_start_time=self._on_details,
+            task_end_time=self._on_details,
+            task_recurrence=self._on_details,
+            task_motivation=self._on_details,
+            task_completed=self._on_completed,
+            is_subtask=self._on_subtask,
+        )
+        self._on_details()
+        self._on_subtask()
+        self.update_theme_colors()
+
+        # Colors follow the shared theme tokens (weak bindings)
+        self.tokens.bind(card=self._on_card_token, selected=self._on_card_token,
+                         text=self.update_label_colors, hint=self.update_label_colors)
+
     def _calculate_height(self):
         """Calculate item height based on content"""
-        base_height = 70
-        if self.task_start_time or self.task_recurrence:
-            base_height += 20
-        if self.task_motivation:
-            base_height += 20
-        return dp(base_height)
+        return dp(row_height(bool(self.task_start_time or self.task_recurrence), bool(self.task_motivation)))
 
     def set_callbacks(self, on_task_click=None, on_toggle_complete=None, on_delete=None):
         """Update callbacks after initialization (useful for RecycleView)"""
@@ -78,7 +97,7 @@ class BaseTaskItem(MDBoxLayout):
             self._on_delete = on_delete
 
     def update_data(self, task_data):
-        """Update task data (useful for RecycleView refresh)"""
+        """Update task data (useful for RecycleView refresh) - bindings restyle the row"""
         self.task_id = task_data.get('task_id', 0)
         self.task_title = task_data.get('task_title', "")
         self.task_notes = task_data.get('task_notes', "")
@@ -96,54 +115,89 @@ class BaseTaskItem(MDBoxLayout):
             on_delete=task_data.get('on_delete')
         )
 
-        # Recalculate height and rebuild
+    def apply_row(self, row):
+        """Show a precomputed TaskRow (strings and height come ready-made)"""
+        self.task_id = row.task_id
+        self.task_title = row.title
+        self.task_completed = row.completed
+        self.is_subtask = row.is_subtask
+
+        self.time_label.text = row.time_text
+        self.recurrence_label.text = row.recurrence_text
+        self.motivation_label.text = row.motivation_text
+        self._sync_detail_labels()
+        self.height = dp(row.height)
+
+    # ===== PROPERTY BINDINGS =====
+
+    def _on_title(self, instance, value):
+        self.title_label.text = value
+
+    def _on_details(self, *args):
+        """Time, recurrence and motivation lines: text, visibility and row height"""
+        self.time_label.text = self._get_time_text()
+        self.recurrence_label.text = self._get_recurrence_text()
+        self.motivation_label.text = motivation_text(self.task_motivation)
+        self._sync_detail_labels()
         self.height = self._calculate_height()
-        self.clear_widgets()
-        self.build_ui()
-        self.update_theme_colors()
-
-    def update_theme_colors(self):
-        """Update colors based on current theme"""
-        if not hasattr(self, 'bg_color'):
-            return
-
-        app = MDApp.get_running_app()
-        if not app or not app.theme_cls:
-            return
 
-        is_dark = app.theme_cls.theme_style == "Dark"
+    def _sync_detail_labels(self):
+        """Attach the detail labels that have text"""
+        visible = tuple(label for label in (self.time_label, self.recurrence_label, self.motivation_label)
+                        if label.text)
+        if visible != self._visible_details:
+            # Re-attach the existing labels; nothing is created
+            self._visible_details = visible
+            self.content_layout.clear_widgets()
+            self.content_layout.add_widget(self.title_label)
+            for label in visible:
+                self.content_layout.add_widget(label)
+
+    def _on_completed(self, instance, completed):
+        self.title_label.strikethrough = completed
 
-        # Update background
-        self.bg_color.rgba = Colors.DARK_CARD if is_dark else Colors.LIGHT_CARD
+        # Mirror the state without firing the toggle callback
+        if self.checkbox.active != completed:
+            self._syncing_checkbox = True
+            self.checkbox.active = completed
+            self._syncing_checkbox = False
 
-        # Update text colors if labels exist
-        if hasattr(self, 'title_label'):
-            self._update_label_colors(is_dark)
+        self.update_label_colors()
 
-    def _update_label_colors(self, is_dark):
-        """Internal method to update label colors"""
-        if self.task_completed:
-            self.title_label.color = (0.5, 0.5, 0.5, 1)
-        else:
-            self.title_label.color = Colors.DARK_TEXT if is_dark else Colors.LIGHT_TEXT
+    def _on_subtask(self, *args):
+        self.padding = [dp(12) if not self.is_subtask else dp(40), dp(8), dp(8), dp(8)]
 
-        # Update secondary labels
-        secondary_color = Colors.HINT_TEXT_DARK if is_dark else Colors.HINT_TEXT_LIGHT
+    # ===== THEME =====
 
-        if hasattr(self, 'time_label'):
-            self.time_label.color = secondary_color
-        if hasattr(self, 'recurrence_label'):
-            self.recurrence_label.color = secondary_color
-        if hasattr(self, 'motivation_label'):
-            self.motivation_label.color = (0.1, 0.6, 0.3, 1)  # Green for motivation
+    def update_theme_colors(self):
+        """Apply the current theme tokens (normally done by the token bindings)"""
+        self._on_card_token()
+        self.update_label_colors()
+
+    def _on_card_token(self, *args):
+        self.bg_color.rgba = self.tokens.selected if self._selected else self.tokens.card
+
+    def set_selected(self, selected):
+        """Tint the card while the row is selected in multi-select mode"""
+        if selected != self._selected:
+            self._selected = selected
+            self._on_card_token()
+
+    def update_label_colors(self, *args):
+        """Label colors from the theme tokens and completion state"""
+        tokens = self.tokens
+        self.title_label.color = tokens.completed_text if self.task_completed else tokens.text
+        self.time_label.color = tokens.hint
+        self.recurrence_label.color = tokens.hint
 
     def _update_rect(self, *args):
         """Update background rectangle"""
         self.bg_rect.pos = self.pos
         self.bg_rect.size = self.size
 
+    @profiled("BaseTaskItem.build_ui")
     def build_ui(self):
-        """Build the UI components"""
+        """Build the UI components (once per widget)"""
         # Modern checkbox
         self.checkbox = MDCheckbox(
             size_hint=(None, None),
@@ -156,7 +210,7 @@ class BaseTaskItem(MDBoxLayout):
         self.add_widget(self.checkbox)
 
         # Task content
-        content_layout = MDBoxLayout(
+        self.content_layout = MDBoxLayout(
             orientation='vertical',
             spacing=dp(4)
         )
@@ -170,66 +224,28 @@ class BaseTaskItem(MDBoxLayout):
             height=dp(28),
             bold=True
         )
+        self.content_layout.add_widget(self.title_label)
 
-        # Set initial color
-        app = MDApp.get_running_app()
-        if app and app.theme_cls:
-            is_dark = app.theme_cls.theme_style == "Dark"
-            if self.task_completed:
-                self.title_label.color = (0.5, 0.5, 0.5, 1)
-            else:
-                self.title_label.color = Colors.DARK_TEXT if is_dark else Colors.LIGHT_TEXT
-
-        content_layout.add_widget(self.title_label)
-
-        # Time info
-        if self.task_start_time or self.task_end_time:
-            time_text = self._get_time_text()
-            if time_text:
-                self.time_label = MDLabel(
-                    text=time_text,
-                    font_style="Caption",
-                    size_hint_y=None,
-                    height=dp(18)
-                )
-
-                # Set color
-                if app and app.theme_cls:
-                    is_dark = app.theme_cls.theme_style == "Dark"
-                    self.time_label.color = Colors.HINT_TEXT_DARK if is_dark else Colors.HINT_TEXT_LIGHT
-
-                content_layout.add_widget(self.time_label)
-
-        # Recurrence info
-        if self.task_recurrence:
-            recurrence_text = self._get_recurrence_text()
-            self.recurrence_label = MDLabel(
-                text=recurrence_text,
-                font_style="Caption",
-                size_hint_y=None,
-                height=dp(18)
-            )
-
-            # Set color
-            if app and app.theme_cls:
-                is_dark = app.theme_cls.theme_style == "Dark"
-                self.recurrence_label.color = Colors.HINT_TEXT_DARK if is_dark else Colors.HINT_TEXT_LIGHT
-
-            content_layout.add_widget(self.recurrence_label)
-
-        # Motivation info
-        if self.task_motivation:
-            self.motivation_label = MDLabel(
-                text=f"💪 {self.task_motivation}",
-                font_style="Caption",
-                size_hint_y=None,
-                height=dp(18),
-                color=(0.1, 0.6, 0.3, 1),  # Green color
-                italic=True
-            )
-            content_layout.add_widget(self.motivation_label)
+        # Time, recurrence and motivation lines; attached by _on_details() when they have text
+        self.time_label = MDLabel(
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(18)
+        )
+        self.recurrence_label = MDLabel(
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(18)
+        )
+        self.motivation_label = MDLabel(
+            font_style="Caption",
+            size_hint_y=None,
+            height=dp(18),
+            color=self.tokens.motivation,
+            italic=True
+        )
 
-        self.add_widget(content_layout)
+        self.add_widget(self.content_layout)
 
         # Delete button
         self.delete_btn = MDIconButton(
@@ -244,25 +260,16 @@ class BaseTaskItem(MDBoxLayout):
 
     def _get_time_text(self):
         """Get formatted time text"""
-        if self.task_start_time and self.task_end_time:
-            return f"🕐 {self.task_start_time} - {self.task_end_time}"
-        elif self.task_start_time:
-            return f"🕐 Starts at {self.task_start_time}"
-        return ""
+        return time_text(self.task_start_time, self.task_end_time)
 
     def _get_recurrence_text(self):
         """Get formatted recurrence text"""
-        recurrence_icons = {
-            "today": "🔄 Daily",
-            "week": "🔄 Weekly",
-            "month": "🔄 Monthly",
-            "year": "🔄 Yearly",
-            "custom": "🔄 Custom"
-        }
-        return recurrence_icons.get(self.task_recurrence, "🔄 Repeating")
+        return recurrence_text(self.task_recurrence)
 
     def on_checkbox_active(self, checkbox, value):
         """Handle checkbox toggle"""
+        if self._syncing_checkbox:
+            return
         if self._on_toggle_complete:
             self._on_toggle_complete(self.task_id, value)
         self.update_completed_style(value)
@@ -270,12 +277,6 @@ class BaseTaskItem(MDBoxLayout):
     def update_completed_style(self, completed):
         """Update visual style for completion status"""
         self.task_completed = completed
-        self.title_label.strikethrough = completed
-
-        app = MDApp.get_running_app()
-        if app and app.theme_cls:
-            is_dark = app.theme_cls.theme_style == "Dark"
-            self._update_label_colors(is_dark)
 
     def on_delete_click(self, button_instance):
         """Handle delete button click"""
@@ -296,8 +297,16 @@ class BaseTaskItem(MDBoxLayout):
             if hasattr(self, 'delete_btn') and self.delete_btn.collide_point(*touch.pos):
                 return super().on_touch_down(touch)
 
-            # Touch is on task content area - open details
+            # Touch is on task content area - open details on release, so a
+            # long press can start a drag instead
+            touch.ud['task_tap'] = self.task_id
+            return True
+        return super().on_touch_down(touch)
+
+    def on_touch_up(self, touch):
+        if touch.ud.get('task_tap') == self.task_id and self.collide_point(*touch.pos):
+            del touch.ud['task_tap']
             if self._on_task_click:
                 self._on_task_click(self.task_id)
             return True
-        return super().on_touch_down(touch)
\ No newline at end of file
+        return super().on_touch_up(touch)
\ No newline at end of file
@@ -753,4 +753,35 @@ class ConfirmDialog(BaseDialog):
 
     def on_confirm(self, *args):
         self.callback()
-        self.dismiss()
\ No newline at end of file
+        self.dismiss()
+
+class UndoSnackbar:
+    """Snackbar with an UNDO action; showing it again replaces the previous one"""
+
+    def __init__(self, on_undo, duration=UNDO_WINDOW):
+        self.on_undo = on_undo
+        self.duration = duration
+        self.snackbar = None
+
+    def show(self, text):
+        from kivymd.uix.snackbar import MDSnackbar, MDSnackbarActionButton
+
+        self.dismiss()
+        self.snackbar = MDSnackbar(
+            MDLabel(text=text),
+            MDSnackbarActionButton(text="UNDO", on_release=self._undo),
+            y=dp(24),
+            pos_hint={"center_x": 0.5},
+            size_hint_x=0.9,
+            duration=self.duration,
+        )
+        self.snackbar.open()
+
+    def _undo(self, *args):
+        self.dismiss()
+        self.on_undo()
+
+    def dismiss(self):
+        if self.snackbar:
+            self.snackbar.dismiss()
+            self.snackbar = None
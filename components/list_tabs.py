@@ -3,8 +3,8 @@ from kivymd.uix.scrollview import MDScrollView
 from kivymd.uix.button import MDFlatButton, MDIconButton
 from kivy.metrics import dp
 from kivy.graphics import Color, Line
-from kivymd.app import MDApp
 from utils.constants import Colors
+from utils.theme_tokens import get_theme_tokens
 
 
 class ListTabs(MDBoxLayout):
@@ -23,14 +23,19 @@ class ListTabs(MDBoxLayout):
         self.on_add_list = on_add_list
         self.current_list_id = None
         self.tab_buttons = {}
+        self.tokens = get_theme_tokens()
 
         # Add bottom border
         with self.canvas.after:
-            self.border_color = Color(0.9, 0.9, 0.9, 1)
+            self.border_color = Color(*self.tokens.border)
             self.border_line = Line(width=1)
 
         self.bind(pos=self._update_border, size=self._update_border)
 
+        # Border and inactive tab colors follow the theme tokens
+        self.tokens.bind(border=self._on_border_token,
+                         tab_inactive=self._on_tab_inactive_token)
+
         # Scrollable container
         self.scroll = MDScrollView(
             do_scroll_y=False,
@@ -67,12 +72,13 @@ class ListTabs(MDBoxLayout):
             self.x, self.y,
             self.x + self.width, self.y
         ]
-        # Update border color based on theme
-        app = MDApp.get_running_app()
-        if app and app.theme_cls.theme_style == "Dark":
-            self.border_color.rgba = (0.3, 0.3, 0.3, 1)
-        else:
-            self.border_color.rgba = (0.9, 0.9, 0.9, 1)
+
+    def _on_border_token(self, tokens, color):
+        self.border_color.rgba = color
+
+    def _on_tab_inactive_token(self, tokens, color):
+        if self.current_list_id is not None:
+            self.highlight_tab(self.current_list_id)
 
     def update_tabs(self):
         """Create clean tab buttons"""
@@ -127,8 +133,7 @@ class ListTabs(MDBoxLayout):
     def highlight_tab(self, list_id):
         """Highlight selected tab with minimal style"""
         self.current_list_id = list_id
-        app = MDApp.get_running_app()
-        is_dark = app and app.theme_cls.theme_style == "Dark"
+        inactive_color = self.tokens.tab_inactive
 
         for lid, tab_wrapper in self.tab_buttons.items():
             btn = tab_wrapper.btn
@@ -139,10 +144,7 @@ class ListTabs(MDBoxLayout):
                 tab_wrapper.indicator_color.rgba = Colors.PRIMARY_BLUE
             else:
                 # Inactive tab - Gray text, no indicator
-                if is_dark:
-                    btn.text_color = (0.7, 0.7, 0.7, 1)
-                else:
-                    btn.text_color = (0.4, 0.4, 0.4, 1)
+                btn.text_color = inactive_color
                 tab_wrapper.indicator_color.rgba = (0, 0, 0, 0)  # Hide indicator
 
     def _on_tab_click(self, list_id):
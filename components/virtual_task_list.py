@@ -1,12 +1,19 @@
 """
 Virtual Task List - Now uses BaseTaskItem to eliminate duplication
+Long-press a row, then drag, to reorder it among its siblings.
+Swipe a row left to delete it or right to toggle its completion.
+In select mode taps toggle row selection and swipes/drags are off.
 """
 
-from kivymd.uix.recycleview import RecycleView
-from kivymd.uix.recycleview.views import RecycleDataViewBehavior
-from kivymd.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.animation import Animation
+from kivy.clock import Clock
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
 from kivy.metrics import dp
 from components.base_task_item import BaseTaskItem
+from services.task_view_models import find_row, row_at, row_offsets, sibling_blocks
+from utils.gesture_handler import GestureHandler
 
 
 class RecyclableTaskItem(RecycleDataViewBehavior, BaseTaskItem):
@@ -22,23 +29,51 @@ class RecyclableTaskItem(RecycleDataViewBehavior, BaseTaskItem):
         self.index = 0
 
     def refresh_view_attrs(self, rv, index, data):
-        """Called when data is updated - RecycleView specific"""
+        """
+        Called when a row is (re)bound to data - RecycleView specific.
+        Data is {'row': TaskRow, 'height': px}; the row carries everything
+        to display and the callbacks come from the list, so the default
+        per-key setattr is not needed.
+        """
         self.index = index
-
-        # Use the base class update_data method
-        self.update_data(data)
-
-        return super().refresh_view_attrs(rv, index, data)
+        self.set_callbacks(**rv.callbacks)
+        self.apply_row(data['row'])
+        self.opacity = 0.6 if data.get('dragging') else 1
+        self.set_selected(rv.select_mode and data['row'].task_id in rv.selected)
 
 
 class VirtualTaskList(RecycleView):
     """Virtual scrolling task list with recycled widgets"""
 
-    def __init__(self, **kwargs):
+    # Finger movement that cancels a pending long press (it is a scroll)
+    DRAG_SLOP = dp(10)
+    # Distance from the top/bottom edge that scrolls the list while dragging
+    AUTO_SCROLL_EDGE = dp(48)
+
+    def __init__(self, callbacks=None, on_reorder=None, on_swipe=None, **kwargs):
         super().__init__(**kwargs)
         self.data = []
         self.viewclass = 'RecyclableTaskItem'
 
+        # on_task_click, on_toggle_complete, on_delete - shared by every row
+        self.callbacks = callbacks or {}
+
+        # on_reorder(task_id, before_id=None, after_id=None) - once per drag
+        self.on_reorder = on_reorder
+        # on_swipe(row, 'left' | 'right')
+        self.on_swipe = on_swipe
+        self._swipe = None
+        self._offsets = None  # row tops, rebuilt lazily after data changes
+        self._press = None
+        self._press_event = None
+        self._drag = None
+        self._pending_rows = None  # a reload that arrived mid-drag
+
+        # Multi-select: ids of the selected tasks, kept across reloads
+        self.select_mode = False
+        self.selected = set()
+        self.bind(data=self._on_data)
+
         # Layout manager
         self.layout_manager = RecycleBoxLayout(
             default_size=(None, dp(90)),
@@ -56,62 +91,269 @@ class VirtualTaskList(RecycleView):
         self.bar_width = dp(8)
         self.effect_cls = 'ScrollEffect'  # Smooth scrolling
 
-    def load_tasks(self, tasks, callbacks):
+    @property
+    def rows(self):
+        return [item['row'] for item in self.data]
+
+    def _on_data(self, *args):
+        self._offsets = None
+
+    @property
+    def is_dragging(self):
+        return self._drag is not None
+
+    # ===== MULTI-SELECT =====
+
+    def set_select_mode(self, enabled):
+        self.select_mode = enabled
+        self.selected.clear()
+        self._refresh_selection()
+
+    def toggle_selected(self, task_id):
+        """Select or deselect a task; returns the number selected"""
+        if task_id in self.selected:
+            self.selected.discard(task_id)
+        else:
+            self.selected.add(task_id)
+        self._refresh_selection()
+        return len(self.selected)
+
+    def select_all(self):
+        """Select every row, or clear the selection if all are selected already"""
+        ids = {item['row'].task_id for item in self.data}
+        self.selected = set() if ids <= self.selected else ids
+        self._refresh_selection()
+        return len(self.selected)
+
+    @property
+    def selected_ids(self):
+        """Selected task ids that are still in the list, in list order"""
+        return [item['row'].task_id for item in self.data if item['row'].task_id in self.selected]
+
+    def _refresh_selection(self):
+        """Only the visible rows have widgets - restyle just those"""
+        for view in list(self.view_adapter.views.values()):
+            view.set_selected(self.select_mode and view.task_id in self.selected)
+
+    # ===== TOUCH =====
+
+    def _row_index_at(self, touch_y):
+        """Row under a y coordinate - prefix sums and a bisect, no widget walk"""
+        if self._offsets is None:
+            self._offsets = row_offsets([item['height'] for item in self.data],
+                                        self.layout_manager.spacing)
+        padding_top = self.layout_manager.padding[1]
+        return row_at(self._offsets, self.layout_manager.top - padding_top - touch_y)
+
+    def on_touch_down(self, touch):
+        if ((self.on_reorder or self.on_swipe) and not self.select_mode
+                and self._drag is None and self._swipe is None
+                and self._press is None and self.collide_point(*touch.pos)
+                and not touch.is_mouse_scrolling):
+            self._press = touch
+            if self.on_reorder:
+                self._press_event = Clock.schedule_once(
+                    lambda dt: self._start_drag(touch), GestureHandler.LONG_PRESS_DURATION
+                )
+        return super().on_touch_down(touch)
+
+    def on_touch_move(self, touch):
+        if self._drag is not None and touch is self._drag['touch']:
+            self._drag_to(touch)
+            return True
+
+        if self._swipe is not None and touch is self._swipe['touch']:
+            self._swipe['view'].x = self._swipe['x'] + touch.x - touch.ox
+            return True
+
+        if touch is self._press:
+            dx = touch.x - touch.ox
+            dy = touch.y - touch.oy
+            if abs(dx) > self.DRAG_SLOP or abs(dy) > self.DRAG_SLOP:
+                self._cancel_press()
+                # Mostly horizontal: swipe the row instead of scrolling
+                if self.on_swipe and abs(dx) > 2 * abs(dy) and self._start_swipe(touch):
+                    return True
+        return super().on_touch_move(touch)
+
+    def on_touch_up(self, touch):
+        if touch is self._press:
+            self._cancel_press()
+
+        if self._drag is not None and touch is self._drag['touch']:
+            self._end_drag()
+            return True
+
+        if self._swipe is not None and touch is self._swipe['touch']:
+            self._end_swipe(touch)
+            return True
+        return super().on_touch_up(touch)
+
+    def _cancel_press(self):
+        if self._press_event:
+            self._press_event.cancel()
+        self._press = None
+        self._press_event = None
+
+    # ===== SWIPE ACTIONS =====
+
+    def _start_swipe(self, touch):
+        index = self._row_index_at(touch.oy)
+        view = self.view_adapter.get_visible_view(index) if index is not None else None
+        if view is None:
+            return False
+
+        touch.ud.pop('task_tap', None)  # the release must not open the task
+        Animation.cancel_all(view, 'x')
+        self._swipe = {'touch': touch, 'row': self.data[index]['row'], 'view': view, 'x': view.x}
+        view.x += touch.x - touch.ox
+        return True
+
+    def _end_swipe(self, touch):
+        """Past the threshold the row's action fires, otherwise the row slides back"""
+        swipe, self._swipe = self._swipe, None
+        view = swipe['view']
+        dx = touch.x - touch.ox
+
+        if abs(dx) < max(GestureHandler.SWIPE_THRESHOLD, self.width * 0.3):
+            Animation(x=swipe['x'], duration=0.2, t='out_cubic').start(view)
+            return
+
+        view.x = swipe['x']
+        self.on_swipe(swipe['row'], 'right' if dx > 0 else 'left')
+
+    # ===== DRAG REORDERING =====
+
+    def _start_drag(self, touch):
+        self._press = None
+        self._press_event = None
+
+        index = self._row_index_at(touch.y)
+        if index is None:
+            return
+
+        row = self.data[index]['row']
+        touch.ud.pop('task_tap', None)  # the release must not open the task
+        self._drag = {'touch': touch, 'task_id': row.task_id, 'start_index': index}
+        self._set_dragging(index, True)
+
+    def _dragged_block(self, blocks):
+        task_id = self._drag['task_id']
+        for position, (start, end) in enumerate(blocks):
+            if self.data[start]['row'].task_id == task_id:
+                return position
+        return None
+
+    def _drag_to(self, touch):
+        """Move the dragged rows in the data as soon as the finger passes a neighbour's middle"""
+        self._auto_scroll(touch)
+
+        index = self._row_index_at(touch.y)
+        if index is None:
+            return
+
+        rows = self.rows
+        blocks = sibling_blocks(rows, find_row(rows, self._drag['task_id']))
+        current = self._dragged_block(blocks)
+
+        target = None
+        for position, (start, end) in enumerate(blocks):
+            if start <= index < end:
+                target = position
+                break
+        if target is None or current is None or target == current:
+            return
+
+        # Only swap once the finger is past the middle of the target block
+        start, end = blocks[target]
+        last = end - 1
+        middle = (self._offsets[start] + self._offsets[last] + self.data[last]['height']) / 2
+        finger = self.layout_manager.top - self.layout_manager.padding[1] - touch.y
+        if (target > current and finger < middle) or (target < current and finger > middle):
+            return
+
+        moved_start, moved_end = blocks[current]
+        moved = self.data[moved_start:moved_end]
+        rest = self.data[:moved_start] + self.data[moved_end:]
+        if target > current:
+            insert_at = blocks[target][1] - (moved_end - moved_start)
+        else:
+            insert_at = blocks[target][0]
+        self.data = rest[:insert_at] + moved + rest[insert_at:]
+
+    def _auto_scroll(self, touch):
+        """Scroll while the finger rests near the top or bottom edge"""
+        if self.height <= 0 or self.layout_manager.height <= self.height:
+            return
+        if touch.y > self.top - self.AUTO_SCROLL_EDGE:
+            step = dp(12)
+        elif touch.y < self.y + self.AUTO_SCROLL_EDGE:
+            step = -dp(12)
+        else:
+            return
+        _, scroll = self.convert_distance_to_scroll(0, step)
+        self.scroll_y = min(max(self.scroll_y + scroll, 0), 1)
+
+    def _end_drag(self):
+        """Persist the drop with a single move - hover steps only touched the view data"""
+        drag, self._drag = self._drag, None
+        pending, self._pending_rows = self._pending_rows, None
+        rows = self.rows
+        index = find_row(rows, drag['task_id'])
+        if index is not None:
+            self._set_dragging(index, False)
+
+        if index is None or index == drag['start_index']:
+            if pending is not None:
+                self.load_tasks(pending)
+            return
+
+        blocks = sibling_blocks(rows, index)
+        position = self._dragged_block(blocks)
+        if position > 0:
+            neighbours = {'after_id': rows[blocks[position - 1][0]].task_id}
+        else:
+            neighbours = {'before_id': rows[blocks[1][0]].task_id}
+        self.on_reorder(drag['task_id'], **neighbours)
+
+    def _set_dragging(self, index, dragging):
+        item = dict(self.data[index])
+        item['dragging'] = dragging
+        self.data[index] = item
+
+    # ===== DATA =====
+
+    def load_tasks(self, rows, callbacks=None):
         """
-        Load tasks into virtual list
+        Load rows into virtual list
 
         Args:
-            tasks: List of Task objects
-            callbacks: Dict with on_task_click, on_toggle_complete, on_delete
+            rows: List of TaskRow (from TaskService.get_list_rows)
+            callbacks: Optional dict with on_task_click, on_toggle_complete, on_delete
         """
-        self.data = []
+        if callbacks:
+            self.callbacks = callbacks
 
-        for task in tasks:
-            task_data = {
-                'task_id': task.id,
-                'task_title': task.title,
-                'task_notes': task.notes or "",
-                'task_start_time': task.start_time or "",
-                'task_end_time': task.end_time or "",
-                'task_recurrence': task.recurrence_type or "",
-                'task_motivation': task.motivation or "",
-                'task_completed': task.completed,
-                'is_subtask': False,
-                'on_task_click': callbacks.get('on_task_click'),
-                'on_toggle_complete': callbacks.get('on_toggle_complete'),
-                'on_delete': callbacks.get('on_delete')
-            }
-            self.data.append(task_data)
-
-            # Add subtasks
-            for subtask in task.subtasks:
-                subtask_data = {
-                    'task_id': subtask.id,
-                    'task_title': subtask.title,
-                    'task_notes': "",
-                    'task_start_time': "",
-                    'task_end_time': "",
-                    'task_recurrence': "",
-                    'task_motivation': "",
-                    'task_completed': subtask.completed,
-                    'is_subtask': True,
-                    'on_task_click': callbacks.get('on_task_click'),
-                    'on_toggle_complete': callbacks.get('on_toggle_complete'),
-                    'on_delete': callbacks.get('on_delete')
-                }
-                self.data.append(subtask_data)
-
-        self.refresh_from_data()
+        # Do not yank the rows from under the finger; applied when the drag ends
+        if self._drag is not None:
+            self._pending_rows = rows
+            return
+
+        # Cached rows keep their identity, so an unchanged list is detected cheaply
+        current = self.data
+        if len(current) == len(rows) and all(item['row'] is row for item, row in zip(current, rows)):
+            return
+
+        self.data = [{'row': row, 'height': dp(row.height)} for row in rows]
 
     def update_task_completion(self, task_id, completed):
         """Update specific task completion status"""
-        for item in self.data:
-            if item['task_id'] == task_id:
-                item['task_completed'] = completed
-                break
-        self.refresh_from_data()
+        index = find_row(self.rows, task_id)
+        if index is not None:
+            row = self.data[index]['row'].replace(completed=completed)
+            self.data[index] = {'row': row, 'height': dp(row.height)}
 
     def remove_task(self, task_id):
-        """Remove task from list"""
-        self.data = [item for item in self.data if item['task_id'] != task_id]
-        self.refresh_from_data()
\ No newline at end of file
+        """Remove task (and its subtask rows) from list"""
+        self.data = [item for item in self.data
+                     if item['row'].task_id != task_id and item['row'].parent_id != task_id]
@@ -1,21 +1,107 @@
 import sqlite3
+import uuid
 from datetime import datetime
 from functools import lru_cache
 from contextlib import contextmanager
-from utils.constants import DB_NAME, DEFAULT_LIST_NAME
-from database.models import Task, TaskList, TaskCategory
+from utils.constants import ARCHIVE_CHUNK_SIZE, DB_NAME, DEFAULT_LIST_NAME, POSITION_MIN_GAP, SQL_CHUNK_SIZE
+from database.models import ArchivedTask, Task, TaskList, TaskCategory
+from database.query_tracer import QueryTracer, slow_log_path_for, tracing_enabled
+
+
+# Column order of the rows yielded by fetch_export_rows()
+EXPORT_COLUMNS = (
+    'list_id', 'list_name', 'category', 'list_uuid',
+    'task_id', 'parent_id', 'title', 'notes', 'due_date', 'start_time', 'end_time',
+    'reminder_time', 'completed', 'position', 'recurrence_type', 'recurrence_interval',
+    'last_completed_date', 'motivation', 'created_at', 'uuid', 'modified_at', 'parent_uuid'
+)
+
+
+def chunked(ids, size=SQL_CHUNK_SIZE):
+    """Split ids into lists small enough for one IN (...) clause"""
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def fetch_export_rows(conn, list_id=None, category=None):
+    """
+    Stream lists and their tasks with ONE ordered query.
+
+    Rows come out grouped by list (category order, then position) and, inside
+    a list, each top-level task is immediately followed by its subtasks, in the
+    same order get_tasks_by_list() uses. Lists without tasks yield a single row
+    whose task columns are NULL.
+    """
+    query = '''
+        SELECT
+            l.id, l.name, l.category, l.uuid,
+            t.id, t.parent_id, t.title, t.notes, t.due_date, t.start_time, t.end_time,
+            t.reminder_time, t.completed, t.position, t.recurrence_type, t.recurrence_interval,
+            t.last_completed_date, t.motivation, t.created_at, t.uuid, t.modified_at, p.uuid
+        FROM task_lists l
+        LEFT JOIN tasks t ON t.list_id = l.id
+        LEFT JOIN tasks p ON p.id = t.parent_id
+        WHERE (t.id IS NULL OR t.parent_id IS NULL OR p.id IS NOT NULL)
+    '''
+    params = []
+
+    if list_id is not None:
+        query += ' AND l.id = ?'
+        params.append(list_id)
+    if category is not None:
+        query += ' AND l.category = ?'
+        params.append(category)
+
+    query += '''
+        ORDER BY
+            CASE l.category
+                WHEN 'daily' THEN 1
+                WHEN 'weekend' THEN 2
+                WHEN 'monthly' THEN 3
+                WHEN 'yearly' THEN 4
+            END, l.position, l.id,
+            COALESCE(p.completed, t.completed) ASC,
+            COALESCE(p.position, t.position) ASC,
+            COALESCE(p.created_at, t.created_at) DESC,
+            COALESCE(p.id, t.id),
+            t.parent_id IS NOT NULL,
+            t.position ASC
+    '''
+
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    while True:
+        rows = cursor.fetchmany(500)
+        if not rows:
+            break
+        yield from rows
 
 
 class DatabaseManager:
-    def __init__(self):
-        self.db_name = DB_NAME
+    def __init__(self, db_name=DB_NAME, trace=None):
+        self.db_name = db_name
         self._connection_pool = []
+        # trace=None follows MOMENTUM_TRACE / MOMENTUM_PROFILE
+        if trace is None:
+            trace = tracing_enabled()
+        self.tracer = QueryTracer(slow_log_path=slow_log_path_for(db_name)) if trace else None
         self.init_database()
 
+    def _connect(self):
+        """Open a connection, traced when query tracing is enabled"""
+        if self.tracer:
+            return self.tracer.connect(self.db_name)
+        return sqlite3.connect(self.db_name)
+
+    def get_query_stats(self):
+        """Snapshot of per-statement query statistics (empty if tracing is off)"""
+        return self.tracer.snapshot() if self.tracer else {}
+
     @contextmanager
     def get_connection_context(self):
         """Context manager for database connections with proper cleanup"""
-        conn = sqlite3.connect(self.db_name)
+        conn = self._connect()
         try:
             yield conn
         except Exception as e:
@@ -28,13 +114,17 @@ class DatabaseManager:
 
     def get_connection(self):
         """Get database connection - use get_connection_context() instead when possible"""
-        return sqlite3.connect(self.db_name)
+        return self._connect()
 
     def init_database(self):
         """Initialize database tables"""
         with self.get_connection_context() as conn:
             cursor = conn.cursor()
 
+            # WAL lets readers (exports, background workers) run alongside the
+            # UI's writes. The mode is persistent, so this only changes once.
+            cursor.execute('PRAGMA journal_mode=WAL')
+
             # Create task_lists table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS task_lists (
@@ -42,7 +132,9 @@ class DatabaseManager:
                     name TEXT NOT NULL,
                     category TEXT DEFAULT 'daily',
                     position INTEGER DEFAULT 0,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    uuid TEXT,
+                    modified_at TIMESTAMP
                 )
             ''')
 
@@ -56,6 +148,20 @@ class DatabaseManager:
                 cursor.execute('UPDATE task_lists SET category = "daily" WHERE category IS NULL')
                 print("✅ Database migration complete!")
 
+            # Migration: Add stable uuid / modified_at columns (used by merge-import)
+            if 'uuid' not in columns:
+                print("🔄 Migrating database: Adding list uuid columns...")
+                cursor.execute('ALTER TABLE task_lists ADD COLUMN uuid TEXT')
+                cursor.execute('ALTER TABLE task_lists ADD COLUMN modified_at TIMESTAMP')
+                cursor.execute('UPDATE task_lists SET uuid = lower(hex(randomblob(16))) WHERE uuid IS NULL')
+                cursor.execute('''
+                    UPDATE task_lists SET modified_at = COALESCE(created_at, CURRENT_TIMESTAMP)
+                    WHERE modified_at IS NULL
+                ''')
+                print("✅ List uuid columns added!")
+
+            cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_lists_uuid ON task_lists(uuid)')
+
             # Create tasks table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS tasks (
@@ -69,12 +175,14 @@ class DatabaseManager:
                     reminder_time TIME,
                     completed BOOLEAN DEFAULT 0,
                     parent_id INTEGER,
-                    position INTEGER DEFAULT 0,
+                    position REAL DEFAULT 0,
                     recurrence_type TEXT,
                     recurrence_interval INTEGER DEFAULT 1,
                     last_completed_date DATE,
                     motivation TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    uuid TEXT,
+                    modified_at TIMESTAMP,
                     FOREIGN KEY (list_id) REFERENCES task_lists (id) ON DELETE CASCADE,
                     FOREIGN KEY (parent_id) REFERENCES tasks (id) ON DELETE CASCADE
                 )
@@ -89,17 +197,219 @@ class DatabaseManager:
                 cursor.execute('ALTER TABLE tasks ADD COLUMN motivation TEXT')
                 print("✅ Motivation column added!")
 
+            if 'uuid' not in task_columns:
+                print("🔄 Migrating database: Adding task uuid columns...")
+                cursor.execute('ALTER TABLE tasks ADD COLUMN uuid TEXT')
+                cursor.execute('ALTER TABLE tasks ADD COLUMN modified_at TIMESTAMP')
+                cursor.execute('UPDATE tasks SET uuid = lower(hex(randomblob(16))) WHERE uuid IS NULL')
+                cursor.execute('''
+                    UPDATE tasks SET modified_at = COALESCE(created_at, CURRENT_TIMESTAMP)
+                    WHERE modified_at IS NULL
+                ''')
+                print("✅ Task uuid columns added!")
+
+            cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_tasks_uuid ON tasks(uuid)')
+
+            # Sibling order: tasks with the same parent and list, by position.
+            # Positions are fractional (older databases declare the column
+            # INTEGER, which still stores non-integral values as REAL).
+            # parent_id leads so subtask joins (s.parent_id = p.id) can use it;
+            # with list_id first SQLite scanned the whole index per parent.
+            cursor.execute("PRAGMA index_info(idx_tasks_siblings)")
+            if [row[2] for row in cursor.fetchall()][:1] == ['list_id']:
+                cursor.execute('DROP INDEX idx_tasks_siblings')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_tasks_siblings ON tasks(parent_id, list_id, position)')
+
+            self._init_completion_log(cursor)
+            self._init_archive(cursor)
+
             # Create default lists if none exist
             cursor.execute('SELECT COUNT(*) FROM task_lists')
             if cursor.fetchone()[0] == 0:
                 print("📝 Creating default lists for each category...")
                 for idx, cat in enumerate(TaskCategory.get_all()):
-                    cursor.execute(
-                        'INSERT INTO task_lists (name, category, position) VALUES (?, ?, ?)',
-                        (f"My {cat['name']}", cat['id'], idx)
-                    )
+                    cursor.execute('''
+                        INSERT INTO task_lists (name, category, position, uuid, modified_at)
+                        VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                    ''', (f"My {cat['name']}", cat['id'], idx, self._default_list_uuid(cat['id'])))
                 print("✅ Default lists created!")
 
+    def _init_completion_log(self, cursor):
+        """
+        Completion history for analytics.
+
+        completion_events is an append-only log of every completed/reopened
+        change; completion_daily (per day and list) and completion_hourly
+        (per hour of day and category) are running totals. Triggers on tasks
+        keep all three current for every write path (toggle, bulk updates),
+        so statistics read O(days) rows instead of scanning tasks. Days and
+        hours are local time.
+
+        While completion_paused has a row the triggers do nothing: imports
+        insert that row inside their transaction and add the imported tasks
+        with their own dates instead (see _backfill_completion_history()).
+        """
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'completion_events'")
+        is_new = cursor.fetchone() is None
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS completion_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id INTEGER NOT NULL,
+                list_id INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                completed INTEGER NOT NULL,
+                occurred_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS completion_daily (
+                day DATE NOT NULL,
+                list_id INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                created INTEGER NOT NULL DEFAULT 0,
+                completed INTEGER NOT NULL DEFAULT 0,
+                reopened INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, list_id)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS completion_hourly (
+                hour INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (hour, category)
+            )
+        ''')
+        cursor.execute('CREATE TABLE IF NOT EXISTS completion_paused (reason TEXT PRIMARY KEY)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_completion_daily_category ON completion_daily(category, day)')
+
+        # Recreated on every start so existing databases get the current definitions
+        cursor.execute('DROP TRIGGER IF EXISTS trg_tasks_created')
+        cursor.execute('DROP TRIGGER IF EXISTS trg_tasks_completed')
+
+        category = "COALESCE((SELECT category FROM task_lists WHERE id = NEW.list_id), 'daily')"
+        cursor.execute(f'''
+            CREATE TRIGGER trg_tasks_created AFTER INSERT ON tasks
+            WHEN NOT EXISTS (SELECT 1 FROM completion_paused)
+            BEGIN
+                INSERT INTO completion_daily (day, list_id, category, created)
+                VALUES (date('now', 'localtime'), NEW.list_id, {category}, 1)
+                ON CONFLICT(day, list_id) DO UPDATE SET created = created + 1;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER trg_tasks_completed AFTER UPDATE OF completed ON tasks
+            WHEN COALESCE(NEW.completed, 0) != COALESCE(OLD.completed, 0)
+                 AND NOT EXISTS (SELECT 1 FROM completion_paused)
+            BEGIN
+                INSERT INTO completion_events (task_id, list_id, category, completed)
+                VALUES (NEW.id, NEW.list_id, {category}, CASE WHEN NEW.completed THEN 1 ELSE 0 END);
+
+                INSERT INTO completion_daily (day, list_id, category, completed, reopened)
+                VALUES (date('now', 'localtime'), NEW.list_id, {category},
+                        CASE WHEN NEW.completed THEN 1 ELSE 0 END,
+                        CASE WHEN NEW.completed THEN 0 ELSE 1 END)
+                ON CONFLICT(day, list_id) DO UPDATE SET
+                    completed = completed + excluded.completed,
+                    reopened = reopened + excluded.reopened;
+
+                INSERT INTO completion_hourly (hour, category, completed)
+                SELECT CAST(strftime('%H', 'now', 'localtime') AS INTEGER), {category}, 1
+                WHERE NEW.completed
+                ON CONFLICT(hour, category) DO UPDATE SET completed = completed + 1;
+            END
+        ''')
+
+        if is_new:
+            # Seed the totals from existing tasks
+            self._backfill_completion_history(cursor)
+
+    @staticmethod
+    def _backfill_completion_history(cursor, after_task_id=0):
+        """
+        Add tasks with id > after_task_id to the completion totals, dated by
+        their own timestamps: created_at for "created" and, for completed
+        tasks, the last modification (the best record there is).
+        """
+        cursor.execute('SELECT COALESCE(MAX(id), 0) FROM completion_events')
+        after_event_id = cursor.fetchone()[0]
+
+        cursor.execute('''
+            INSERT INTO completion_events (task_id, list_id, category, completed, occurred_at)
+            SELECT t.id, t.list_id, COALESCE(l.category, 'daily'), 1,
+                   COALESCE(t.modified_at, t.created_at, CURRENT_TIMESTAMP)
+            FROM tasks t LEFT JOIN task_lists l ON l.id = t.list_id
+            WHERE t.completed = 1 AND t.id > ?
+            ORDER BY 5
+        ''', (after_task_id,))
+        cursor.execute('''
+            INSERT INTO completion_daily (day, list_id, category, created, completed)
+            SELECT day, list_id, category, SUM(created), SUM(completed) FROM (
+                SELECT date(COALESCE(t.created_at, CURRENT_TIMESTAMP), 'localtime') AS day,
+                       t.list_id, COALESCE(l.category, 'daily') AS category,
+                       1 AS created, 0 AS completed
+                FROM tasks t LEFT JOIN task_lists l ON l.id = t.list_id
+                WHERE t.id > ?
+                UNION ALL
+                SELECT date(occurred_at, 'localtime'), list_id, category, 0, 1
+                FROM completion_events WHERE id > ?
+            ) WHERE true GROUP BY day, list_id
+            ON CONFLICT(day, list_id) DO UPDATE SET
+                created = created + excluded.created,
+                completed = completed + excluded.completed
+        ''', (after_task_id, after_event_id))
+        cursor.execute('''
+            INSERT INTO completion_hourly (hour, category, completed)
+            SELECT CAST(strftime('%H', occurred_at, 'localtime') AS INTEGER), category, COUNT(*)
+            FROM completion_events WHERE id > ? GROUP BY 1, 2
+            ON CONFLICT(hour, category) DO UPDATE SET completed = completed + excluded.completed
+        ''', (after_event_id,))
+
+    def _init_archive(self, cursor):
+        """
+        archived_tasks holds completed tasks moved out of tasks (same ids, which
+        AUTOINCREMENT never reuses), with the name and category of their list
+        at archive time so history survives list deletion.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS archived_tasks (
+                id INTEGER PRIMARY KEY,
+                list_id INTEGER NOT NULL,
+                list_name TEXT,
+                category TEXT,
+                parent_id INTEGER,
+                title TEXT NOT NULL,
+                notes TEXT,
+                due_date DATE,
+                start_time TEXT,
+                end_time TEXT,
+                reminder_time TEXT,
+                completed BOOLEAN,
+                position REAL,
+                recurrence_type TEXT,
+                recurrence_interval INTEGER,
+                last_completed_date DATE,
+                motivation TEXT,
+                created_at TIMESTAMP,
+                uuid TEXT,
+                modified_at TIMESTAMP,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_archived_tasks_archived_at ON archived_tasks(archived_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_archived_tasks_list ON archived_tasks(list_id)')
+
+    @staticmethod
+    def _new_uuid():
+        """Generate a stable identifier for a new list or task"""
+        return uuid.uuid4().hex
+
+    @staticmethod
+    def _default_list_uuid(category):
+        """The same on every install, so the default lists of two devices merge"""
+        return uuid.uuid5(uuid.NAMESPACE_URL, f"momentum-track:default-list:{category}").hex
+
     def clear_cache(self):
         """Clear all cached data"""
         self.get_lists_by_category_cached.cache_clear()
@@ -119,14 +429,15 @@ class DatabaseManager:
         with self.get_connection_context() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, name, category, position, created_at 
+                SELECT id, name, category, position, created_at, uuid, modified_at
                 FROM task_lists 
                 WHERE category = ?
                 ORDER BY position
             ''', (category,))
             rows = cursor.fetchall()
             return [TaskList(id=row[0], name=row[1], category=row[2],
-                             position=row[3], created_at=row[4]) for row in rows]
+                             position=row[3], created_at=row[4],
+                             uuid=row[5], modified_at=row[6]) for row in rows]
 
     def get_all_categories_with_lists(self):
         """Get all categories with their lists"""
@@ -145,7 +456,7 @@ class DatabaseManager:
         with self.get_connection_context() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, name, category, position, created_at 
+                SELECT id, name, category, position, created_at, uuid, modified_at
                 FROM task_lists 
                 ORDER BY 
                     CASE category
@@ -157,21 +468,28 @@ class DatabaseManager:
             ''')
             rows = cursor.fetchall()
             return [TaskList(id=row[0], name=row[1], category=row[2],
-                             position=row[3], created_at=row[4]) for row in rows]
+                             position=row[3], created_at=row[4],
+                             uuid=row[5], modified_at=row[6]) for row in rows]
+
+    def iter_export_rows(self, list_id=None, category=None):
+        """Stream export rows (see fetch_export_rows) over a single connection"""
+        with self.get_connection_context() as conn:
+            yield from fetch_export_rows(conn, list_id=list_id, category=category)
 
     def get_list_by_id(self, list_id):
         """Get a specific task list"""
         with self.get_connection_context() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT id, name, category, position, created_at 
+                SELECT id, name, category, position, created_at, uuid, modified_at
                 FROM task_lists WHERE id = ?
             ''', (list_id,))
             row = cursor.fetchone()
 
             if row:
                 return TaskList(id=row[0], name=row[1], category=row[2],
-                                position=row[3], created_at=row[4])
+                                position=row[3], created_at=row[4],
+                                uuid=row[5], modified_at=row[6])
             return None
 
     def create_list(self, name, category="daily"):
@@ -195,9 +513,9 @@ class DatabaseManager:
             max_pos = cursor.fetchone()[0] or 0
 
             cursor.execute('''
-                INSERT INTO task_lists (name, category, position) 
-                VALUES (?, ?, ?)
-            ''', (name.strip(), category, max_pos + 1))
+                INSERT INTO task_lists (name, category, position, uuid, modified_at)
+                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ''', (name.strip(), category, max_pos + 1, self._new_uuid()))
             list_id = cursor.lastrowid
 
             # Clear cache
@@ -212,7 +530,7 @@ class DatabaseManager:
 
         with self.get_connection_context() as conn:
             cursor = conn.cursor()
-            cursor.execute('UPDATE task_lists SET name = ? WHERE id = ?',
+            cursor.execute('UPDATE task_lists SET name = ?, modified_at = CURRENT_TIMESTAMP WHERE id = ?',
                            (name.strip(), list_id))
             # Clear cache
             self.clear_cache()
@@ -232,23 +550,10 @@ class DatabaseManager:
             self.clear_cache()
 
     def cleanup_completed_daily_tasks(self):
-        """Delete completed tasks from daily lists"""
-        with self.get_connection_context() as conn:
-            cursor = conn.cursor()
-
-            # Get all daily list IDs
-            cursor.execute("SELECT id FROM task_lists WHERE category = 'daily'")
-            daily_list_ids = [row[0] for row in cursor.fetchall()]
-
-            if daily_list_ids:
-                placeholders = ','.join(['?' for _ in daily_list_ids])
-                cursor.execute(f'''
-                    DELETE FROM tasks 
-                    WHERE list_id IN ({placeholders}) 
-                    AND completed = 1
-                ''', daily_list_ids)
-                deleted_count = cursor.rowcount
-                print(f"🧹 Cleaned up {deleted_count} completed daily tasks")
+        """Move completed tasks from daily lists to the archive"""
+        result = self.archive_completed_tasks(category=TaskCategory.DAILY)
+        print(f"🗄️ Archived {result['archived']} completed daily tasks")
+        return result
 
     # ===== OPTIMIZED TASK OPERATIONS (NO N+1) =====
 
@@ -269,7 +574,8 @@ class DatabaseManager:
                     p.reminder_time, p.completed, p.parent_id, p.position, p.recurrence_type,
                     p.recurrence_interval, p.last_completed_date, p.motivation, p.created_at,
                     s.id as sub_id, s.title as sub_title, s.completed as sub_completed,
-                    s.position as sub_position, s.created_at as sub_created_at
+                    s.position as sub_position, s.created_at as sub_created_at,
+                    p.uuid, p.modified_at, s.uuid as sub_uuid, s.modified_at as sub_modified_at
                 FROM tasks p
                 LEFT JOIN tasks s ON s.parent_id = p.id
                 WHERE p.list_id = ? AND p.parent_id IS NULL
@@ -303,7 +609,8 @@ class DatabaseManager:
                             due_date=row[4], start_time=row[5], end_time=row[6],
                             reminder_time=row[7], completed=bool(row[8]), parent_id=row[9],
                             position=row[10], recurrence_type=row[11], recurrence_interval=row[12],
-                            last_completed_date=row[13], motivation=row[14] or "", created_at=row[15]
+                            last_completed_date=row[13], motivation=row[14] or "", created_at=row[15],
+                            uuid=row[21], modified_at=row[22]
                         )
                         task.subtasks = []
                         tasks_dict[task_id] = task
@@ -321,7 +628,9 @@ class DatabaseManager:
                             completed=bool(row[18]),
                             parent_id=task_id,
                             position=row[19],
-                            created_at=row[20]
+                            created_at=row[20],
+                            uuid=row[23],
+                            modified_at=row[24]
                         )
                         tasks_dict[task_id].subtasks.append(subtask)
                     except ValueError as e:
@@ -337,7 +646,8 @@ class DatabaseManager:
             cursor.execute('''
                 SELECT id, list_id, title, notes, due_date, start_time, end_time,
                        reminder_time, completed, parent_id, position, recurrence_type,
-                       recurrence_interval, last_completed_date, motivation, created_at
+                       recurrence_interval, last_completed_date, motivation, created_at,
+                       uuid, modified_at
                 FROM tasks
                 WHERE parent_id = ?
                 ORDER BY position ASC, created_at DESC
@@ -352,7 +662,8 @@ class DatabaseManager:
                         due_date=row[4], start_time=row[5], end_time=row[6],
                         reminder_time=row[7], completed=bool(row[8]), parent_id=row[9],
                         position=row[10], recurrence_type=row[11], recurrence_interval=row[12],
-                        last_completed_date=row[13], motivation=row[14] or "", created_at=row[15]
+                        last_completed_date=row[13], motivation=row[14] or "", created_at=row[15],
+                        uuid=row[16], modified_at=row[17]
                     )
                     subtasks.append(task)
                 except ValueError as e:
@@ -373,7 +684,8 @@ class DatabaseManager:
                     p.reminder_time, p.completed, p.parent_id, p.position, p.recurrence_type,
                     p.recurrence_interval, p.last_completed_date, p.motivation, p.created_at,
                     s.id as sub_id, s.title as sub_title, s.completed as sub_completed,
-                    s.position as sub_position, s.created_at as sub_created_at
+                    s.position as sub_position, s.created_at as sub_created_at,
+                    p.uuid, p.modified_at, s.uuid as sub_uuid, s.modified_at as sub_modified_at
                 FROM tasks p
                 LEFT JOIN tasks s ON s.parent_id = p.id
                 WHERE p.id = ?
@@ -393,7 +705,8 @@ class DatabaseManager:
                     due_date=row[4], start_time=row[5], end_time=row[6],
                     reminder_time=row[7], completed=bool(row[8]), parent_id=row[9],
                     position=row[10], recurrence_type=row[11], recurrence_interval=row[12],
-                    last_completed_date=row[13], motivation=row[14] or "", created_at=row[15]
+                    last_completed_date=row[13], motivation=row[14] or "", created_at=row[15],
+                    uuid=row[21], modified_at=row[22]
                 )
                 task.subtasks = []
 
@@ -408,7 +721,9 @@ class DatabaseManager:
                                 completed=bool(row[18]),
                                 parent_id=task_id,
                                 position=row[19],
-                                created_at=row[20]
+                                created_at=row[20],
+                                uuid=row[23],
+                                modified_at=row[24]
                             )
                             task.subtasks.append(subtask)
                         except ValueError as e:
@@ -441,21 +756,17 @@ class DatabaseManager:
         with self.get_connection_context() as conn:
             cursor = conn.cursor()
 
-            if parent_id:
-                cursor.execute('SELECT MAX(position) FROM tasks WHERE parent_id = ?', (parent_id,))
-            else:
-                cursor.execute('SELECT MAX(position) FROM tasks WHERE list_id = ? AND parent_id IS NULL', (list_id,))
-
-            max_position = cursor.fetchone()[0]
-            position = (max_position or 0) + 1
-
+            # Append after the last sibling (an index lookup in the same statement)
             cursor.execute('''
                 INSERT INTO tasks (list_id, title, notes, due_date, start_time, end_time,
-                                 reminder_time, parent_id, position, recurrence_type, 
-                                 recurrence_interval, motivation)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                 reminder_time, parent_id, position, recurrence_type,
+                                 recurrence_interval, motivation, uuid, modified_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?,
+                        COALESCE((SELECT MAX(position) FROM tasks WHERE list_id = ? AND parent_id IS ?), 0) + 1,
+                        ?, ?, ?, ?, CURRENT_TIMESTAMP)
             ''', (list_id, title.strip(), notes, due_date, start_time, end_time,
-                  reminder_time, parent_id, position, recurrence_type, recurrence_interval, motivation))
+                  reminder_time, parent_id, list_id, parent_id, recurrence_type, recurrence_interval,
+                  motivation, self._new_uuid()))
 
             task_id = cursor.lastrowid
             print(f"✅ Task created successfully: ID={task_id}, Title='{title}'")
@@ -483,6 +794,7 @@ class DatabaseManager:
                     values.append(value)
 
             if updates:
+                updates.append('modified_at = CURRENT_TIMESTAMP')
                 values.append(task_id)
                 query = f'UPDATE tasks SET {", ".join(updates)} WHERE id = ?'
                 cursor.execute(query, values)
@@ -496,11 +808,31 @@ class DatabaseManager:
 
             if row:
                 new_status = 0 if row[0] else 1
-                cursor.execute('UPDATE tasks SET completed = ? WHERE id = ?',
+                cursor.execute('UPDATE tasks SET completed = ?, modified_at = CURRENT_TIMESTAMP WHERE id = ?',
                                (new_status, task_id))
                 return bool(new_status)
             return False
 
+    def get_task_states(self, task_ids):
+        """
+        Look up list and completion state for several tasks in one query
+
+        Returns:
+            Dict {task_id: (list_id, completed)} for the tasks that exist
+        """
+        if not task_ids:
+            return {}
+
+        states = {}
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            for chunk in chunked(task_ids):
+                placeholders = ','.join(['?' for _ in chunk])
+                cursor.execute(f'SELECT id, list_id, completed FROM tasks WHERE id IN ({placeholders})',
+                               chunk)
+                states.update((row[0], (row[1], bool(row[2]))) for row in cursor.fetchall())
+        return states
+
     def delete_task(self, task_id):
         """Delete a task and all its subtasks"""
         with self.get_connection_context() as conn:
@@ -532,7 +864,8 @@ class DatabaseManager:
             cursor.execute('''
                 SELECT id, list_id, title, notes, due_date, start_time, end_time,
                        reminder_time, completed, parent_id, position, recurrence_type,
-                       recurrence_interval, last_completed_date, motivation, created_at
+                       recurrence_interval, last_completed_date, motivation, created_at,
+                       uuid, modified_at
                 FROM tasks
                 WHERE (title LIKE ? OR notes LIKE ?) AND parent_id IS NULL
                 ORDER BY completed ASC, created_at DESC
@@ -548,7 +881,8 @@ class DatabaseManager:
                         due_date=row[4], start_time=row[5], end_time=row[6],
                         reminder_time=row[7], completed=bool(row[8]), parent_id=row[9],
                         position=row[10], recurrence_type=row[11], recurrence_interval=row[12],
-                        last_completed_date=row[13], motivation=row[14] or "", created_at=row[15]
+                        last_completed_date=row[13], motivation=row[14] or "", created_at=row[15],
+                        uuid=row[16], modified_at=row[17]
                     )
                     tasks.append(task)
                 except ValueError:
@@ -583,17 +917,745 @@ class DatabaseManager:
                     values.append(value)
 
                 if updates_list:
+                    updates_list.append('modified_at = CURRENT_TIMESTAMP')
                     values.append(task_id)
                     query = f'UPDATE tasks SET {", ".join(updates_list)} WHERE id = ?'
                     cursor.execute(query, values)
 
+    def set_tasks_completed(self, task_ids, completed):
+        """Set completion of many tasks with set-based UPDATEs in one transaction"""
+        if not task_ids:
+            return 0
+
+        updated = 0
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            for chunk in chunked(task_ids):
+                placeholders = ','.join(['?' for _ in chunk])
+                cursor.execute(f'''
+                    UPDATE tasks SET completed = ?, modified_at = CURRENT_TIMESTAMP
+                    WHERE id IN ({placeholders})
+                ''', (int(bool(completed)), *chunk))
+                updated += cursor.rowcount
+        return updated
+
     def batch_delete_tasks(self, task_ids):
-        """Delete multiple tasks in one transaction"""
+        """
+        Delete multiple tasks and all their descendants in one transaction
+
+        Returns:
+            Dict {task_id: (list_id, completed)} of every deleted row,
+            descendants included
+        """
+        if not task_ids:
+            return {}
+
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+
+            cursor.execute('CREATE TEMP TABLE deleting (id INTEGER PRIMARY KEY)')
+            try:
+                cursor.executemany('INSERT OR IGNORE INTO deleting (id) VALUES (?)',
+                                   [(task_id,) for task_id in task_ids])
+                cursor.execute('''
+                    WITH RECURSIVE tree(id) AS (
+                        SELECT t.id FROM tasks t JOIN deleting d ON d.id = t.id
+                        UNION
+                        SELECT t.id FROM tasks t JOIN tree ON t.parent_id = tree.id
+                    )
+                    SELECT t.id, t.list_id, t.completed FROM tasks t JOIN tree ON tree.id = t.id
+                ''')
+                states = {row[0]: (row[1], bool(row[2])) for row in cursor.fetchall()}
+
+                cursor.execute('DELETE FROM deleting')
+                cursor.executemany('INSERT INTO deleting (id) VALUES (?)', [(task_id,) for task_id in states])
+                cursor.execute('DELETE FROM tasks WHERE id IN (SELECT id FROM deleting)')
+            finally:
+                cursor.execute('DROP TABLE temp.deleting')
+
+            print(f"🗑️ Deleted {len(states)} tasks")
+        return states
+
+    def move_tasks_to_list(self, task_ids, target_list_id, index=None):
+        """
+        Move tasks with all their descendants to another list in one
+        transaction, using set-based statements.
+
+        The moved tasks are placed, in the given order, before the index-th
+        top-level task of the target list (at the end when index is None),
+        with fractional positions assigned in one pass. A subtask moved
+        without its parent becomes a top-level task.
+
+        Returns:
+            Dict with sources {task_id: old list_id} and positions
+            {task_id: (old, new)} of the moved top-level tasks, task_ids (every
+            moved row, descendants included) and crowded (see reorder_tasks()),
+            or None if there was nothing to move
+        """
         if not task_ids:
-            return
+            return None
 
         with self.get_connection_context() as conn:
             cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+
+            cursor.execute('SELECT 1 FROM task_lists WHERE id = ?', (target_list_id,))
+            if not cursor.fetchone():
+                raise ValueError(f"List with id {target_list_id} does not exist")
+
+            # Selection (in caller order) and everything below it
+            cursor.execute('CREATE TEMP TABLE moving (id INTEGER PRIMARY KEY, ord INTEGER)')
+            cursor.execute('CREATE TEMP TABLE subtree (id INTEGER PRIMARY KEY)')
+            try:
+                cursor.executemany('INSERT OR IGNORE INTO moving (id, ord) VALUES (?, ?)',
+                                   [(task_id, ord_) for ord_, task_id in enumerate(task_ids)])
+                cursor.execute('''
+                    INSERT INTO subtree (id)
+                    WITH RECURSIVE tree(id) AS (
+                        SELECT t.id FROM tasks t JOIN moving m ON m.id = t.id
+                        UNION
+                        SELECT t.id FROM tasks t JOIN tree ON t.parent_id = tree.id
+                    )
+                    SELECT id FROM tree
+                ''')
+
+                # Roots: selected tasks whose parent does not move with them
+                cursor.execute('''
+                    SELECT t.id, t.list_id, t.position FROM moving m JOIN tasks t ON t.id = m.id
+                    WHERE t.parent_id IS NULL OR t.parent_id NOT IN (SELECT id FROM subtree)
+                    ORDER BY m.ord
+                ''')
+                roots = cursor.fetchall()
+                if not roots:
+                    return None
+
+                lower, upper = self._index_bounds(cursor, target_list_id, index)
+                positions = self._spread_positions(lower, upper, len(roots))
+                if positions is None:
+                    self._renumber_siblings(cursor, target_list_id, None)
+                    lower, upper = self._index_bounds(cursor, target_list_id, index)
+                    positions = self._spread_positions(lower, upper, len(roots))
+
+                # Parents and descendants in one statement, then the roots' slots
+                cursor.execute('''
+                    UPDATE tasks SET list_id = ?, modified_at = CURRENT_TIMESTAMP
+                    WHERE id IN (SELECT id FROM subtree)
+                ''', (target_list_id,))
+                cursor.executemany('UPDATE tasks SET parent_id = NULL, position = ? WHERE id = ?',
+                                   [(position, root[0]) for position, root in zip(positions, roots)])
+
+                cursor.execute('SELECT id FROM subtree')
+                moved_ids = [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.execute('DROP TABLE temp.moving')
+                cursor.execute('DROP TABLE temp.subtree')
+
+            crowded = (lower is not None and upper is not None
+                       and (upper - lower) / (len(roots) + 1) < POSITION_MIN_GAP)
+            return {
+                'sources': {task_id: list_id for task_id, list_id, _ in roots},
+                'positions': {root[0]: (root[2], position) for root, position in zip(roots, positions)},
+                'task_ids': moved_ids,
+                'crowded': crowded,
+            }
+
+    @staticmethod
+    def _index_bounds(cursor, list_id, index):
+        """Positions (lower, upper) around the index-th top-level task, not counting moving rows"""
+        siblings = 'list_id = ? AND parent_id IS NULL AND id NOT IN (SELECT id FROM subtree)'
+        if index is None:
+            cursor.execute(f'SELECT MAX(position) FROM tasks WHERE {siblings}', (list_id,))
+            return cursor.fetchone()[0], None
+
+        index = max(index, 0)
+        cursor.execute(f'SELECT position FROM tasks WHERE {siblings} ORDER BY position LIMIT 2 OFFSET ?',
+                       (list_id, max(index - 1, 0)))
+        found = [row[0] for row in cursor.fetchall()]
+        if index == 0:
+            return None, (found[0] if found else None)
+        lower = found[0] if found else None
+        upper = found[1] if len(found) > 1 else None
+        if lower is None:
+            # Past the end: append
+            cursor.execute(f'SELECT MAX(position) FROM tasks WHERE {siblings}', (list_id,))
+            lower = cursor.fetchone()[0]
+        return lower, upper
+
+    # ===== ORDERING =====
+
+    def reorder_tasks(self, task_ids, before_id=None, after_id=None):
+        """
+        Move sibling tasks, in the given order, directly before `before_id` or
+        after `after_id` (to the end when neither is given).
+
+        Positions are fractional: the moved tasks get positions between the
+        two neighbours of the target slot, so only the moved rows are written.
+        If floating point runs out of room there, the siblings are renumbered
+        first (rare).
+
+        Returns:
+            Dict with list_id, parent_id, positions {task_id: (old, new)} and
+            crowded (True when the slot is getting narrow and the group should
+            be rebalanced soon), or None if there was nothing to move
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        if not task_ids:
+            return None
+
+        anchor_id = before_id if before_id is not None else after_id
+        if anchor_id in task_ids:
+            raise ValueError("Cannot move a task relative to itself")
+
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+
+            # Take the write lock before reading the neighbours, so a
+            # concurrent rebalance cannot renumber them in between
+            cursor.execute('BEGIN IMMEDIATE')
+
             placeholders = ','.join(['?' for _ in task_ids])
-            cursor.execute(f'DELETE FROM tasks WHERE id IN ({placeholders})', task_ids)
-            print(f"🗑️ Deleted {cursor.rowcount} tasks")
\ No newline at end of file
+            cursor.execute(f'SELECT id, list_id, parent_id, position FROM tasks WHERE id IN ({placeholders})',
+                           task_ids)
+            rows = {row[0]: row[1:] for row in cursor.fetchall()}
+            if len(rows) != len(task_ids):
+                raise ValueError("Some tasks do not exist")
+
+            groups = {(list_id, parent_id) for list_id, parent_id, _ in rows.values()}
+            if anchor_id is not None:
+                cursor.execute('SELECT list_id, parent_id FROM tasks WHERE id = ?', (anchor_id,))
+                anchor = cursor.fetchone()
+                if not anchor:
+                    raise ValueError(f"Task {anchor_id} does not exist")
+                groups.add(tuple(anchor))
+            if len(groups) != 1:
+                raise ValueError("Tasks can only be moved among their siblings")
+            list_id, parent_id = groups.pop()
+
+            lower, upper = self._slot_bounds(cursor, list_id, parent_id, task_ids, before_id, after_id)
+            positions = self._spread_positions(lower, upper, len(task_ids))
+            if positions is None:
+                self._renumber_siblings(cursor, list_id, parent_id)
+                lower, upper = self._slot_bounds(cursor, list_id, parent_id, task_ids, before_id, after_id)
+                positions = self._spread_positions(lower, upper, len(task_ids))
+
+            cursor.executemany(
+                'UPDATE tasks SET position = ?, modified_at = CURRENT_TIMESTAMP WHERE id = ?',
+                list(zip(positions, task_ids))
+            )
+
+            crowded = (lower is not None and upper is not None
+                       and (upper - lower) / (len(task_ids) + 1) < POSITION_MIN_GAP)
+            return {
+                'list_id': list_id,
+                'parent_id': parent_id,
+                'positions': {tid: (rows[tid][2], pos) for tid, pos in zip(task_ids, positions)},
+                'crowded': crowded,
+            }
+
+    @staticmethod
+    def _slot_bounds(cursor, list_id, parent_id, exclude_ids, before_id, after_id):
+        """Positions (lower, upper) of the neighbours around the target slot; None = open end"""
+        placeholders = ','.join(['?' for _ in exclude_ids])
+        siblings = f'list_id = ? AND parent_id IS ? AND id NOT IN ({placeholders})'
+        params = (list_id, parent_id, *exclude_ids)
+
+        if before_id is not None:
+            cursor.execute('SELECT position FROM tasks WHERE id = ?', (before_id,))
+            upper = cursor.fetchone()[0]
+            cursor.execute(f'SELECT MAX(position) FROM tasks WHERE position < ? AND {siblings}',
+                           (upper, *params))
+            lower = cursor.fetchone()[0]
+        elif after_id is not None:
+            cursor.execute('SELECT position FROM tasks WHERE id = ?', (after_id,))
+            lower = cursor.fetchone()[0]
+            cursor.execute(f'SELECT MIN(position) FROM tasks WHERE position > ? AND {siblings}',
+                           (lower, *params))
+            upper = cursor.fetchone()[0]
+        else:
+            cursor.execute(f'SELECT MAX(position) FROM tasks WHERE {siblings}', params)
+            lower, upper = cursor.fetchone()[0], None
+        return lower, upper
+
+    @staticmethod
+    def _spread_positions(lower, upper, count):
+        """`count` increasing positions strictly between lower and upper, or None if they do not fit"""
+        if lower is None and upper is None:
+            return [float(i + 1) for i in range(count)]
+        if upper is None:
+            return [lower + i + 1 for i in range(count)]
+        if lower is None:
+            return [upper - count + i for i in range(count)]
+
+        step = (upper - lower) / (count + 1)
+        positions = [lower + step * (i + 1) for i in range(count)]
+        bounds = [lower] + positions + [upper]
+        if any(not a < b for a, b in zip(bounds, bounds[1:])):
+            return None
+        return positions
+
+    @staticmethod
+    def _renumber_siblings(cursor, list_id, parent_id):
+        """Reset sibling positions to 1..n in their current order; returns rows changed"""
+        cursor.execute('''
+            SELECT id, position FROM tasks WHERE list_id = ? AND parent_id IS ?
+            ORDER BY position ASC, created_at DESC, id ASC
+        ''', (list_id, parent_id))
+        changes = [(float(index), task_id)
+                   for index, (task_id, position) in enumerate(cursor.fetchall(), start=1)
+                   if position != index]
+        cursor.executemany('UPDATE tasks SET position = ? WHERE id = ?', changes)
+        return len(changes)
+
+    def rebalance_positions(self, list_id, parent_id=None):
+        """
+        Renumber a sibling group to evenly spaced positions without changing
+        its order, restoring room for fractional moves. modified_at is left
+        alone - nothing the user sees changes.
+
+        Returns:
+            Number of tasks renumbered
+        """
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            return self._renumber_siblings(cursor, list_id, parent_id)
+
+    # ===== COMPLETION HISTORY =====
+
+    def get_completion_version(self):
+        """
+        Changes whenever the completion totals change (new event or task).
+        Cheap: the max event id plus a sum over the per-day rows.
+        """
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT (SELECT COALESCE(MAX(id), 0) FROM completion_events),
+                       (SELECT COALESCE(SUM(created), 0) FROM completion_daily)
+            ''')
+            return tuple(cursor.fetchone())
+
+    def get_daily_completions(self, since=None, category=None, list_id=None):
+        """
+        Per-day totals, oldest first
+
+        Returns:
+            List of (day, created, completed, reopened); day is 'YYYY-MM-DD'
+        """
+        query = '''
+            SELECT day, SUM(created), SUM(completed), SUM(reopened)
+            FROM completion_daily WHERE 1 = 1
+        '''
+        params = []
+        if since:
+            query += ' AND day >= ?'
+            params.append(since)
+        if category:
+            query += ' AND category = ?'
+            params.append(category)
+        if list_id is not None:
+            query += ' AND list_id = ?'
+            params.append(list_id)
+        query += ' GROUP BY day ORDER BY day'
+
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def get_category_completions(self, since=None):
+        """Per-category, per-day net completions: list of (category, day, count)"""
+        query = 'SELECT category, day, SUM(completed) - SUM(reopened) FROM completion_daily'
+        params = []
+        if since:
+            query += ' WHERE day >= ?'
+            params.append(since)
+        query += ' GROUP BY category, day ORDER BY category, day'
+
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def get_hourly_completions(self, category=None):
+        """Completions per local hour of day: {hour: count}"""
+        query = 'SELECT hour, SUM(completed) FROM completion_hourly'
+        params = []
+        if category:
+            query += ' WHERE category = ?'
+            params.append(category)
+        query += ' GROUP BY hour'
+
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return {hour: count for hour, count in cursor.fetchall()}
+
+    # ===== ARCHIVE =====
+
+    def archive_completed_tasks(self, category=None, older_than_days=None,
+                                chunk_size=ARCHIVE_CHUNK_SIZE, on_chunk=None, should_stop=None):
+        """
+        Move completed tasks, with everything below them, to archived_tasks.
+
+        Works in chunks of chunk_size completed tasks, one short transaction
+        each, so other writers only ever wait for one chunk.
+
+        Args:
+            category: Only lists of this category (None for all)
+            older_than_days: Only tasks not modified for this many days
+            on_chunk: Called after each committed chunk with {task_id: list_id}
+            should_stop: Called before each chunk; True stops early
+
+        Returns:
+            Dict with archived (row count) and list_ids (lists that lost tasks)
+        """
+        conditions = ['t.completed = 1']
+        params = []
+        if category:
+            conditions.append('l.category = ?')
+            params.append(category)
+        if older_than_days is not None:
+            conditions.append("t.modified_at < datetime('now', ?)")
+            params.append(f'-{int(older_than_days)} days')
+        where = ' AND '.join(conditions)
+
+        archived = 0
+        list_ids = set()
+        while not (should_stop and should_stop()):
+            moved = self._archive_chunk(where, params, chunk_size)
+            if not moved:
+                break
+            archived += len(moved)
+            list_ids.update(moved.values())
+            if on_chunk:
+                on_chunk(moved)
+
+        return {'archived': archived, 'list_ids': list_ids}
+
+    def _archive_chunk(self, where, params, chunk_size):
+        """
+        Archive up to chunk_size matching tasks plus descendants; returns {task_id: list_id}
+
+        Completed subtasks stay while any task above them is still open: they
+        are part of an unfinished task and move together with it later.
+        """
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+
+            cursor.execute('CREATE TEMP TABLE archiving (id INTEGER PRIMARY KEY)')
+            cursor.execute('CREATE TEMP TABLE held (id INTEGER PRIMARY KEY)')
+            try:
+                cursor.execute('''
+                    INSERT INTO held (id)
+                    WITH RECURSIVE tree(id) AS (
+                        SELECT t.id FROM tasks t JOIN tasks p ON p.id = t.parent_id
+                        WHERE t.completed = 1 AND p.completed = 0
+                        UNION
+                        SELECT t.id FROM tasks t JOIN tree ON t.parent_id = tree.id
+                    )
+                    SELECT id FROM tree
+                ''')
+                cursor.execute(f'''
+                    INSERT INTO archiving (id)
+                    WITH RECURSIVE tree(id) AS (
+                        SELECT id FROM (
+                            SELECT t.id FROM tasks t JOIN task_lists l ON l.id = t.list_id
+                            WHERE {where} AND t.id NOT IN (SELECT id FROM held)
+                            ORDER BY t.id LIMIT ?
+                        )
+                        UNION
+                        SELECT t.id FROM tasks t JOIN tree ON t.parent_id = tree.id
+                    )
+                    SELECT id FROM tree
+                ''', (*params, chunk_size))
+
+                cursor.execute('SELECT t.id, t.list_id FROM tasks t JOIN archiving a ON a.id = t.id')
+                moved = dict(cursor.fetchall())
+                if not moved:
+                    return {}
+
+                cursor.execute('''
+                    INSERT OR REPLACE INTO archived_tasks
+                        (id, list_id, list_name, category, parent_id, title, notes, due_date,
+                         start_time, end_time, reminder_time, completed, position, recurrence_type,
+                         recurrence_interval, last_completed_date, motivation, created_at, uuid,
+                         modified_at)
+                    SELECT t.id, t.list_id, l.name, l.category, t.parent_id, t.title, t.notes,
+                           t.due_date, t.start_time, t.end_time, t.reminder_time, t.completed,
+                           t.position, t.recurrence_type, t.recurrence_interval,
+                           t.last_completed_date, t.motivation, t.created_at, t.uuid, t.modified_at
+                    FROM tasks t JOIN archiving a ON a.id = t.id
+                    LEFT JOIN task_lists l ON l.id = t.list_id
+                ''')
+                cursor.execute('DELETE FROM tasks WHERE id IN (SELECT id FROM archiving)')
+                return moved
+            finally:
+                cursor.execute('DROP TABLE temp.archiving')
+                cursor.execute('DROP TABLE temp.held')
+
+    def search_archived_tasks(self, query="", limit=50, offset=0):
+        """
+        Archived tasks matching query in title or notes, newest first.
+        An empty query pages through the whole archive.
+        """
+        sql = '''
+            SELECT id, list_id, title, notes, due_date, start_time, end_time,
+                   reminder_time, completed, parent_id, position, recurrence_type,
+                   recurrence_interval, last_completed_date, motivation, created_at,
+                   uuid, modified_at, list_name, category, archived_at
+            FROM archived_tasks
+        '''
+        params = []
+        if query:
+            sql += ' WHERE title LIKE ? OR notes LIKE ?'
+            params += [f'%{query}%', f'%{query}%']
+        sql += ' ORDER BY archived_at DESC, id DESC LIMIT ? OFFSET ?'
+        params += [limit, offset]
+
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+
+            tasks = []
+            for row in cursor.fetchall():
+                try:
+                    tasks.append(ArchivedTask(
+                        id=row[0], list_id=row[1], title=row[2], notes=row[3],
+                        due_date=row[4], start_time=row[5], end_time=row[6],
+                        reminder_time=row[7], completed=bool(row[8]), parent_id=row[9],
+                        position=row[10], recurrence_type=row[11], recurrence_interval=row[12],
+                        last_completed_date=row[13], motivation=row[14] or "", created_at=row[15],
+                        uuid=row[16], modified_at=row[17], list_name=row[18] or "",
+                        category=row[19], archived_at=row[20]
+                    ))
+                except ValueError:
+                    continue
+            return tasks
+
+    def get_archive_stats(self):
+        """Row counts of the live and archive tables"""
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT (SELECT COUNT(*) FROM tasks), (SELECT COUNT(*) FROM archived_tasks)')
+            live, archived = cursor.fetchone()
+            return {'live': live, 'archived': archived}
+
+    # ===== MERGE IMPORT =====
+
+    @staticmethod
+    def _adopt_local_uuids(cursor):
+        """
+        Give staged rows whose uuid is unknown here the uuid of the local row
+        they describe, matched on a natural key. Backups written before uuids
+        existed (their rows carry derived uuids) and rows created separately
+        on another device then update that row instead of duplicating it.
+
+        Lists match on name and category, top-level tasks on list, title and
+        created_at, subtasks on their parent and title.
+        Each local row is claimed by at most one staged row.
+        """
+        cursor.execute('''
+            CREATE TEMP TABLE IF NOT EXISTS import_uuid_map (
+                old TEXT PRIMARY KEY,
+                new TEXT NOT NULL UNIQUE
+            )
+        ''')
+        cursor.execute('DELETE FROM import_uuid_map')
+
+        cursor.execute('''
+            INSERT OR IGNORE INTO import_uuid_map (old, new)
+            SELECT il.uuid, l.uuid
+            FROM import_lists il
+            JOIN task_lists l ON l.name = il.name AND l.category = il.category
+            WHERE il.uuid NOT IN (SELECT uuid FROM task_lists WHERE uuid IS NOT NULL)
+              AND l.uuid NOT IN (SELECT uuid FROM import_lists)
+            ORDER BY il.rowid, l.id
+        ''')
+        cursor.execute('''
+            UPDATE import_lists SET uuid = (SELECT new FROM import_uuid_map WHERE old = import_lists.uuid)
+            WHERE uuid IN (SELECT old FROM import_uuid_map)
+        ''')
+        cursor.execute('''
+            UPDATE import_tasks SET list_uuid = (SELECT new FROM import_uuid_map WHERE old = import_tasks.list_uuid)
+            WHERE list_uuid IN (SELECT old FROM import_uuid_map)
+        ''')
+
+        # Top-level tasks first: subtasks then match on their parent's adopted uuid.
+        # Legacy subtasks carry no created_at, so once restored theirs is the
+        # import time; under one parent the title is enough.
+        for level in ('it.parent_uuid IS NULL AND t.parent_id IS NULL AND '
+                      '(it.created_at IS NULL OR datetime(t.created_at) = datetime(it.created_at))',
+                      'it.parent_uuid IS NOT NULL AND p.uuid = it.parent_uuid'):
+            cursor.execute('DELETE FROM import_uuid_map')
+            cursor.execute(f'''
+                INSERT OR IGNORE INTO import_uuid_map (old, new)
+                SELECT it.uuid, t.uuid
+                FROM import_tasks it
+                JOIN task_lists l ON l.uuid = it.list_uuid
+                JOIN tasks t ON t.list_id = l.id AND t.title = it.title
+                LEFT JOIN tasks p ON p.id = t.parent_id
+                WHERE {level}
+                  AND it.uuid NOT IN (SELECT uuid FROM tasks WHERE uuid IS NOT NULL)
+                  AND t.uuid NOT IN (SELECT uuid FROM import_tasks)
+                ORDER BY it.rowid, t.id
+            ''')
+            cursor.execute('''
+                UPDATE import_tasks SET uuid = (SELECT new FROM import_uuid_map WHERE old = import_tasks.uuid)
+                WHERE uuid IN (SELECT old FROM import_uuid_map)
+            ''')
+            cursor.execute('''
+                UPDATE import_tasks
+                SET parent_uuid = (SELECT new FROM import_uuid_map WHERE old = import_tasks.parent_uuid)
+                WHERE parent_uuid IN (SELECT old FROM import_uuid_map)
+            ''')
+
+    def merge_import(self, lists, tasks):
+        """
+        Upsert lists and tasks by uuid in one transaction (last-writer-wins).
+
+        Rows are staged in temp tables and merged with one set-based
+        INSERT ... ON CONFLICT per table, so re-importing the same backup
+        never duplicates data. An existing row is only overwritten when the
+        incoming modified_at is newer than the local one.
+
+        Args:
+            lists: Iterable of dicts with uuid, name, category, position,
+                   created_at, modified_at
+            tasks: Iterable of dicts with uuid, list_uuid, parent_uuid and the
+                   task columns (title, notes, ..., created_at, modified_at)
+
+        Returns:
+            Tuple of (list rows changed, task rows changed)
+        """
+        with self.get_connection_context() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS import_lists (
+                    uuid TEXT PRIMARY KEY,
+                    name TEXT, category TEXT, position INTEGER,
+                    created_at TIMESTAMP, modified_at TIMESTAMP
+                )
+            ''')
+            cursor.execute('''
+                CREATE TEMP TABLE IF NOT EXISTS import_tasks (
+                    uuid TEXT PRIMARY KEY,
+                    list_uuid TEXT, parent_uuid TEXT,
+                    title TEXT, notes TEXT, due_date DATE, start_time TIME, end_time TIME,
+                    reminder_time TIME, completed BOOLEAN, position INTEGER,
+                    recurrence_type TEXT, recurrence_interval INTEGER,
+                    last_completed_date DATE, motivation TEXT,
+                    created_at TIMESTAMP, modified_at TIMESTAMP
+                )
+            ''')
+            cursor.execute('DELETE FROM import_lists')
+            cursor.execute('DELETE FROM import_tasks')
+
+            cursor.executemany('''
+                INSERT OR REPLACE INTO import_lists
+                    (uuid, name, category, position, created_at, modified_at)
+                VALUES (:uuid, :name, :category, :position, :created_at, :modified_at)
+            ''', lists)
+            cursor.executemany('''
+                INSERT OR REPLACE INTO import_tasks
+                    (uuid, list_uuid, parent_uuid, title, notes, due_date, start_time, end_time,
+                     reminder_time, completed, position, recurrence_type, recurrence_interval,
+                     last_completed_date, motivation, created_at, modified_at)
+                VALUES (:uuid, :list_uuid, :parent_uuid, :title, :notes, :due_date, :start_time,
+                        :end_time, :reminder_time, :completed, :position, :recurrence_type,
+                        :recurrence_interval, :last_completed_date, :motivation, :created_at,
+                        :modified_at)
+            ''', tasks)
+
+            self._adopt_local_uuids(cursor)
+
+            # Imported rows are history, not activity of today: the completion
+            # triggers stay quiet and new tasks are backfilled with their own dates
+            cursor.execute("INSERT OR IGNORE INTO completion_paused (reason) VALUES ('import')")
+            cursor.execute('SELECT COALESCE(MAX(id), 0) FROM tasks')
+            last_task_id = cursor.fetchone()[0]
+
+            # Lists: insert new ones, update existing ones only if the import is newer.
+            # rowcount counts this statement's rows only, not trigger writes.
+            cursor.execute('''
+                INSERT INTO task_lists (uuid, name, category, position, created_at, modified_at)
+                SELECT uuid, name, category, position,
+                       COALESCE(created_at, CURRENT_TIMESTAMP),
+                       COALESCE(modified_at, created_at, CURRENT_TIMESTAMP)
+                FROM import_lists
+                WHERE true
+                ON CONFLICT(uuid) DO UPDATE SET
+                    name = excluded.name,
+                    category = excluded.category,
+                    position = excluded.position,
+                    modified_at = excluded.modified_at
+                WHERE datetime(excluded.modified_at) >
+                      datetime(COALESCE(task_lists.modified_at, task_lists.created_at))
+            ''')
+            list_changes = cursor.rowcount
+
+            # Tasks: list ids are resolved through the list uuid. Parents that are
+            # created by this same statement are not visible yet, so subtasks are
+            # re-linked below.
+            cursor.execute('''
+                INSERT INTO tasks (uuid, list_id, parent_id, title, notes, due_date, start_time,
+                                   end_time, reminder_time, completed, position, recurrence_type,
+                                   recurrence_interval, last_completed_date, motivation,
+                                   created_at, modified_at)
+                SELECT it.uuid, l.id, p.id, it.title, it.notes, it.due_date, it.start_time,
+                       it.end_time, it.reminder_time, it.completed, it.position, it.recurrence_type,
+                       it.recurrence_interval, it.last_completed_date, it.motivation,
+                       COALESCE(it.created_at, CURRENT_TIMESTAMP),
+                       COALESCE(it.modified_at, it.created_at, CURRENT_TIMESTAMP)
+                FROM import_tasks it
+                JOIN task_lists l ON l.uuid = it.list_uuid
+                LEFT JOIN tasks p ON p.uuid = it.parent_uuid
+                WHERE true
+                ON CONFLICT(uuid) DO UPDATE SET
+                    list_id = excluded.list_id,
+                    title = excluded.title,
+                    notes = excluded.notes,
+                    due_date = excluded.due_date,
+                    start_time = excluded.start_time,
+                    end_time = excluded.end_time,
+                    reminder_time = excluded.reminder_time,
+                    completed = excluded.completed,
+                    position = excluded.position,
+                    recurrence_type = excluded.recurrence_type,
+                    recurrence_interval = excluded.recurrence_interval,
+                    last_completed_date = excluded.last_completed_date,
+                    motivation = excluded.motivation,
+                    modified_at = excluded.modified_at
+                WHERE datetime(excluded.modified_at) >
+                      datetime(COALESCE(tasks.modified_at, tasks.created_at))
+                -- rows without any timestamp (legacy subtasks) never win
+                AND EXISTS (SELECT 1 FROM import_tasks
+                            WHERE uuid = excluded.uuid
+                            AND COALESCE(modified_at, created_at) IS NOT NULL)
+            ''')
+            task_changes = cursor.rowcount
+
+            cursor.execute('''
+                UPDATE tasks SET parent_id = (
+                    SELECT p.id FROM import_tasks it
+                    JOIN tasks p ON p.uuid = it.parent_uuid
+                    WHERE it.uuid = tasks.uuid
+                )
+                WHERE parent_id IS NULL
+                AND uuid IN (SELECT uuid FROM import_tasks WHERE parent_uuid IS NOT NULL)
+            ''')
+
+            cursor.execute('DELETE FROM import_lists')
+            cursor.execute('DELETE FROM import_tasks')
+            cursor.execute('DELETE FROM import_uuid_map')
+
+            self._backfill_completion_history(cursor, after_task_id=last_task_id)
+            cursor.execute("DELETE FROM completion_paused WHERE reason = 'import'")
+
+            self.clear_cache()
+
+            print(f"🔀 Merged {list_changes} lists, {task_changes} tasks")
+            return list_changes, task_changes
@@ -1,4 +1,5 @@
 import sqlite3
+import statistics
 from utils.constants import DB_NAME
 import time
 
@@ -223,7 +224,12 @@ class DatabaseOptimizer:
             conn.close()
 
     def benchmark_query(self, query, params=None, iterations=10):
-        """Benchmark a query's performance"""
+        """
+        Benchmark a query's performance
+
+        Returns:
+            Dict with avg/min/max, p50/p95 (seconds) and the raw samples
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
 
@@ -231,28 +237,33 @@ class DatabaseOptimizer:
 
         try:
             for i in range(iterations):
-                start = time.time()
+                start = time.perf_counter()
                 if params:
                     cursor.execute(query, params)
                 else:
                     cursor.execute(query)
                 cursor.fetchall()
-                elapsed = time.time() - start
+                elapsed = time.perf_counter() - start
                 times.append(elapsed)
 
             avg_time = sum(times) / len(times)
             min_time = min(times)
             max_time = max(times)
+            p50_time = statistics.median(times)
+            p95_time = statistics.quantiles(times, n=20, method='inclusive')[-1] if len(times) > 1 else times[0]
 
             print(f"\n⚡ Query Benchmark ({iterations} iterations):")
             print(f"  Average: {avg_time * 1000:.2f}ms")
+            print(f"  p50: {p50_time * 1000:.2f}ms")
+            print(f"  p95: {p95_time * 1000:.2f}ms")
             print(f"  Min: {min_time * 1000:.2f}ms")
             print(f"  Max: {max_time * 1000:.2f}ms")
 
-            return {'avg': avg_time, 'min': min_time, 'max': max_time}
+            return {'avg': avg_time, 'min': min_time, 'max': max_time,
+                    'p50': p50_time, 'p95': p95_time, 'samples': times}
 
         except Exception as e:
             print(f"Benchmark error: {e}")
             return None
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
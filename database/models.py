@@ -25,12 +25,15 @@ class TaskCategory:
 
 
 class TaskList:
-    def __init__(self, id=None, name="", category="daily", position=0, created_at=None):
+    def __init__(self, id=None, name="", category="daily", position=0, created_at=None,
+                 uuid=None, modified_at=None):
         self.id = id
         self.name = self._validate_name(name)
         self.category = category
         self.position = position
         self.created_at = created_at or datetime.now()
+        self.uuid = uuid
+        self.modified_at = modified_at or self.created_at
 
     def _validate_name(self, name):
         """Validate list name"""
@@ -46,7 +49,9 @@ class TaskList:
             'name': self.name,
             'category': self.category,
             'position': self.position,
-            'created_at': self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at
+            'created_at': self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at,
+            'uuid': self.uuid,
+            'modified_at': self.modified_at.isoformat() if isinstance(self.modified_at, datetime) else self.modified_at
         }
 
 
@@ -55,7 +60,8 @@ class Task:
                  due_date=None, start_time=None, end_time=None,
                  reminder_time=None, completed=False, parent_id=None,
                  position=0, recurrence_type=None, recurrence_interval=1,
-                 last_completed_date=None, motivation="", created_at=None):
+                 last_completed_date=None, motivation="", created_at=None,
+                 uuid=None, modified_at=None):
         self.id = id
         self.list_id = list_id
         self.title = self._validate_title(title)
@@ -72,6 +78,8 @@ class Task:
         self.last_completed_date = last_completed_date
         self.motivation = self._validate_motivation(motivation)
         self.created_at = created_at or datetime.now()
+        self.uuid = uuid
+        self.modified_at = modified_at or self.created_at
         self.subtasks = []
 
         # Validate time range
@@ -134,5 +142,24 @@ class Task:
             'recurrence_interval': self.recurrence_interval,
             'last_completed_date': self.last_completed_date,
             'motivation': self.motivation,
-            'created_at': self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at
-        }
\ No newline at end of file
+            'created_at': self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at,
+            'uuid': self.uuid,
+            'modified_at': self.modified_at.isoformat() if isinstance(self.modified_at, datetime) else self.modified_at
+        }
+
+class ArchivedTask(Task):
+    """A task moved out of the live tables, with the list it was archived from"""
+
+    def __init__(self, list_name="", category=None, archived_at=None, **kwargs):
+        super().__init__(**kwargs)
+        self.list_name = list_name
+        self.category = category
+        self.archived_at = archived_at
+
+    def to_dict(self):
+        return {
+            **super().to_dict(),
+            'list_name': self.list_name,
+            'category': self.category,
+            'archived_at': self.archived_at
+        }
@@ -0,0 +1,387 @@
+"""
+Query Tracer - per-statement timing, row counts and a slow-query log
+
+Every connection opened by DatabaseManager goes through QueryTracer.connect().
+Cursor calls are timed from execute() until the result is fully fetched,
+keyed by the normalized SQL text, and sqlite's own trace callback counts every
+statement the engine runs (including implicit BEGIN/COMMIT).
+
+Statements slower than SLOW_QUERY_MS are appended to the slow-query log
+together with their EXPLAIN QUERY PLAN.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime
+
+from utils.constants import (PROFILE_ENV_VAR, QUERY_TRACE_ENV_VAR, QUERY_TRACE_SAMPLES,
+                             SLOW_QUERY_LOG, SLOW_QUERY_MS)
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER_LIST = re.compile(r'\?(\s*,\s*\?)+')
+
+# Statements EXPLAIN QUERY PLAN has nothing useful to say about
+_NO_PLAN = ('PRAGMA', 'BEGIN', 'COMMIT', 'ROLLBACK', 'CREATE', 'DROP', 'ALTER',
+            'VACUUM', 'ANALYZE', 'EXPLAIN', 'SAVEPOINT', 'RELEASE')
+
+
+def tracing_enabled():
+    """Tracing wraps every cursor, so it is off unless asked for (or profiling)"""
+    return any(os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+               for name in (QUERY_TRACE_ENV_VAR, PROFILE_ENV_VAR))
+
+
+def slow_log_path_for(db_name):
+    """The slow-query log lives next to the database, not in the working directory"""
+    return os.path.join(os.path.dirname(os.path.abspath(db_name)), SLOW_QUERY_LOG)
+
+
+def normalize_sql(sql):
+    """Collapse whitespace and IN (?, ?, ...) lists so equal statements share a key"""
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    return _PLACEHOLDER_LIST.sub('?, ...', sql)
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100.0)))
+    return ordered[index]
+
+
+class StatementStats:
+    """Aggregates for one normalized statement"""
+
+    __slots__ = ('sql', 'count', 'total', 'max', 'rows', 'errors', 'samples')
+
+    def __init__(self, sql, max_samples):
+        self.sql = sql
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.errors = 0
+        self.samples = deque(maxlen=max_samples)
+
+    def to_dict(self):
+        ordered = sorted(self.samples)
+        return {
+            'sql': self.sql,
+            'count': self.count,
+            'errors': self.errors,
+            'rows': self.rows,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'p50_ms': _percentile(ordered, 50) * 1000,
+            'p95_ms': _percentile(ordered, 95) * 1000,
+            'p99_ms': _percentile(ordered, 99) * 1000,
+            'max_ms': self.max * 1000,
+        }
+
+
+class TracedCursor(sqlite3.Cursor):
+    """
+    Cursor that times a statement from execute() until its rows are
+    exhausted (or the cursor is reused or closed).
+    """
+
+    _pending = None
+
+    def _start(self, sql, params, elapsed):
+        self._finish()
+        if self.description is None:
+            # DML / DDL: nothing to fetch, record right away
+            self._pending = [sql, params, elapsed, max(self.rowcount, 0)]
+            self._finish()
+        else:
+            self._pending = [sql, params, elapsed, 0]
+
+    def _finish(self, explain=True):
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        tracer = getattr(self.connection, 'tracer', None)
+        if tracer is not None:
+            tracer.record(pending[0], pending[1], pending[2], pending[3],
+                          self.connection if explain else None)
+
+    def _fetched(self, elapsed, rows, done):
+        pending = self._pending
+        if pending is None:
+            return
+        pending[2] += elapsed
+        pending[3] += rows
+        if done:
+            self._finish()
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except Exception:
+            self._error(sql)
+            raise
+        self._start(sql, parameters, time.perf_counter() - start)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except Exception:
+            self._error(sql)
+            raise
+        self._start(sql, None, time.perf_counter() - start)
+        return self
+
+    def _error(self, sql):
+        tracer = getattr(self.connection, 'tracer', None)
+        if tracer is not None:
+            tracer.record_error(sql)
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - start, 0 if row is None else 1, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        start = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(time.perf_counter() - start, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - start, 0, True)
+            raise
+        self._fetched(time.perf_counter() - start, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # The connection may already be gone; record without EXPLAIN
+        try:
+            self._finish(explain=False)
+        except Exception:
+            pass
+
+
+class TracedConnection(sqlite3.Connection):
+    """Connection whose cursors (and execute shortcuts) are traced"""
+
+    tracer = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cursors = weakref.WeakSet()
+
+    def cursor(self, factory=None):
+        cursor = super().cursor(factory or TracedCursor)
+        if isinstance(cursor, TracedCursor):
+            self._cursors.add(cursor)
+        return cursor
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        start = time.perf_counter()
+        super().commit()
+        if self.tracer is not None:
+            self.tracer.record("COMMIT", None, time.perf_counter() - start, 0)
+
+    def close(self):
+        # Statements read with a single fetchone() are still pending
+        for cursor in list(self._cursors):
+            cursor._finish()
+        super().close()
+
+
+class QueryTracer:
+    """
+    Collects statement statistics for every traced connection.
+    Thread-safe; one tracer is shared by all of a DatabaseManager's connections.
+    """
+
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS, slow_log_path=SLOW_QUERY_LOG,
+                 max_samples=QUERY_TRACE_SAMPLES):
+        self.slow_query_ms = slow_query_ms
+        self.slow_log_path = slow_log_path
+        self.max_samples = max_samples
+
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._statements = {}
+        self._engine_counts = {}
+        self._explained = set()
+        self._slow_count = 0
+        self._since = datetime.now()
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call callback(sql, elapsed, rows) after every recorded statement"""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def connect(self, db_name, **kwargs):
+        """Open a traced sqlite3 connection"""
+        conn = sqlite3.connect(db_name, factory=TracedConnection, **kwargs)
+        conn.tracer = self
+        conn.set_trace_callback(self._on_engine_statement)
+        return conn
+
+    def _on_engine_statement(self, statement):
+        # Called by sqlite for every statement it runs, implicit ones included
+        keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "?"
+        with self._lock:
+            self._engine_counts[keyword] = self._engine_counts.get(keyword, 0) + 1
+
+    def _stats_for(self, sql):
+        key = normalize_sql(sql)
+        stats = self._statements.get(key)
+        if stats is None:
+            stats = self._statements[key] = StatementStats(key, self.max_samples)
+        return stats
+
+    def record(self, sql, params, elapsed, rows, conn=None):
+        """Record one completed statement (elapsed in seconds)"""
+        with self._lock:
+            stats = self._stats_for(sql)
+            stats.count += 1
+            stats.total += elapsed
+            stats.rows += rows
+            stats.samples.append(elapsed)
+            if elapsed > stats.max:
+                stats.max = elapsed
+
+            slow = elapsed * 1000 >= self.slow_query_ms
+            if slow:
+                self._slow_count += 1
+            explain = slow and conn is not None and stats.sql not in self._explained
+            if explain:
+                self._explained.add(stats.sql)
+
+        for listener in self._listeners:
+            listener(sql, elapsed, rows)
+
+        if slow:
+            plan = self._explain(conn, sql, params) if explain else None
+            self._log_slow(sql, params, elapsed, rows, plan)
+
+    def record_error(self, sql):
+        with self._lock:
+            self._stats_for(sql).errors += 1
+
+    def _explain(self, conn, sql, params):
+        """EXPLAIN QUERY PLAN as indented lines, captured once per statement"""
+        if sql.lstrip().upper().startswith(_NO_PLAN):
+            return None
+        try:
+            # A plain Cursor so the EXPLAIN itself is not traced
+            cursor = sqlite3.Cursor(conn)
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params or ())
+            rows = cursor.fetchall()
+            cursor.close()
+        except sqlite3.Error as e:
+            return [f"(plan unavailable: {e})"]
+
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append("  " * depth[node_id] + detail)
+        return lines
+
+    def _log_slow(self, sql, params, elapsed, rows, plan):
+        if not self.slow_log_path:
+            return
+
+        entry = [
+            f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} | {elapsed * 1000:.1f} ms | "
+            f"{rows} rows | {normalize_sql(sql)}"
+        ]
+        if params:
+            entry.append(f"    params: {str(params)[:200]}")
+        if plan:
+            entry.append("    plan:")
+            entry.extend(f"      {line}" for line in plan)
+
+        try:
+            with self._log_lock, open(self.slow_log_path, 'a', encoding='utf-8') as f:
+                f.write("\n".join(entry) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not write slow query log: {e}")
+
+    # ===== SNAPSHOT API =====
+
+    def snapshot(self, sort_by='total_ms'):
+        """
+        Current statistics.
+
+        Returns:
+            Dict with statements (list of per-statement dicts, slowest total
+            first), engine statement counts by keyword, totals and slow count
+        """
+        with self._lock:
+            statements = [stats.to_dict() for stats in self._statements.values()]
+            engine = dict(self._engine_counts)
+            slow = self._slow_count
+            since = self._since
+
+        statements.sort(key=lambda s: s[sort_by], reverse=True)
+        return {
+            'since': since.isoformat(timespec='seconds'),
+            'statements': statements,
+            'engine_statements': engine,
+            'total_queries': sum(s['count'] for s in statements),
+            'total_ms': sum(s['total_ms'] for s in statements),
+            'rows': sum(s['rows'] for s in statements),
+            'slow_queries': slow,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._statements.clear()
+            self._engine_counts.clear()
+            self._slow_count = 0
+            self._since = datetime.now()
+
+    def print_report(self, limit=10):
+        """Print the statements with the most total time"""
+        snap = self.snapshot()
+
+        print(f"DB Statements: {snap['total_queries']} ({snap['total_ms']:.1f}ms total, "
+              f"{snap['rows']} rows, {snap['slow_queries']} slow)")
+        for stats in snap['statements'][:limit]:
+            print(f"  {stats['count']:>6}x  total {stats['total_ms']:8.1f}ms  "
+                  f"p50 {stats['p50_ms']:6.2f}ms  p95 {stats['p95_ms']:6.2f}ms  "
+                  f"rows {stats['rows']:>7}  {stats['sql'][:70]}")
+        if snap['engine_statements']:
+            engine = ", ".join(f"{k} {v}" for k, v in sorted(snap['engine_statements'].items()))
+            print(f"  Engine: {engine}")
@@ -1,19 +1,32 @@
-from kivymd.app import MDApp
-from kivy.uix.screenmanager import ScreenManager, Screen
-from kivy.core.window import Window
-from kivy.clock import Clock
-from screens.main_screen import MainScreen
-from screens.task_detail_screen import TaskDetailScreen
-from screens.settings_screen import SettingsScreen
-from utils.constants import APP_NAME
-from utils.notification_manager import NotificationManager
-from utils.backup_manager import BackupManager
-from database.db_manager import DatabaseManager
-from services.task_service import TaskService, ListService
-from utils.theme_manager import get_theme_manager
-from utils.event_system import event_bus, TaskEvents
-from datetime import datetime, time
-import platform
+from utils.startup import timeline, lazy_import
+
+with timeline.phase("import kivy/kivymd"):
+    from kivymd.app import MDApp
+    from kivy.uix.screenmanager import ScreenManager, Screen
+    from kivy.core.window import Window
+    from kivy.clock import Clock
+
+with timeline.phase("import app modules"):
+    from screens.main_screen import MainScreen
+    from utils.constants import APP_NAME, ARCHIVE_AFTER_DAYS, STARTUP_DEFER_SECONDS
+    from database.db_manager import DatabaseManager
+    from database.models import TaskCategory
+    from services.task_service import TaskService, ListService
+    from services.analytics_service import AnalyticsService
+    from utils.theme_manager import get_theme_manager
+    from utils.event_system import event_bus, shutdown_event_workers, TaskEvents
+    from utils.chart_renderer import shutdown_chart_renderer
+    from utils.profiler import get_profiler
+    from datetime import datetime
+    import platform
+    import threading
+
+# Only imported when first used; the first frame does not pay for them
+task_detail_module = lazy_import("screens.task_detail_screen")
+settings_module = lazy_import("screens.settings_screen")
+stats_module = lazy_import("screens.stats_screen")
+backup_module = lazy_import("utils.backup_manager")
+notification_module = lazy_import("utils.notification_manager")
 
 
 class MomentumTrackApp(MDApp):
@@ -25,15 +38,18 @@ class MomentumTrackApp(MDApp):
         self.theme_cls.theme_style = "Dark"
 
         # Core managers
-        self.db = DatabaseManager()
+        with timeline.phase("init database"):
+            self.db = DatabaseManager()
 
         # SERVICE LAYER (NEW!)
         self.task_service = TaskService(self.db)
         self.list_service = ListService(self.db)
+        self.analytics_service = AnalyticsService(self.db)
 
-        # Utilities
-        self.notification_manager = NotificationManager(self.db)
-        self.backup_manager = BackupManager(self.db)
+        # Utilities (backup and notifications are created on first use)
+        self._backup_manager = None
+        self._backup_manager_lock = threading.Lock()
+        self.notification_manager = None
         self.theme_manager = get_theme_manager()
 
         # State
@@ -42,6 +58,15 @@ class MomentumTrackApp(MDApp):
         # Setup event listeners
         self._setup_event_listeners()
 
+    @property
+    def backup_manager(self):
+        """BackupManager, imported and created on first use (from any thread)"""
+        if self._backup_manager is None:
+            with self._backup_manager_lock:
+                if self._backup_manager is None:
+                    self._backup_manager = backup_module.BackupManager(self.db)
+        return self._backup_manager
+
     def _setup_event_listeners(self):
         """Setup global event listeners"""
         # Task events
@@ -80,32 +105,22 @@ class MomentumTrackApp(MDApp):
         # Set initial theme from saved preference
         self.theme_cls.theme_style = self.theme_manager.theme_style
 
-        # Run database optimization on first launch
-        from database.db_optimizer import DatabaseOptimizer
-        optimizer = DatabaseOptimizer()
-        optimizer.optimize_all()
-
-        # Create auto backup on startup
-        print("📦 Creating automatic backup...")
-        backup_file = self.backup_manager.auto_backup()
-        if backup_file:
-            print(f"✅ Auto backup created: {backup_file}")
-        else:
-            print("⚠️ Auto backup failed")
-
         # Main screen (now uses service layer)
-        main_screen = Screen(name='main')
-        self.main_screen_widget = MainScreen(
-            task_service=self.task_service,
-            list_service=self.list_service
-        )
-        self.main_screen_widget.open_task_details = self.open_task_details
-        self.main_screen_widget.open_settings = self.open_settings
-        main_screen.add_widget(self.main_screen_widget)
-        self.screen_manager.add_widget(main_screen)
-
-        # Start notification manager (THREAD-SAFE!)
-        self.notification_manager.start()
+        with timeline.phase("build main screen"):
+            main_screen = Screen(name='main')
+            self.main_screen_widget = MainScreen(
+                task_service=self.task_service,
+                list_service=self.list_service
+            )
+            self.main_screen_widget.open_task_details = self.open_task_details
+            self.main_screen_widget.open_settings = self.open_settings
+            self.main_screen_widget.open_stats = self.open_stats
+            main_screen.add_widget(self.main_screen_widget)
+
+            # The ScreenManager only dispatches enter/leave to the Screen itself
+            main_screen.bind(on_pre_enter=lambda *args: self.main_screen_widget.on_pre_enter(),
+                             on_pre_leave=lambda *args: self.main_screen_widget.on_pre_leave())
+            self.screen_manager.add_widget(main_screen)
 
         # Schedule daily cleanup check (every hour)
         Clock.schedule_interval(self.check_daily_cleanup, 3600)
@@ -117,34 +132,69 @@ class MomentumTrackApp(MDApp):
         # Print service stats on startup
         Clock.schedule_once(lambda dt: self.print_stats(), 5)
 
+        # Opt-in UI profiler (MOMENTUM_PROFILE=1)
+        get_profiler().start(self.db)
+
+        # Optimization, backup and notifications wait until the first frame is on screen
+        Window.bind(on_flip=self._on_first_frame)
+
         return self.screen_manager
 
+    def _on_first_frame(self, *args):
+        Window.unbind(on_flip=self._on_first_frame)
+        timeline.first_frame()
+        timeline.print_report()
+        Clock.schedule_once(self._deferred_startup, STARTUP_DEFER_SECONDS)
+
+    def _deferred_startup(self, dt):
+        """Startup work that does not need to block the first frame"""
+        with timeline.phase("start notifications"):
+            self.notification_manager = notification_module.NotificationManager(self.db)
+            self.notification_manager.start()
+
+        # Index maintenance and the launch backup run off the UI thread
+        threading.Thread(target=self._startup_maintenance, name="StartupMaintenance", daemon=True).start()
+
+    def _startup_maintenance(self):
+        with timeline.phase("optimize database"):
+            from database.db_optimizer import DatabaseOptimizer
+            optimizer = DatabaseOptimizer(db_name=self.db.db_name)
+            optimizer.optimize_all()
+
+        # Create auto backup on startup
+        print("📦 Creating automatic backup...")
+        with timeline.phase("startup backup"):
+            backup_file = self.backup_manager.auto_backup()
+        if backup_file:
+            print(f"✅ Auto backup created: {backup_file}")
+        else:
+            print("⚠️ Auto backup failed")
+
     def check_daily_cleanup(self, dt):
-        """Check if it's a new day and cleanup completed daily tasks"""
+        """Check if it's a new day and archive completed daily tasks"""
         current_date = datetime.now().date()
 
         if self.last_cleanup_date != current_date:
-            current_time = datetime.now().time()
-            midnight = time(0, 0)
-
             if self.last_cleanup_date is not None:
-                print(f"🧹 Daily cleanup: Removing completed tasks from daily lists")
-                self.db.cleanup_completed_daily_tasks()
-
-                # Clear service cache after cleanup
-                self.task_service.clear_cache()
+                # Runs in chunks on the service worker; lists reload from the change events
+                print(f"🧹 Daily cleanup: Archiving completed tasks from daily lists")
+                self.task_service.archive_completed(category=TaskCategory.DAILY)
 
-                if self.screen_manager.current == 'main':
-                    self.main_screen_widget.load_tasks()
+            # Opt-in: keep the live table bounded by archiving old completed tasks of any list
+            if ARCHIVE_AFTER_DAYS is not None:
+                self.task_service.archive_completed(older_than_days=ARCHIVE_AFTER_DAYS)
 
             self.last_cleanup_date = current_date
 
     def open_task_details(self, task_id):
+        # The detail screen loads the task on creation
+        self.main_screen_widget.commit_pending_actions()
+
         if self.screen_manager.has_screen('task_detail'):
             self.screen_manager.remove_widget(self.screen_manager.get_screen('task_detail'))
 
         detail_screen = Screen(name='task_detail')
-        detail_widget = TaskDetailScreen(
+        detail_widget = task_detail_module.TaskDetailScreen(
             task_id=task_id,
             task_service=self.task_service,
             on_back_callback=self.close_task_details
@@ -160,11 +210,13 @@ class MomentumTrackApp(MDApp):
             self.screen_manager.remove_widget(self.screen_manager.get_screen('task_detail'))
 
     def open_settings(self):
+        self.main_screen_widget.commit_pending_actions()
+
         if self.screen_manager.has_screen('settings'):
             self.screen_manager.remove_widget(self.screen_manager.get_screen('settings'))
 
         settings_screen = Screen(name='settings')
-        settings_widget = SettingsScreen(
+        settings_widget = settings_module.SettingsScreen(
             on_back_callback=self.close_settings
         )
         settings_screen.add_widget(settings_widget)
@@ -176,6 +228,23 @@ class MomentumTrackApp(MDApp):
         if self.screen_manager.has_screen('settings'):
             self.screen_manager.remove_widget(self.screen_manager.get_screen('settings'))
 
+    def open_stats(self):
+        """Statistics screen; kept between visits so its chart textures are reused"""
+        # The stats screen reads the totals before the main screen's on_pre_leave
+        self.main_screen_widget.commit_pending_actions()
+
+        if not self.screen_manager.has_screen('stats'):
+            self.screen_manager.add_widget(stats_module.StatsScreen(
+                name='stats',
+                analytics_service=self.analytics_service,
+                on_back_callback=self.close_stats
+            ))
+        self.screen_manager.current = 'stats'
+
+    def close_stats(self):
+        self.main_screen_widget.load_tasks()
+        self.screen_manager.current = 'main'
+
     def print_stats(self):
         """Print service statistics"""
         print("\n" + "=" * 60)
@@ -186,7 +255,15 @@ class MomentumTrackApp(MDApp):
         self.task_service.print_stats()
 
         # Notification stats
-        self.notification_manager.print_stats()
+        if self.notification_manager:
+            self.notification_manager.print_stats()
+
+        # Listeners running on the main thread or worker pool
+        for stats in self.task_service.events.listener_stats() + event_bus.listener_stats():
+            print(f"📨 {stats['event']} -> {stats['listener']} [{stats['policy']}]: "
+                  f"{stats['delivered']} delivered, {stats['dropped']} dropped, "
+                  f"depth {stats['depth']}/{stats['capacity']} (max {stats['max_depth']}), "
+                  f"wait {stats['avg_wait_ms']:.1f}ms, run {stats['avg_run_ms']:.1f}ms")
 
         print("=" * 60 + "\n")
 
@@ -199,15 +276,35 @@ class MomentumTrackApp(MDApp):
         # Print final stats
         self.print_stats()
 
-        # Create backup on app close
+        # Commit swipe actions still waiting in the undo window, so the
+        # exit backup includes them
+        main_screen = getattr(self, 'main_screen_widget', None)
+        if main_screen:
+            main_screen.commit_pending_actions()
+
+        # Create backup on app close (waits for a startup backup still in progress)
         print("📦 Creating exit backup...")
         self.backup_manager.auto_backup()
 
         # Stop notification manager (GRACEFUL!)
-        self.notification_manager.stop()
+        if self.notification_manager:
+            self.notification_manager.stop()
+
+        # Write the profiler trace if profiling was on
+        profiler = get_profiler()
+        if profiler.enabled:
+            profiler.stop()
+            profiler.dump_trace()
+
+        # Stop background list prefetching
+        self.task_service.shutdown()
+
+        # Stop the chart worker
+        shutdown_chart_renderer()
 
-        # Clear event listeners
+        # Clear event listeners and let queued worker deliveries finish
         event_bus.clear()
+        shutdown_event_workers()
 
         print("✅ Cleanup complete")
         print("=" * 60 + "\n")
@@ -8,16 +8,21 @@ from kivymd.uix.navigationdrawer import MDNavigationDrawer, MDNavigationLayout
 from kivy.metrics import dp
 from kivy.graphics import Color, RoundedRectangle
 from kivy.clock import Clock
-from kivymd.app import MDApp
 from kivymd.toast import toast
-from components.task_item import TaskItem
+from components.virtual_task_list import VirtualTaskList
 from components.list_swiper import ListSwiper
 from components.list_tabs import ListTabs
-from components.dialogs import CreateTaskDialog, EditListDialog, ConfirmDialog, AddTaskDialog
 from database.models import TaskCategory
+from services.deferred_actions import DeferredTaskActions
 from services.task_service import TaskService, ListService
 from utils.constants import Colors
-from utils.event_system import event_bus, TaskEvents
+from utils.event_system import event_bus, ChangeTracker, TaskEvents
+from utils.profiler import profiled
+from utils.theme_tokens import get_theme_tokens
+from utils.startup import lazy_import
+
+# Dialogs are only needed once the user opens one
+dialogs = lazy_import("components.dialogs")
 
 
 class MainScreen(MDScreen):
@@ -36,87 +41,117 @@ class MainScreen(MDScreen):
         self.category_lists = {}
         self.list_widgets = {}
 
+        # Swipe deletes/completions wait for undo, then commit as one batch
+        self.pending_actions = DeferredTaskActions(self.task_service,
+                                                   on_failed=self.on_pending_actions_failed)
+        self.undo_snackbar = None
+
+        # Multi-select: the list being selected in and the toolbar to restore
+        self.selecting_widget = None
+        self._normal_toolbar = None
+
         # Callbacks
         self.open_settings = None
+        self.open_stats = None
 
         # UI components
         self.toolbar = None
         self.list_tabs = None
         self.loading_spinner = None
 
-        # Theme management
+        # Theme management - colors come from the shared theme tokens
+        self.tokens = get_theme_tokens()
         self._theme_bound = False
         self._theme_update_scheduled = False
 
         self.build_ui()
         self.load_initial_data()
 
+        # Event-driven reloads: however many events arrive before the next
+        # frame, the list and category are reloaded once
+        self._reload_tasks_trigger = Clock.create_trigger(self._reload_current_list, 0)
+        self._reload_category_trigger = Clock.create_trigger(lambda dt: self.reload_category_data(), 0)
+
         # Setup event listeners
         self._setup_event_listeners()
 
         # Bind theme changes
-        app = MDApp.get_running_app()
-        if app:
-            app.theme_cls.bind(theme_style=self.on_theme_change)
-            self._theme_bound = True
+        self.tokens.bind(theme_style=self.on_theme_change)
+        self._theme_bound = True
 
     def _setup_event_listeners(self):
         """Setup event listeners for reactive updates"""
-        # Listen to task events
-        self.task_service.events.on(TaskEvents.TASK_CREATED, self.on_task_event)
-        self.task_service.events.on(TaskEvents.TASK_DELETED, self.on_task_event)
-        self.task_service.events.on(TaskEvents.TASK_UPDATED, self.on_task_event)
-        self.task_service.events.on(TaskEvents.TASK_COMPLETED, self.on_task_event)
-
-        # Listen to list events
-        self.list_service.events.on(TaskEvents.LIST_CREATED, self.on_list_event)
-        self.list_service.events.on(TaskEvents.LIST_DELETED, self.on_list_event)
-        self.list_service.events.on(TaskEvents.LIST_UPDATED, self.on_list_event)
-
-    def on_task_event(self, *args):
-        """Handle task events - reload current list"""
+        # Change feed, batched: a coalesced batch of changes arrives as one call
+        self._task_changes = ChangeTracker()
+        self._list_changes = ChangeTracker()
+        self._listening = False
+        self._subscribe()
+
+    def _subscribe(self):
+        if self._listening:
+            return
+        self.task_service.events.on(TaskEvents.CHANGED, self.on_task_event, batched=True)
+        self.list_service.events.on(TaskEvents.CHANGED, self.on_list_event, batched=True)
+        self._listening = True
+
+    def _unsubscribe(self):
+        if not self._listening:
+            return
+        self.task_service.events.off(TaskEvents.CHANGED, self.on_task_event)
+        self.list_service.events.off(TaskEvents.CHANGED, self.on_list_event)
+        self._listening = False
+
+    def on_task_event(self, events):
+        """Handle task changes - reload current list on the next frame if it is affected"""
+        if not self.current_list_id:
+            return
+
+        changes = [args[0] for args in events]
+        in_sequence = self._task_changes.accept(changes)
+
+        # After a gap we cannot tell what was missed, so reload regardless
+        if not in_sequence or any(self.current_list_id in change.list_ids for change in changes):
+            # Trigger is thread-safe and fires once per frame
+            self._reload_tasks_trigger()
+
+    def _reload_current_list(self, dt):
         if self.current_list_id:
-            # Use Clock to schedule UI update on main thread
-            Clock.schedule_once(lambda dt: self.load_tasks_for_list(self.current_list_id), 0)
+            self.load_tasks_for_list(self.current_list_id)
 
-    def on_list_event(self, *args):
-        """Handle list events - reload category"""
-        Clock.schedule_once(lambda dt: self.reload_category_data(), 0)
+    def on_list_event(self, events):
+        """Handle list changes - reload category on the next frame"""
+        self._list_changes.accept([args[0] for args in events])
+        self._reload_category_trigger()
 
     def on_pre_leave(self):
-        """Unbind theme when leaving screen"""
+        """Unbind theme and change listeners when leaving screen"""
+        # Other screens should see swipe actions committed
+        self.commit_pending_actions()
+
         if self._theme_bound:
-            app = MDApp.get_running_app()
-            if app:
-                app.theme_cls.unbind(theme_style=self.on_theme_change)
-                self._theme_bound = False
-
-        # Cleanup event listeners
-        self.task_service.events.off(TaskEvents.TASK_CREATED)
-        self.task_service.events.off(TaskEvents.TASK_DELETED)
-        self.task_service.events.off(TaskEvents.TASK_UPDATED)
-        self.task_service.events.off(TaskEvents.TASK_COMPLETED)
-        self.list_service.events.off(TaskEvents.LIST_CREATED)
-        self.list_service.events.off(TaskEvents.LIST_DELETED)
-        self.list_service.events.off(TaskEvents.LIST_UPDATED)
+            self.tokens.unbind(theme_style=self.on_theme_change)
+            self._theme_bound = False
+
+        # No reloads for changes made on other screens
+        self._unsubscribe()
 
     def on_pre_enter(self):
-        """Re-bind theme when entering screen"""
+        """Re-bind theme and change listeners when entering screen"""
         if not self._theme_bound:
-            app = MDApp.get_running_app()
-            if app:
-                app.theme_cls.bind(theme_style=self.on_theme_change)
-                self._theme_bound = True
+            self.tokens.bind(theme_style=self.on_theme_change)
+            self._theme_bound = True
+            self._apply_theme_update(0)
+
+        if not self._listening:
+            self._subscribe()
+            # Changes made while away were not seen
+            self._reload_tasks_trigger()
 
     def update_toolbar_colors(self):
         """Update toolbar colors based on theme"""
         if not self.toolbar:
             return
-        app = MDApp.get_running_app()
-        if app.theme_cls.theme_style == "Light":
-            self.toolbar.specific_text_color = Colors.LIGHT_TEXT
-        else:
-            self.toolbar.specific_text_color = Colors.DARK_TEXT
+        self.toolbar.specific_text_color = self.tokens.text
 
     def on_theme_change(self, instance, value):
         """Handle theme changes - BATCHED"""
@@ -126,6 +161,7 @@ class MainScreen(MDScreen):
         self._theme_update_scheduled = True
         Clock.schedule_once(self._apply_theme_update, 0)
 
+    @profiled("MainScreen._apply_theme_update")
     def _apply_theme_update(self, dt):
         """Apply theme update in batch"""
         self._theme_update_scheduled = False
@@ -136,27 +172,16 @@ class MainScreen(MDScreen):
             self.update_toolbar_colors()
             self.toolbar.left_action_items = [["menu", lambda x: self.toggle_nav_drawer()]]
             self.toolbar.right_action_items = [
+                ["chart-bar", lambda x: self.show_stats()],
                 ["cog", lambda x: self.show_settings()],
                 ["dots-vertical", lambda x: self.show_list_options()]
             ]
 
-        # Update list tabs
-        if self.list_tabs and self.current_list_id:
-            self.list_tabs.highlight_tab(self.current_list_id)
-
-        # Update visible task items
-        if self.current_list_id in self.list_widgets:
-            task_list_widget = self.list_widgets[self.current_list_id]
-            for child in task_list_widget.children:
-                if isinstance(child, TaskItem):
-                    child.update_theme_colors()
+        # List tabs and task rows follow the theme tokens themselves
 
     def get_toolbar_color(self):
         """Get toolbar color based on theme"""
-        app = MDApp.get_running_app()
-        if app and app.theme_cls.theme_style == "Dark":
-            return Colors.DARK_BG
-        return Colors.LIGHT_BG
+        return self.tokens.bg
 
     def build_ui(self):
         """Build the UI (same as before)"""
@@ -171,6 +196,7 @@ class MainScreen(MDScreen):
             title="Daily Tasks",
             left_action_items=[["menu", lambda x: self.toggle_nav_drawer()]],
             right_action_items=[
+                ["chart-bar", lambda x: self.show_stats()],
                 ["cog", lambda x: self.show_settings()],
                 ["dots-vertical", lambda x: self.show_list_options()]
             ],
@@ -265,6 +291,10 @@ class MainScreen(MDScreen):
         if self.open_settings:
             self.open_settings()
 
+    def show_stats(self):
+        if self.open_stats:
+            self.open_stats()
+
     def load_initial_data(self):
         """Load initial category data - USES SERVICE LAYER"""
         try:
@@ -284,24 +314,28 @@ class MainScreen(MDScreen):
 
     def build_list_swiper(self):
         """Build swiper for current category"""
+        self.exit_select_mode()
         self.list_swiper.clear_slides()
 
-        for list_id, widget in self.list_widgets.items():
-            widget.clear_widgets()
-
         self.list_widgets.clear()
 
         lists = self.category_lists.get(self.current_category, [])
         self.list_tabs.set_lists(lists)
 
+        callbacks = {
+            'on_task_click': self.on_task_click,
+            'on_toggle_complete': self.toggle_task_completed,
+            'on_delete': self.delete_task,
+        }
+
         for idx, task_list in enumerate(lists):
-            scroll = MDScrollView()
-            task_list_widget = MDList(padding=[dp(8), dp(12)])
-            scroll.add_widget(task_list_widget)
-            scroll.list_id = task_list.id
-            scroll.list_index = idx
+            # Recycled rows: only the visible rows have widgets
+            task_list_widget = VirtualTaskList(callbacks=callbacks, on_reorder=self.reorder_task,
+                                               on_swipe=self.on_task_swipe)
+            task_list_widget.list_id = task_list.id
+            task_list_widget.list_index = idx
             self.list_widgets[task_list.id] = task_list_widget
-            self.list_swiper.add_list_slide(scroll)
+            self.list_swiper.add_list_slide(task_list_widget)
 
         if lists:
             self.current_list_index = 0
@@ -310,6 +344,21 @@ class MainScreen(MDScreen):
             self.list_tabs.select_list(self.current_list_id)
             self.update_toolbar_title()
             self.load_tasks_for_list(self.current_list_id)
+            self.prefetch_neighbour_lists()
+
+    def prefetch_neighbour_lists(self):
+        """Warm the cache for the lists next to the current one in the background"""
+        from utils.constants import PREFETCH_RADIUS
+
+        lists = self.category_lists.get(self.current_category, [])
+        index = self.current_list_index
+        neighbours = []
+        for offset in range(1, PREFETCH_RADIUS + 1):
+            for idx in (index + offset, index - offset):
+                if 0 <= idx < len(lists):
+                    neighbours.append(lists[idx].id)
+
+        self.task_service.prefetch_lists(neighbours)
 
     def update_toolbar_title(self):
         """Update toolbar with category name"""
@@ -359,58 +408,28 @@ class MainScreen(MDScreen):
         lists = self.category_lists.get(self.current_category, [])
         if 0 <= index < len(lists):
             task_list = lists[index]
+            if task_list.id != self.current_list_id:
+                self.exit_select_mode()
             self.current_list_index = index
             self.current_list_id = task_list.id
             self.current_list_name = task_list.name
             self.list_tabs.select_list(task_list.id)
             self.load_tasks_for_list(task_list.id)
+            self.prefetch_neighbour_lists()
 
-    def load_tasks_for_list(self, list_id):
+    @profiled("MainScreen.load_tasks_for_list")
+    def load_tasks_for_list(self, list_id, force_refresh=False):
         """Load tasks - USES SERVICE LAYER with caching!"""
         if list_id not in self.list_widgets:
             return
 
         task_list_widget = self.list_widgets[list_id]
-        task_list_widget.clear_widgets()
 
         try:
-            # SERVICE LAYER handles caching and optimization!
-            tasks = self.task_service.get_list_tasks(
-                list_id,
-                show_completed=True,
-                use_cache=True  # Use cache for better performance
-            )
-
-            for task in tasks:
-                task_item = TaskItem(
-                    task_id=task.id,
-                    task_title=task.title,
-                    task_notes=task.notes,
-                    task_start_time=task.start_time or "",
-                    task_end_time=task.end_time or "",
-                    task_recurrence=task.recurrence_type or "",
-                    task_motivation=task.motivation or "",
-                    task_completed=task.completed,
-                    on_task_click=self.open_task_details,
-                    on_toggle_complete=self.toggle_task_completed,
-                    on_delete=self.delete_task
-                )
-
-                task_list_widget.add_widget(task_item)
-
-                # Add subtasks
-                for subtask in task.subtasks:
-                    subtask_item = TaskItem(
-                        task_id=subtask.id,
-                        task_title=subtask.title,
-                        task_completed=subtask.completed,
-                        is_subtask=True,
-                        on_task_click=self.open_task_details,
-                        on_toggle_complete=self.toggle_task_completed,
-                        on_delete=self.delete_task
-                    )
-                    subtask_item.update_theme_colors()
-                    task_list_widget.add_widget(subtask_item)
+            # SERVICE LAYER handles caching and builds rows only for changed tasks
+            rows = self.task_service.get_list_rows(list_id, force_refresh=force_refresh)
+            # Hide what is waiting in the undo window
+            task_list_widget.load_tasks(self.pending_actions.apply(rows))
 
         except Exception as e:
             print(f"❌ Error loading tasks: {e}")
@@ -427,7 +446,7 @@ class MainScreen(MDScreen):
             toast("No list selected")
             return
 
-        dialog = CreateTaskDialog(self.add_task, self.current_list_id)
+        dialog = dialogs.CreateTaskDialog(self.add_task, self.current_list_id)
         dialog.show()
 
     def add_task(self, task_data):
@@ -467,25 +486,193 @@ class MainScreen(MDScreen):
             print(f"❌ Error toggling task: {e}")
             toast("Error updating task")
 
-    def delete_task(self, task_id):
-        """Delete task with confirmation"""
-        dialog = ConfirmDialog(
-            title="Delete Task",
-            message="Are you sure you want to delete this task?",
-            callback=lambda: self.confirm_delete_task(task_id),
+    def reorder_task(self, task_id, before_id=None, after_id=None):
+        """Persist a drag-and-drop reorder (the list already shows the new order)"""
+        try:
+            self.task_service.move_task(task_id, before_id=before_id, after_id=after_id)
+            # Event listener will reload with the stored order
+        except Exception as e:
+            print(f"❌ Error moving task: {e}")
+            toast("Error moving task")
+            self.load_tasks_for_list(self.current_list_id)
+
+    def on_task_click(self, task_id):
+        """Tap on a row: toggles selection in select mode, opens the task otherwise"""
+        if self.selecting_widget:
+            count = self.selecting_widget.toggle_selected(task_id)
+            self.toolbar.title = f"{count} selected"
+        else:
+            self.open_task_details(task_id)
+
+    # ===== MULTI-SELECT =====
+
+    def enter_select_mode(self):
+        """Swap the toolbar for bulk actions on the current list"""
+        widget = self.list_widgets.get(self.current_list_id)
+        if not widget or self.selecting_widget:
+            return
+
+        self.selecting_widget = widget
+        widget.set_select_mode(True)
+
+        toolbar = self.toolbar
+        self._normal_toolbar = (toolbar.title, toolbar.left_action_items, toolbar.right_action_items)
+        toolbar.title = "0 selected"
+        toolbar.left_action_items = [["close", lambda x: self.exit_select_mode()]]
+        toolbar.right_action_items = [
+            ["select-all", lambda x: self.select_all_tasks()],
+            ["check-all", lambda x: self.bulk_set_completed(True)],
+            ["checkbox-blank-outline", lambda x: self.bulk_set_completed(False)],
+            ["folder-move-outline", lambda x: self.show_move_tasks_menu()],
+            ["delete-outline", lambda x: self.bulk_delete()],
+        ]
+        self.update_toolbar_colors()
+
+    def exit_select_mode(self):
+        if not self.selecting_widget:
+            return
+
+        self.selecting_widget.set_select_mode(False)
+        self.selecting_widget = None
+        self.toolbar.title, self.toolbar.left_action_items, self.toolbar.right_action_items = self._normal_toolbar
+        self._normal_toolbar = None
+        self.update_toolbar_colors()
+
+    def select_all_tasks(self):
+        if self.selecting_widget:
+            self.toolbar.title = f"{self.selecting_widget.select_all()} selected"
+
+    def _selected_task_ids(self):
+        task_ids = self.selecting_widget.selected_ids if self.selecting_widget else []
+        if not task_ids:
+            toast("No tasks selected")
+        return task_ids
+
+    def bulk_set_completed(self, completed):
+        """Complete or reopen the selection - one transaction, one refresh"""
+        task_ids = self._selected_task_ids()
+        if not task_ids:
+            return
+
+        try:
+            count = self.task_service.batch_update_completion(task_ids, completed)
+            toast(f"{count} tasks {'completed' if completed else 'reopened'}")
+            # Event listener will reload once for the whole batch
+        except Exception as e:
+            print(f"❌ Error updating tasks: {e}")
+            toast("Error updating tasks")
+        self.exit_select_mode()
+
+    def bulk_delete(self):
+        task_ids = self._selected_task_ids()
+        if not task_ids:
+            return
+
+        dialog = dialogs.ConfirmDialog(
+            title="Delete Tasks",
+            message=f"Delete {len(task_ids)} selected tasks and their subtasks?",
+            callback=lambda: self.confirm_bulk_delete(task_ids),
             confirm_text="DELETE"
         )
         dialog.show()
 
-    def confirm_delete_task(self, task_id):
-        """Confirm and delete task - USES SERVICE LAYER"""
+    def confirm_bulk_delete(self, task_ids):
         try:
-            self.task_service.delete_task(task_id)
-            toast("Task deleted")
-            # Event listener will auto-reload
+            count = self.task_service.batch_delete_tasks(task_ids)
+            toast(f"{count} tasks deleted")
         except Exception as e:
-            print(f"❌ Error deleting task: {e}")
-            toast("Error deleting task")
+            print(f"❌ Error deleting tasks: {e}")
+            toast("Error deleting tasks")
+        self.exit_select_mode()
+
+    def show_move_tasks_menu(self):
+        """Pick the destination list (any category) for the selection"""
+        from kivymd.uix.menu import MDDropdownMenu
+
+        if not self._selected_task_ids():
+            return
+
+        menu_items = []
+        for cat in TaskCategory.get_all():
+            for task_list in self.category_lists.get(cat['id'], []):
+                if task_list.id == self.current_list_id:
+                    continue
+                menu_items.append({
+                    "text": f"{cat['name']} › {task_list.name}",
+                    "viewclass": "OneLineListItem",
+                    "on_release": lambda list_id=task_list.id: self.bulk_move(list_id),
+                })
+
+        if not menu_items:
+            toast("No other lists")
+            return
+
+        self.menu = MDDropdownMenu(
+            caller=self.toolbar.ids.right_actions,
+            items=menu_items,
+            width_mult=4,
+        )
+        self.menu.open()
+
+    def bulk_move(self, target_list_id):
+        self.menu.dismiss()
+        task_ids = self._selected_task_ids()
+        if not task_ids:
+            return
+
+        try:
+            count = self.task_service.move_tasks(task_ids, target_list_id)
+            toast(f"{count} tasks moved")
+        except Exception as e:
+            print(f"❌ Error moving tasks: {e}")
+            toast("Error moving tasks")
+        self.exit_select_mode()
+
+    def delete_task(self, task_id):
+        """Delete button - the row disappears at once and can be restored with UNDO"""
+        self.defer_delete(task_id, self.current_list_id)
+
+    def on_task_swipe(self, row, direction):
+        """Swipe left deletes, swipe right toggles completion (both undoable)"""
+        if direction == 'left':
+            self.defer_delete(row.task_id, row.list_id)
+            return
+
+        completed = not row.completed
+        self.pending_actions.set_completed(row.task_id, row.list_id, completed)
+        widget = self.list_widgets.get(row.list_id)
+        if widget:
+            widget.update_task_completion(row.task_id, completed)
+        self.show_undo_snackbar()
+
+    def defer_delete(self, task_id, list_id):
+        self.pending_actions.delete(task_id, list_id)
+        widget = self.list_widgets.get(list_id)
+        if widget:
+            widget.remove_task(task_id)
+        self.show_undo_snackbar()
+
+    def show_undo_snackbar(self):
+        if self.undo_snackbar is None:
+            self.undo_snackbar = dialogs.UndoSnackbar(self.undo_pending_actions)
+        self.undo_snackbar.show(self.pending_actions.summary())
+
+    def commit_pending_actions(self):
+        """Commit pending swipe actions now (leaving the screen, app exit)"""
+        if self.undo_snackbar:
+            self.undo_snackbar.dismiss()
+        self.pending_actions.flush()
+
+    def on_pending_actions_failed(self, list_ids):
+        """A commit failed part-way: show the lists as they are in the database"""
+        toast("Could not save changes")
+        for list_id in list_ids:
+            self.load_tasks_for_list(list_id, force_refresh=True)
+
+    def undo_pending_actions(self):
+        """Forget the pending swipe actions and redraw the lists they touched"""
+        for list_id in self.pending_actions.undo():
+            self.load_tasks_for_list(list_id)
 
     def open_task_details(self, task_id):
         """Will be set by main app"""
@@ -503,6 +690,8 @@ class MainScreen(MDScreen):
         from kivymd.uix.menu import MDDropdownMenu
 
         menu_items = [
+            {"text": "Select Tasks", "viewclass": "OneLineListItem",
+             "on_release": lambda: self.menu_action("select")},
             {"text": "Rename List", "viewclass": "OneLineListItem",
              "on_release": lambda: self.menu_action("rename")},
             {"text": "Delete List", "viewclass": "OneLineListItem",
@@ -519,8 +708,10 @@ class MainScreen(MDScreen):
     def menu_action(self, action):
         """Handle menu actions"""
         self.menu.dismiss()
-        if action == "rename":
-            dialog = EditListDialog(self.current_list_name, self.rename_list)
+        if action == "select":
+            self.enter_select_mode()
+        elif action == "rename":
+            dialog = dialogs.EditListDialog(self.current_list_name, self.rename_list)
             dialog.show()
         elif action == "delete":
             self.delete_current_list()
@@ -540,7 +731,7 @@ class MainScreen(MDScreen):
         """Delete current list with confirmation"""
         lists = self.category_lists.get(self.current_category, [])
         if self.current_list_id and len(lists) > 1:
-            dialog = ConfirmDialog(
+            dialog = dialogs.ConfirmDialog(
                 title="Delete List",
                 message=f"Delete '{self.current_list_name}' and all its tasks?",
                 callback=self.confirm_delete_list,
@@ -562,7 +753,7 @@ class MainScreen(MDScreen):
 
     def show_add_list_dialog(self, *args):
         """Show dialog to add new list"""
-        dialog = AddTaskDialog(self.add_list, title="New List", hint="List name")
+        dialog = dialogs.AddTaskDialog(self.add_list, title="New List", hint="List name")
         dialog.show()
 
     def add_list(self, name):
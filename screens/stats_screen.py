@@ -0,0 +1,175 @@
+from kivymd.uix.screen import MDScreen
+from kivymd.uix.toolbar import MDTopAppBar
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.gridlayout import MDGridLayout
+from kivymd.uix.scrollview import MDScrollView
+from kivymd.uix.label import MDLabel
+from kivy.uix.image import Image
+from kivy.metrics import dp
+from kivy.clock import Clock
+from datetime import date
+from database.models import TaskCategory
+from services.analytics_service import AnalyticsService
+from utils.chart_renderer import chart_size, get_chart_renderer
+from utils.constants import HEATMAP_WEEKS, TREND_DAYS
+from utils.theme_tokens import get_theme_tokens
+
+
+class StatsScreen(MDScreen):
+    """
+    Streaks, completion rate, busiest hours and two charts.
+
+    Numbers come from AnalyticsService (completion totals, O(days)); charts
+    are rendered by the chart renderer's worker and cached as textures, so
+    re-entering the screen without new completions does no rendering.
+    """
+
+    def __init__(self, analytics_service: AnalyticsService, on_back_callback, **kwargs):
+        super().__init__(**kwargs)
+        self.analytics = analytics_service
+        self.on_back_callback = on_back_callback
+        self.renderer = get_chart_renderer()
+        self.tokens = get_theme_tokens()
+        self._theme_bound = False
+
+        self.summary = None
+        self.charts = {}  # chart kind -> Image
+        self._wanted = {}  # chart kind -> key of the latest request (older renders are ignored)
+        self.stat_labels = {}
+
+        # Resizes and theme flips coalesce into one render pass per frame
+        self._render_trigger = Clock.create_trigger(self.render_charts)
+
+        self.build_ui()
+
+    def on_pre_enter(self):
+        if not self._theme_bound:
+            self.tokens.bind(theme_style=self.on_theme_change)
+            self._theme_bound = True
+        self.toolbar.md_bg_color = self.tokens.bg
+        self.toolbar.specific_text_color = self.tokens.text
+        self.refresh()
+
+    def on_pre_leave(self):
+        if self._theme_bound:
+            self.tokens.unbind(theme_style=self.on_theme_change)
+            self._theme_bound = False
+
+    def on_theme_change(self, instance, value):
+        self.toolbar.md_bg_color = self.tokens.bg
+        self.toolbar.specific_text_color = self.tokens.text
+        self._render_trigger()
+
+    def build_ui(self):
+        layout = MDBoxLayout(orientation='vertical')
+
+        self.toolbar = MDTopAppBar(
+            title="Statistics",
+            left_action_items=[["arrow-left", lambda x: self.go_back()]],
+            elevation=2,
+            md_bg_color=self.tokens.bg,
+            specific_text_color=self.tokens.text
+        )
+        layout.add_widget(self.toolbar)
+
+        scroll = MDScrollView()
+        content = MDBoxLayout(
+            orientation='vertical',
+            padding=dp(16),
+            spacing=dp(16),
+            size_hint_y=None
+        )
+        content.bind(minimum_height=content.setter('height'))
+
+        # Headline numbers
+        numbers = MDGridLayout(cols=2, spacing=dp(8), size_hint_y=None, height=dp(130))
+        for key, caption in (("current", "Current streak"), ("longest", "Longest streak"),
+                             ("rate", f"Completed (last {HEATMAP_WEEKS} weeks)"), ("hours", "Busiest hours")):
+            cell = MDBoxLayout(orientation='vertical', size_hint_y=None, height=dp(60))
+            value = MDLabel(text="-", font_style="H5", size_hint_y=None, height=dp(36))
+            cell.add_widget(value)
+            cell.add_widget(MDLabel(text=caption, font_style="Caption", theme_text_color="Secondary",
+                                    size_hint_y=None, height=dp(20)))
+            numbers.add_widget(cell)
+            self.stat_labels[key] = value
+        content.add_widget(numbers)
+
+        for kind in ('heatmap', 'trends'):
+            image = Image(size_hint_y=None, height=dp(220), fit_mode="contain")
+            image.bind(size=lambda *args: self._render_trigger())
+            content.add_widget(image)
+            self.charts[kind] = image
+
+        self.chart_status = MDLabel(text="", font_style="Caption", theme_text_color="Secondary",
+                                    halign="center", size_hint_y=None, height=dp(24))
+        content.add_widget(self.chart_status)
+
+        scroll.add_widget(content)
+        layout.add_widget(scroll)
+        self.add_widget(layout)
+
+    def refresh(self):
+        """Reload the numbers (cached until completions change) and request the charts"""
+        try:
+            self.summary = self.analytics.summary(days=HEATMAP_WEEKS * 7)
+        except Exception as e:
+            print(f"❌ Error loading statistics: {e}")
+            self.summary = None
+            return
+
+        streaks = self.summary['streaks']
+        rate = self.summary['rate']
+        self.stat_labels['current'].text = self._days_text(streaks['current'])
+        self.stat_labels['longest'].text = self._days_text(streaks['longest'])
+        self.stat_labels['rate'].text = f"{rate['rate'] * 100:.0f}%  ({rate['completed']}/{rate['created']})"
+        hours = self.summary['busiest_hours']
+        self.stat_labels['hours'].text = ", ".join(f"{hour:02d}:00" for hour, _ in hours) or "-"
+
+        self._render_trigger()
+
+    @staticmethod
+    def _days_text(days):
+        return f"{days} day" if days == 1 else f"{days} days"
+
+    def _chart_data(self, kind):
+        if kind == 'heatmap':
+            return {'days': self.summary['daily']}
+        names = {cat['id']: cat['name'] for cat in TaskCategory.get_all()}
+        categories = {category: counts[-TREND_DAYS:]
+                      for category, counts in self.summary['categories'].items()}
+        return {'categories': categories, 'names': names}
+
+    def render_charts(self, *args):
+        """Ask the renderer for each chart; cached textures arrive immediately"""
+        if self.summary is None:
+            return
+
+        # The heatmap's columns shift at midnight even without new completions
+        version = (self.summary['version'], date.today().isoformat())
+        theme_style = self.tokens.theme_style
+        for kind, image in self.charts.items():
+            if image.width < 1 or image.height < 1:
+                continue
+            wanted = (version, theme_style, chart_size(*image.size))
+            if self._wanted.get(kind) == wanted:
+                continue
+            self._wanted[kind] = wanted
+            if image.texture is None:
+                self.chart_status.text = "Rendering charts..."
+            self.renderer.request(kind, self._chart_data(kind), version, theme_style, image.size,
+                                  lambda texture, kind=kind, wanted=wanted: self._show_chart(kind, wanted, texture))
+
+    def _show_chart(self, kind, wanted, texture):
+        if self._wanted.get(kind) != wanted:
+            return
+        image = self.charts[kind]
+        if texture is None:
+            self._wanted.pop(kind, None)
+            self.chart_status.text = "Charts are unavailable"
+            return
+        image.texture = texture
+        self.chart_status.text = ""
+
+    def go_back(self):
+        if self.on_back_callback:
+            self.on_back_callback()
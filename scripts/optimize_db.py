@@ -56,7 +56,7 @@ def main():
         result = optimizer.benchmark_query(query, params, iterations=20)
 
         if result:
-            print(f"  ✅ Average: {result['avg'] * 1000:.2f}ms")
+            print(f"  ✅ p50: {result['p50'] * 1000:.2f}ms  p95: {result['p95'] * 1000:.2f}ms")
             print(f"  ⚡ Best: {result['min'] * 1000:.2f}ms")
 
     # Vacuum recommendation
@@ -74,6 +74,9 @@ def main():
     if stats.get('total_tasks', 0) > 1000:
         print("💡 Large number of tasks detected. Virtual scrolling recommended.")
 
+    print("💡 For repeatable timings and regression checks use the benchmark suite:")
+    print("   python -m benchmarks.run --size 100k --check")
+
     print("\n" + "=" * 60)
     print("  ✅ OPTIMIZATION COMPLETE!")
     print("=" * 60 + "\n")
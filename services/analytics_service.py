@@ -0,0 +1,137 @@
+"""
+Analytics Service - completion statistics from the incremental totals
+
+Everything here reads completion_daily / completion_hourly (kept current by
+triggers, see DatabaseManager._init_completion_log), so the cost grows with
+the number of days of history, not the number of tasks ever completed.
+"""
+
+from datetime import date, timedelta
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from database.db_manager import DatabaseManager
+from utils.constants import DATE_FORMAT
+
+
+def _net(completed, reopened):
+    return max((completed or 0) - (reopened or 0), 0)
+
+
+def streaks_from_days(days, today: Optional[date] = None) -> Dict[str, int]:
+    """
+    Current and longest run of consecutive active days.
+
+    `days` are sorted 'YYYY-MM-DD' strings. The current streak is still alive
+    when the last active day is yesterday (today is not over yet).
+    """
+    today = today or date.today()
+    longest = run = 0
+    previous = None
+    for day in days:
+        current = date.fromisoformat(day)
+        run = run + 1 if previous is not None and current - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = current
+
+    alive = previous is not None and (today - previous).days <= 1
+    return {'current': run if alive else 0, 'longest': longest}
+
+
+class AnalyticsService:
+    """
+    Streaks, completion rates and busiest hours.
+    Results of summary() are cached until the totals change.
+    """
+
+    def __init__(self, db_manager: DatabaseManager):
+        self.db = db_manager
+        self._lock = Lock()
+        self._summary_cache: Dict[tuple, Tuple[tuple, Dict[str, Any]]] = {}
+
+    def version(self) -> tuple:
+        """Changes whenever any statistic could change"""
+        return self.db.get_completion_version()
+
+    @staticmethod
+    def _since(days: int, today: Optional[date] = None) -> str:
+        today = today or date.today()
+        return (today - timedelta(days=days - 1)).strftime(DATE_FORMAT)
+
+    def daily_series(self, days: int = 28, category: Optional[str] = None,
+                     today: Optional[date] = None) -> List[Tuple[str, int]]:
+        """Net completions for each of the last `days` days (oldest first, zero-filled)"""
+        today = today or date.today()
+        counts = {
+            day: _net(completed, reopened)
+            for day, _created, completed, reopened
+            in self.db.get_daily_completions(self._since(days, today), category)
+        }
+        series = []
+        for offset in range(days - 1, -1, -1):
+            day = (today - timedelta(days=offset)).strftime(DATE_FORMAT)
+            series.append((day, counts.get(day, 0)))
+        return series
+
+    def streaks(self, category: Optional[str] = None, today: Optional[date] = None) -> Dict[str, int]:
+        """{'current': days, 'longest': days} of days with at least one completion"""
+        active = [day for day, _created, completed, reopened
+                  in self.db.get_daily_completions(category=category)
+                  if _net(completed, reopened) > 0]
+        return streaks_from_days(active, today)
+
+    def completion_rate(self, days: int = 30, category: Optional[str] = None,
+                        today: Optional[date] = None) -> Dict[str, Any]:
+        """Tasks completed vs. tasks created over the last `days` days"""
+        created = completed = 0
+        for _day, day_created, day_completed, reopened in self.db.get_daily_completions(
+                self._since(days, today), category):
+            created += day_created or 0
+            completed += _net(day_completed, reopened)
+        rate = min(completed / created, 1.0) if created else 0.0
+        return {'created': created, 'completed': completed, 'rate': rate}
+
+    def busiest_hours(self, top: int = 3, category: Optional[str] = None) -> List[Tuple[int, int]]:
+        """[(hour, completions)] for the `top` busiest local hours, busiest first"""
+        hours = self.db.get_hourly_completions(category)
+        ranked = sorted(hours.items(), key=lambda item: (-item[1], item[0]))
+        return [(hour, count) for hour, count in ranked[:top] if count > 0]
+
+    def category_trends(self, days: int = 28, today: Optional[date] = None) -> Dict[str, List[int]]:
+        """{category: net completions per day for the last `days` days}"""
+        today = today or date.today()
+        day_index = {
+            (today - timedelta(days=offset)).strftime(DATE_FORMAT): days - 1 - offset
+            for offset in range(days)
+        }
+        trends: Dict[str, List[int]] = {}
+        for category, day, count in self.db.get_category_completions(self._since(days, today)):
+            index = day_index.get(day)
+            if index is None:
+                continue
+            trends.setdefault(category, [0] * days)[index] = max(count or 0, 0)
+        return trends
+
+    def summary(self, days: int = 28, category: Optional[str] = None) -> Dict[str, Any]:
+        """All statistics at once; cached per (days, category) until the version changes"""
+        key = (days, category, date.today())
+        version = self.version()
+        with self._lock:
+            cached = self._summary_cache.get(key)
+            if cached and cached[0] == version:
+                return cached[1]
+
+        result = {
+            'version': version,
+            'streaks': self.streaks(category),
+            'rate': self.completion_rate(days, category),
+            'busiest_hours': self.busiest_hours(category=category),
+            'daily': self.daily_series(days, category),
+            'categories': self.category_trends(days) if category is None else {},
+        }
+
+        with self._lock:
+            # Keys carry the date, so drop yesterday's entries as we go
+            self._summary_cache = {k: v for k, v in self._summary_cache.items() if k[2] == key[2]}
+            self._summary_cache[key] = (version, result)
+        return result
@@ -0,0 +1,123 @@
+"""
+Deferred Task Actions - swipe deletes and completions with an undo window
+
+Actions are applied to the view at once but only reach the database when
+the undo window has passed without a new action: however many rows were
+swiped, that is one batch_delete_tasks and at most two
+batch_update_completion calls (one per completion value).
+"""
+
+from typing import Dict, List, Set, Tuple
+
+from services.task_view_models import TaskRow
+from utils.constants import UNDO_WINDOW
+
+
+class DeferredTaskActions:
+    """Pending swipe actions of the task lists, committed in batches"""
+
+    def __init__(self, task_service, delay: float = UNDO_WINDOW, on_failed=None):
+        self.task_service = task_service
+        self.delay = delay
+        # on_failed(list_ids): a commit failed; the view already shows the
+        # actions, so those lists must be reloaded from the database
+        self.on_failed = on_failed
+        self._deletes: Dict[int, int] = {}                  # task_id -> list_id
+        self._completions: Dict[int, Tuple[int, bool]] = {}  # task_id -> (list_id, completed)
+        self._timer = None
+
+    def __len__(self):
+        return len(self._deletes) + len(self._completions)
+
+    def delete(self, task_id: int, list_id: int):
+        """Delete a task (and its subtasks) once the undo window has passed"""
+        self._completions.pop(task_id, None)
+        self._deletes[task_id] = list_id
+        self._restart_timer()
+
+    def set_completed(self, task_id: int, list_id: int, completed: bool):
+        """Set a task's completion once the undo window has passed"""
+        if task_id in self._deletes:
+            return
+        self._completions[task_id] = (list_id, completed)
+        self._restart_timer()
+
+    def _restart_timer(self):
+        """Every new action extends the window, so a burst of swipes commits together"""
+        if self._timer is None:
+            from kivy.clock import Clock
+            self._timer = Clock.create_trigger(self.flush, self.delay)
+        self._timer.cancel()
+        self._timer()
+
+    def summary(self) -> str:
+        """Snackbar text, e.g. '3 tasks deleted, 1 completed'"""
+        parts = []
+        if self._deletes:
+            count = len(self._deletes)
+            parts.append(f"{count} task{'s' if count != 1 else ''} deleted")
+        done = sum(1 for _, completed in self._completions.values() if completed)
+        undone = len(self._completions) - done
+        if done:
+            parts.append(f"{done} completed")
+        if undone:
+            parts.append(f"{undone} reopened")
+        return ", ".join(parts)
+
+    def apply(self, rows: List[TaskRow]) -> List[TaskRow]:
+        """Rows as they will look once the pending actions are committed"""
+        if not self._deletes and not self._completions:
+            return rows
+
+        result = []
+        for row in rows:
+            if row.task_id in self._deletes or row.parent_id in self._deletes:
+                continue
+            pending = self._completions.get(row.task_id)
+            if pending is not None and pending[1] != row.completed:
+                row = row.replace(completed=pending[1])
+            result.append(row)
+        return result
+
+    def undo(self) -> Set[int]:
+        """Drop all pending actions; returns the ids of the lists to redraw"""
+        if self._timer is not None:
+            self._timer.cancel()
+
+        list_ids = set(self._deletes.values())
+        list_ids.update(list_id for list_id, _ in self._completions.values())
+        self._deletes.clear()
+        self._completions.clear()
+        return list_ids
+
+    def flush(self, *args) -> int:
+        """Commit the pending actions now; returns the number of tasks written"""
+        if self._timer is not None:
+            self._timer.cancel()
+
+        deletes = list(self._deletes)
+        list_ids = set(self._deletes.values())
+        list_ids.update(list_id for list_id, _ in self._completions.values())
+        completions = {True: [], False: []}
+        for task_id, (_, completed) in self._completions.items():
+            completions[completed].append(task_id)
+        self._deletes.clear()
+        self._completions.clear()
+
+        written = 0
+        try:
+            # One event delivery (one UI refresh) for the whole commit
+            with self.task_service.events.batch():
+                if deletes:
+                    written += self.task_service.batch_delete_tasks(deletes)
+                for completed, task_ids in completions.items():
+                    if task_ids:
+                        written += self.task_service.batch_update_completion(task_ids, completed)
+        except Exception as e:
+            print(f"❌ Error committing task actions: {e}")
+            if self.on_failed:
+                self.on_failed(list_ids)
+
+        if written:
+            print(f"✅ Committed {written} deferred task actions")
+        return written
@@ -4,11 +4,14 @@ Abstracts database access and provides caching, validation, and events
 """
 
 from typing import List, Optional, Dict, Any
+from collections import OrderedDict
 from datetime import datetime
 from threading import Lock
 from database.db_manager import DatabaseManager
-from database.models import Task, TaskList
-from utils.event_system import EventDispatcher, TaskEvents
+from database.models import ArchivedTask, Task, TaskList
+from services.task_view_models import TaskRow, TaskRowCache
+from utils.constants import LIST_CACHE_SIZE
+from utils.event_system import ChangeEvent, EventDispatcher, TaskEvents
 
 
 class TaskService:
@@ -22,16 +25,38 @@ class TaskService:
         self.db = db_manager
         self.events = EventDispatcher()
 
+        # Several updates of one task inside a batch merge their fields
+        self.events.coalesce(
+            TaskEvents.TASK_UPDATED,
+            merge=lambda earlier, later: ((later[0][0], {**earlier[0][1], **later[0][1]}), later[1])
+        )
+
         # Thread-safe cache
         self._cache_lock = Lock()
         self._task_cache: Dict[int, Task] = {}
-        self._list_tasks_cache: Dict[int, List[Task]] = {}
+        self._list_tasks_cache: "OrderedDict[int, List[Task]]" = OrderedDict()
+
+        # Bumped on every invalidation; a load only caches its result if the
+        # list's version did not change while it was querying
+        self._list_versions: Dict[int, int] = {}
+
+        # Single background worker: prefetch of neighbouring lists,
+        # position rebalancing and archiving
+        self._executor = None
+        self._prefetch_generation = 0
+        self._pending_rebalances = set()
+        self._stopping = False
+
+        # Display rows for task lists, rebuilt only for changed tasks
+        self.rows = TaskRowCache()
 
         # Statistics
         self._stats = {
             'cache_hits': 0,
             'cache_misses': 0,
-            'db_queries': 0
+            'db_queries': 0,
+            'prefetched': 0,
+            'archived': 0
         }
 
     # ===== TASK OPERATIONS =====
@@ -98,6 +123,7 @@ class TaskService:
             with self._cache_lock:
                 if cache_key in self._list_tasks_cache:
                     self._stats['cache_hits'] += 1
+                    self._list_tasks_cache.move_to_end(cache_key)
                     tasks = self._list_tasks_cache[cache_key]
 
                     # Filter completed if needed
@@ -111,17 +137,12 @@ class TaskService:
         self._stats['db_queries'] += 1
 
         try:
-            from utils.constants import MAX_TASKS_PER_LIST
-            tasks = self.db.get_tasks_by_list(
-                list_id,
-                show_completed=show_completed,
-                limit=MAX_TASKS_PER_LIST
-            )
+            version = self._list_version(list_id)
+            tasks = self._query_list_tasks(list_id, show_completed)
 
-            # Update cache
-            if use_cache:
-                with self._cache_lock:
-                    self._list_tasks_cache[cache_key] = tasks
+            # Update cache (only complete lists - the cache serves both views)
+            if use_cache and show_completed:
+                self._cache_list_tasks(list_id, tasks, version)
 
             return tasks
 
@@ -129,6 +150,92 @@ class TaskService:
             print(f"❌ Error getting tasks for list {list_id}: {e}")
             return []
 
+    def _query_list_tasks(self, list_id: int, show_completed: bool = True) -> List[Task]:
+        from utils.constants import MAX_TASKS_PER_LIST
+        return self.db.get_tasks_by_list(
+            list_id,
+            show_completed=show_completed,
+            limit=MAX_TASKS_PER_LIST
+        )
+
+    def _list_version(self, list_id: int) -> int:
+        with self._cache_lock:
+            return self._list_versions.get(list_id, 0)
+
+    def _cache_list_tasks(self, list_id: int, tasks: List[Task], version: int) -> bool:
+        """Store a loaded list unless it was invalidated meanwhile; LRU-bounded"""
+        with self._cache_lock:
+            if self._list_versions.get(list_id, 0) != version:
+                return False
+            self._list_tasks_cache[list_id] = tasks
+            self._list_tasks_cache.move_to_end(list_id)
+            while len(self._list_tasks_cache) > LIST_CACHE_SIZE:
+                self._list_tasks_cache.popitem(last=False)
+            return True
+
+    # ===== PREFETCH =====
+
+    def prefetch_lists(self, list_ids: List[int]):
+        """
+        Load lists (tasks and display rows) on a background thread so a
+        later get_list_tasks()/get_list_rows() is a cache hit.
+
+        Each call supersedes the previous one: work for lists the user has
+        already swiped past is skipped. At most LIST_CACHE_SIZE - 1 lists
+        are prefetched so the list being shown is never evicted.
+        """
+        with self._cache_lock:
+            self._prefetch_generation += 1
+            generation = self._prefetch_generation
+            wanted = [lid for lid in list_ids if lid not in self._list_tasks_cache]
+
+        wanted = wanted[:LIST_CACHE_SIZE - 1]
+        if not wanted:
+            return
+
+        self._run_in_background(self._prefetch, generation, wanted)
+
+    def _run_in_background(self, fn, *args):
+        if self._executor is None:
+            from utils.executors import create_pool
+            self._executor, _ = create_pool(1, prefer="thread")
+        return self._executor.submit(fn, *args)
+
+    def _prefetch(self, generation: int, list_ids: List[int]):
+        for list_id in list_ids:
+            # A newer swipe replaced this request
+            if generation != self._prefetch_generation:
+                return
+
+            version = self._list_version(list_id)
+            try:
+                tasks = self._query_list_tasks(list_id)
+            except Exception as e:
+                print(f"⚠️ Prefetch of list {list_id} failed: {e}")
+                continue
+
+            if self._cache_list_tasks(list_id, tasks, version):
+                self.rows.rows_for(tasks)
+                with self._cache_lock:
+                    self._stats['prefetched'] += 1
+
+    def shutdown(self):
+        """Stop background prefetching and archiving; finish pending rebalances"""
+        with self._cache_lock:
+            self._prefetch_generation += 1
+            self._stopping = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_list_rows(self, list_id: int, force_refresh: bool = False) -> List[TaskRow]:
+        """
+        Display rows for a list (parents followed by their subtasks).
+        Rows of unchanged tasks are reused from the row cache.
+        """
+        return self.rows.rows_for(self.get_list_tasks(list_id, show_completed=True, use_cache=True,
+                                                      force_refresh=force_refresh))
+
     def create_task(
             self,
             list_id: int,
@@ -166,8 +273,10 @@ class TaskService:
                 # Invalidate cache
                 self._invalidate_list_cache(list_id)
 
-                # Dispatch event
+                # Dispatch events
                 self.events.dispatch('on_task_created', task_id, list_id)
+                self.events.emit_change('task', task_id, ChangeEvent.CREATE, list_id,
+                                        after={'list_id': list_id, 'title': title.strip(), **kwargs})
 
                 print(f"✅ Task created: {task_id}")
 
@@ -193,6 +302,14 @@ class TaskService:
         if not task:
             raise ValueError(f"Task {task_id} not found")
 
+        # A list change moves the subtasks too
+        fields = dict(fields)
+        target_list_id = fields.pop('list_id', None)
+        if target_list_id is not None and target_list_id != task.list_id:
+            self.move_tasks([task_id], target_list_id)
+        if not fields:
+            return True
+
         # Validate fields
         if 'title' in fields:
             title = fields['title']
@@ -209,8 +326,11 @@ class TaskService:
             self._invalidate_task_cache(task_id)
             self._invalidate_list_cache(task.list_id)
 
-            # Dispatch event
+            # Dispatch events
             self.events.dispatch('on_task_updated', task_id, fields)
+            self.events.emit_change('task', task_id, ChangeEvent.UPDATE, task.list_id,
+                                    before={name: getattr(task, name, None) for name in fields},
+                                    after=dict(fields))
 
             return True
 
@@ -241,8 +361,10 @@ class TaskService:
             self._invalidate_task_cache(task_id)
             self._invalidate_list_cache(task.list_id)
 
-            # Dispatch event
+            # Dispatch events
             self.events.dispatch('on_task_deleted', task_id, task.list_id)
+            self.events.emit_change('task', task_id, ChangeEvent.DELETE, task.list_id,
+                                    before=task.to_dict())
 
             return True
 
@@ -272,8 +394,11 @@ class TaskService:
             self._invalidate_task_cache(task_id)
             self._invalidate_list_cache(task.list_id)
 
-            # Dispatch event
+            # Dispatch events
             self.events.dispatch('on_task_completed', task_id, new_status)
+            self.events.emit_change('task', task_id, ChangeEvent.UPDATE, task.list_id,
+                                    before={'completed': task.completed},
+                                    after={'completed': new_status})
 
             return new_status
 
@@ -302,6 +427,83 @@ class TaskService:
             print(f"❌ Error searching tasks: {e}")
             return []
 
+    # ===== ORDERING =====
+
+    def move_task(self, task_id: int, before_id: Optional[int] = None,
+                  after_id: Optional[int] = None) -> bool:
+        """
+        Move a task directly before `before_id` or after `after_id` (a sibling),
+        or to the end of its siblings. Only the moved row is written.
+
+        Returns:
+            True if the task moved
+        """
+        return self.move_many([task_id], before_id=before_id, after_id=after_id) > 0
+
+    def move_many(self, task_ids: List[int], before_id: Optional[int] = None,
+                  after_id: Optional[int] = None) -> int:
+        """
+        Move several sibling tasks, keeping the given order, into one slot
+        (before `before_id`, after `after_id`, or at the end) with a single
+        batched write.
+
+        Returns:
+            Number of tasks moved
+        """
+        try:
+            result = self.db.reorder_tasks(task_ids, before_id=before_id, after_id=after_id)
+        except Exception as e:
+            print(f"❌ Error moving tasks {task_ids}: {e}")
+            raise
+
+        if not result:
+            return 0
+
+        list_id = result['list_id']
+        positions = result['positions']
+
+        for task_id in positions:
+            self._invalidate_task_cache(task_id)
+        self._invalidate_list_cache(list_id)
+
+        with self.events.batch():
+            for task_id, (old_position, new_position) in positions.items():
+                self.events.dispatch('on_task_updated', task_id, {'position': new_position})
+                self.events.emit_change('task', task_id, ChangeEvent.UPDATE, list_id,
+                                        before={'position': old_position},
+                                        after={'position': new_position})
+
+        if result['crowded']:
+            self._schedule_rebalance(list_id, result['parent_id'])
+
+        return len(positions)
+
+    def _schedule_rebalance(self, list_id: int, parent_id: Optional[int]):
+        """Renumber a crowded sibling group on the background worker (once per group)"""
+        group = (list_id, parent_id)
+        with self._cache_lock:
+            if group in self._pending_rebalances:
+                return
+            self._pending_rebalances.add(group)
+
+        self._run_in_background(self._rebalance, group)
+
+    def _rebalance(self, group):
+        list_id, parent_id = group
+        with self._cache_lock:
+            self._pending_rebalances.discard(group)
+
+        try:
+            changed = self.db.rebalance_positions(list_id, parent_id)
+        except Exception as e:
+            print(f"⚠️ Rebalancing positions of list {list_id} failed: {e}")
+            return
+
+        # Order is unchanged, so no events - only cached positions are stale
+        if changed:
+            self._invalidate_list_cache(list_id)
+            print(f"📐 Rebalanced {changed} task positions in list {list_id}")
+
     # ===== BATCH OPERATIONS =====
 
     def batch_update_completion(self, task_ids: List[int], completed: bool) -> int:
@@ -319,16 +521,24 @@ class TaskService:
             return 0
 
         try:
-            updates = [(tid, {'completed': completed}) for tid in task_ids]
-            self.db.batch_update_tasks(updates)
+            # Previous state, for the change events and list invalidation
+            states = self.db.get_task_states(task_ids)
 
-            # Invalidate cache for all affected tasks
-            for task_id in task_ids:
-                self._invalidate_task_cache(task_id)
+            # Set-based UPDATE, chunked, one transaction
+            self.db.set_tasks_completed(task_ids, completed)
 
-            # Dispatch events
-            for task_id in task_ids:
-                self.events.dispatch('on_task_completed', task_id, completed)
+            # Invalidate cache for all affected tasks and their lists at once
+            self._invalidate_tasks(task_ids, {list_id for list_id, _ in states.values()})
+
+            # Dispatch events - one coalesced delivery for the whole batch
+            with self.events.batch():
+                for task_id in task_ids:
+                    self.events.dispatch('on_task_completed', task_id, completed)
+                    if task_id in states:
+                        list_id, was_completed = states[task_id]
+                        self.events.emit_change('task', task_id, ChangeEvent.UPDATE, list_id,
+                                                before={'completed': was_completed},
+                                                after={'completed': completed})
 
             return len(task_ids)
 
@@ -350,36 +560,154 @@ class TaskService:
             return 0
 
         try:
-            self.db.batch_delete_tasks(task_ids)
+            # State of every deleted row (subtasks included), read in the
+            # deleting transaction, for the change events and list invalidation
+            states = self.db.batch_delete_tasks(task_ids)
 
-            # Invalidate cache
-            for task_id in task_ids:
-                self._invalidate_task_cache(task_id)
+            # Invalidate cache for all deleted tasks and their lists at once
+            self._invalidate_tasks(list(states), {list_id for list_id, _ in states.values()})
 
-            return len(task_ids)
+            # Dispatch events - one coalesced delivery for the whole batch
+            with self.events.batch():
+                for task_id, (list_id, completed) in states.items():
+                    self.events.dispatch('on_task_deleted', task_id, list_id)
+                    self.events.emit_change('task', task_id, ChangeEvent.DELETE, list_id,
+                                            before={'list_id': list_id, 'completed': completed})
+
+            return len(states)
 
         except Exception as e:
             print(f"❌ Error batch deleting tasks: {e}")
             raise
 
+    def move_tasks(self, task_ids: List[int], target_list_id: int,
+                   position: Optional[int] = None) -> int:
+        """
+        Move tasks, with all their subtasks, to another list (or category).
+
+        Args:
+            task_ids: Task IDs, in the order they should appear
+            target_list_id: Destination list ID
+            position: Index among the destination's top-level tasks to insert
+                at (None appends)
+
+        Returns:
+            Number of tasks moved (subtasks that moved along not counted)
+        """
+        if not task_ids:
+            return 0
+
+        try:
+            result = self.db.move_tasks_to_list(task_ids, target_list_id, index=position)
+        except Exception as e:
+            print(f"❌ Error moving tasks to list {target_list_id}: {e}")
+            raise
+
+        if not result:
+            return 0
+
+        sources = result['sources']
+        # Only the lists that lost or gained tasks
+        self._invalidate_tasks(result['task_ids'], set(sources.values()) | {target_list_id})
+
+        with self.events.batch():
+            for task_id, (old_position, new_position) in result['positions'].items():
+                self.events.dispatch('on_task_updated', task_id,
+                                     {'list_id': target_list_id, 'position': new_position})
+                self.events.emit_change('task', task_id, ChangeEvent.UPDATE, sources[task_id],
+                                        before={'list_id': sources[task_id], 'position': old_position},
+                                        after={'list_id': target_list_id, 'position': new_position})
+
+        if result['crowded']:
+            self._schedule_rebalance(target_list_id, None)
+
+        return len(sources)
+
+    # ===== ARCHIVE =====
+
+    def archive_completed(self, category: Optional[str] = None, older_than_days: Optional[int] = None):
+        """
+        Move completed tasks to the archive on the background worker, in
+        chunks; the lists they leave get change events after every chunk.
+
+        Args:
+            category: Only lists of this category (None for all)
+            older_than_days: Only tasks not modified for this many days
+
+        Returns:
+            Future resolving to the archive result dict (None on failure)
+        """
+        return self._run_in_background(self._archive, category, older_than_days)
+
+    def _archive(self, category, older_than_days):
+        try:
+            result = self.db.archive_completed_tasks(
+                category=category,
+                older_than_days=older_than_days,
+                on_chunk=self._on_archived_chunk,
+                should_stop=lambda: self._stopping
+            )
+        except Exception as e:
+            print(f"❌ Error archiving completed tasks: {e}")
+            return None
+
+        if result['archived']:
+            print(f"🗄️ Archived {result['archived']} completed tasks from {len(result['list_ids'])} lists")
+        return result
+
+    def _on_archived_chunk(self, moved: Dict[int, int]):
+        """Worker thread: forget archived tasks and tell listeners they left their lists"""
+        self._invalidate_tasks(list(moved), set(moved.values()))
+        with self._cache_lock:
+            self._stats['archived'] += len(moved)
+
+        with self.events.batch():
+            for task_id, list_id in moved.items():
+                self.events.emit_change('task', task_id, ChangeEvent.DELETE, list_id,
+                                        before={'list_id': list_id})
+
+    def search_archived_tasks(self, query: str = "", limit: int = 50, offset: int = 0) -> List[ArchivedTask]:
+        """Archived tasks matching query (newest first); an empty query lists the archive"""
+        try:
+            self._stats['db_queries'] += 1
+            return self.db.search_archived_tasks(query, limit, offset)
+        except Exception as e:
+            print(f"❌ Error searching archive: {e}")
+            return []
+
     # ===== CACHE MANAGEMENT =====
 
+    def _invalidate_tasks(self, task_ids: List[int], list_ids):
+        """Drop many tasks and lists from the caches under one lock acquisition"""
+        with self._cache_lock:
+            for task_id in task_ids:
+                self._task_cache.pop(task_id, None)
+            for list_id in list_ids:
+                self._list_tasks_cache.pop(list_id, None)
+                self._list_versions[list_id] = self._list_versions.get(list_id, 0) + 1
+        self.rows.invalidate_many(task_ids)
+
     def _invalidate_task_cache(self, task_id: int):
         """Remove task from cache"""
         with self._cache_lock:
             self._task_cache.pop(task_id, None)
+        self.rows.invalidate(task_id)
 
     def _invalidate_list_cache(self, list_id: int):
         """Remove list tasks from cache"""
         with self._cache_lock:
             self._list_tasks_cache.pop(list_id, None)
+            self._list_versions[list_id] = self._list_versions.get(list_id, 0) + 1
 
     def clear_cache(self):
         """Clear all caches"""
         with self._cache_lock:
             self._task_cache.clear()
+            for list_id in self._list_tasks_cache:
+                self._list_versions[list_id] = self._list_versions.get(list_id, 0) + 1
             self._list_tasks_cache.clear()
-            print("🧹 Service cache cleared")
+        self.rows.clear()
+        print("🧹 Service cache cleared")
 
     def get_stats(self) -> Dict[str, Any]:
         """Get service statistics"""
@@ -387,7 +715,8 @@ class TaskService:
             return {
                 **self._stats,
                 'cached_tasks': len(self._task_cache),
-                'cached_lists': len(self._list_tasks_cache)
+                'cached_lists': len(self._list_tasks_cache),
+                'cached_rows': self.rows.get_stats()
             }
 
     def print_stats(self):
@@ -403,8 +732,16 @@ class TaskService:
         print(f"Cache Misses: {stats['cache_misses']}")
         print(f"Hit Rate: {hit_rate:.1f}%")
         print(f"DB Queries: {stats['db_queries']}")
+        print(f"Prefetched Lists: {stats['prefetched']}")
         print(f"Cached Tasks: {stats['cached_tasks']}")
         print(f"Cached Lists: {stats['cached_lists']}")
+        rows = stats['cached_rows']
+        print(f"Cached Rows: {rows['rows']} ({rows['hits']} reused, {rows['misses']} built)")
+
+        # Measured per-statement numbers from the query tracer
+        if self.db.tracer:
+            print("-" * 50)
+            self.db.tracer.print_report(limit=5)
         print("=" * 50 + "\n")
 
 
@@ -480,8 +817,10 @@ class ListService:
                 # Invalidate cache
                 self._invalidate_cache(category)
 
-                # Dispatch event
+                # Dispatch events
                 self.events.dispatch('on_list_created', list_id, category)
+                self.events.emit_change('list', list_id, ChangeEvent.CREATE, list_id,
+                                        after={'name': name.strip(), 'category': category})
 
             return list_id
 
@@ -505,8 +844,10 @@ class ListService:
             # Invalidate cache
             self._invalidate_cache(list_obj.category)
 
-            # Dispatch event
+            # Dispatch events
             self.events.dispatch('on_list_updated', list_id, name)
+            self.events.emit_change('list', list_id, ChangeEvent.UPDATE, list_id,
+                                    before={'name': list_obj.name}, after={'name': name})
 
             return True
 
@@ -527,8 +868,10 @@ class ListService:
             # Invalidate cache
             self._invalidate_cache(list_obj.category)
 
-            # Dispatch event
+            # Dispatch events
             self.events.dispatch('on_list_deleted', list_id, list_obj.category)
+            self.events.emit_change('list', list_id, ChangeEvent.DELETE, list_id,
+                                    before=list_obj.to_dict())
 
             return True
 
@@ -0,0 +1,227 @@
+"""
+Task View Models - precomputed, immutable row records for task lists
+
+Task objects are turned into TaskRow records once per data change: display
+strings, row height and style flags are computed here instead of in every
+widget. Rows are cached by task id and version (modified_at), so reloading
+a list only rebuilds the rows whose task changed and unchanged rows keep
+their identity (cheap to diff).
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from utils.constants import ROW_CACHE_SIZE
+
+RECURRENCE_TEXT = {
+    "today": "🔄 Daily",
+    "week": "🔄 Weekly",
+    "month": "🔄 Monthly",
+    "year": "🔄 Yearly",
+    "custom": "🔄 Custom"
+}
+
+# Row heights in dp (scaled by the widget layer)
+ROW_BASE_HEIGHT = 70
+ROW_LINE_HEIGHT = 20
+
+
+def time_text(start_time, end_time):
+    """Formatted time range, or "" without a start time"""
+    if start_time and end_time:
+        return f"🕐 {start_time} - {end_time}"
+    elif start_time:
+        return f"🕐 Starts at {start_time}"
+    return ""
+
+
+def recurrence_text(recurrence_type):
+    """Formatted recurrence, or "" for one-off tasks"""
+    if not recurrence_type:
+        return ""
+    return RECURRENCE_TEXT.get(recurrence_type, "🔄 Repeating")
+
+
+def motivation_text(motivation):
+    return f"💪 {motivation}" if motivation else ""
+
+
+def row_height(has_schedule, has_motivation):
+    """Row height in dp"""
+    height = ROW_BASE_HEIGHT
+    if has_schedule:
+        height += ROW_LINE_HEIGHT
+    if has_motivation:
+        height += ROW_LINE_HEIGHT
+    return height
+
+
+class TaskRow:
+    """Everything a task row displays; immutable once built"""
+
+    __slots__ = ('task_id', 'list_id', 'parent_id', 'version', 'title', 'time_text',
+                 'recurrence_text', 'motivation_text', 'completed', 'is_subtask', 'height')
+
+    def __init__(self, task_id, list_id, parent_id, version, title, time_text,
+                 recurrence_text, motivation_text, completed, is_subtask, height):
+        self.task_id = task_id
+        self.list_id = list_id
+        self.parent_id = parent_id
+        self.version = version
+        self.title = title
+        self.time_text = time_text
+        self.recurrence_text = recurrence_text
+        self.motivation_text = motivation_text
+        self.completed = completed
+        self.is_subtask = is_subtask
+        self.height = height
+
+    @classmethod
+    def from_task(cls, task, is_subtask=False):
+        # Subtask rows only show title and completion
+        if is_subtask:
+            times = recurrence = motivation = ""
+        else:
+            times = time_text(task.start_time, task.end_time)
+            recurrence = recurrence_text(task.recurrence_type)
+            motivation = motivation_text(task.motivation)
+
+        return cls(
+            task.id, task.list_id, task.parent_id, task.modified_at, task.title,
+            times, recurrence, motivation, bool(task.completed), is_subtask,
+            row_height(bool(times or recurrence), bool(motivation))
+        )
+
+    def replace(self, **changes):
+        """Copy with some fields changed"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return TaskRow(**values)
+
+    def __repr__(self):
+        return f"<TaskRow {self.task_id} v={self.version} {self.title[:20]!r}>"
+
+
+class TaskRowCache:
+    """
+    LRU cache of TaskRow keyed by (task id, is_subtask).
+    A cached row is reused while its version matches the task's modified_at.
+    """
+
+    def __init__(self, max_rows: int = ROW_CACHE_SIZE):
+        self.max_rows = max_rows
+        self._rows: "OrderedDict[tuple, TaskRow]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def row_for(self, task, is_subtask: bool = False) -> TaskRow:
+        key = (task.id, is_subtask)
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None and row.version == task.modified_at:
+                self._rows.move_to_end(key)
+                self.hits += 1
+                return row
+
+        row = TaskRow.from_task(task, is_subtask)
+
+        with self._lock:
+            self.misses += 1
+            self._rows[key] = row
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.max_rows:
+                self._rows.popitem(last=False)
+        return row
+
+    def rows_for(self, tasks) -> List[TaskRow]:
+        """Rows for parent tasks, each followed by its subtasks"""
+        rows = []
+        for task in tasks:
+            rows.append(self.row_for(task))
+            for subtask in task.subtasks:
+                rows.append(self.row_for(subtask, is_subtask=True))
+        return rows
+
+    def invalidate(self, task_id: int):
+        """Drop a task's rows (for changes within the same modified_at second)"""
+        with self._lock:
+            self._rows.pop((task_id, False), None)
+            self._rows.pop((task_id, True), None)
+
+    def invalidate_many(self, task_ids):
+        with self._lock:
+            for task_id in task_ids:
+                self._rows.pop((task_id, False), None)
+                self._rows.pop((task_id, True), None)
+
+    def clear(self):
+        with self._lock:
+            self._rows.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'rows': len(self._rows), 'hits': self.hits, 'misses': self.misses}
+
+
+def find_row(rows: List[TaskRow], task_id: int) -> Optional[int]:
+    """Index of a task's row, or None"""
+    for index, row in enumerate(rows):
+        if row.task_id == task_id:
+            return index
+    return None
+
+
+# ===== LAYOUT HELPERS (drag reordering) =====
+
+def row_offsets(heights, spacing=0):
+    """Top offset of every row from the first row's top, in the units of `heights`"""
+    offsets = []
+    top = 0
+    for height in heights:
+        offsets.append(top)
+        top += height + spacing
+    return offsets
+
+
+def row_at(offsets, y):
+    """Index of the row at distance y below the first row's top (clamped), or None if empty"""
+    if not offsets:
+        return None
+    return max(bisect_right(offsets, y) - 1, 0)
+
+
+def sibling_blocks(rows: List[TaskRow], index: int) -> List[Tuple[int, int]]:
+    """
+    (start, end) ranges of the rows that can trade places with rows[index].
+
+    A top-level task moves together with its subtasks, among the top-level
+    tasks with the same completion state (completed tasks are always listed
+    last). A subtask moves alone, among the subtasks of its parent.
+    """
+    dragged = rows[index]
+    blocks = []
+
+    if dragged.is_subtask:
+        for i, row in enumerate(rows):
+            if row.is_subtask and row.parent_id == dragged.parent_id:
+                blocks.append((i, i + 1))
+        return blocks
+
+    start = None
+    for i, row in enumerate(rows):
+        if row.is_subtask:
+            continue
+        if start is not None:
+            blocks.append((start, i))
+            start = None
+        if row.completed == dragged.completed:
+            start = i
+    if start is not None:
+        end = start + 1
+        while end < len(rows) and rows[end].is_subtask:
+            end += 1
+        blocks.append((start, end))
+    return blocks
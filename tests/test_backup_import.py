@@ -0,0 +1,119 @@
+"""
+Merge-import of backups written before lists and tasks had uuids.
+
+Such a backup only carries local ids, while upgrading the database gives the
+existing rows random uuids; restoring it onto the device it came from must
+still update those rows instead of adding a second copy of everything.
+"""
+
+import json
+import sqlite3
+
+from database.db_manager import DatabaseManager
+from utils.backup_manager import BackupManager
+
+
+def _create_legacy_database(path):
+    """A database as written before the uuid migration, plus its legacy backup"""
+    conn = sqlite3.connect(str(path))
+    conn.executescript('''
+        CREATE TABLE task_lists (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            category TEXT DEFAULT 'daily',
+            position INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            list_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            notes TEXT,
+            due_date DATE,
+            start_time TIME,
+            end_time TIME,
+            reminder_time TIME,
+            completed BOOLEAN DEFAULT 0,
+            parent_id INTEGER,
+            position INTEGER DEFAULT 0,
+            recurrence_type TEXT,
+            recurrence_interval INTEGER DEFAULT 1,
+            last_completed_date DATE,
+            motivation TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO task_lists (id, name, category, position, created_at) VALUES
+            (1, 'My Daily', 'daily', 0, '2025-01-01 08:00:00'),
+            (2, 'Work', 'monthly', 1, '2025-01-02 08:00:00');
+        INSERT INTO tasks (id, list_id, title, completed, parent_id, position, created_at) VALUES
+            (1, 1, 'Groceries', 0, NULL, 1, '2025-01-03 09:00:00'),
+            (2, 1, 'Milk', 1, 1, 1, '2025-01-03 09:01:00'),
+            (3, 1, 'Run', 1, NULL, 2, '2025-01-03 10:00:00'),
+            (4, 2, 'Report', 0, NULL, 1, '2025-01-04 11:00:00');
+    ''')
+    conn.commit()
+    conn.close()
+
+    # The backup format of that version: ids, no uuids, subtasks without dates
+    return {
+        "metadata": {"app_name": "Momentum Track", "version": "1.0",
+                     "backup_date": "2025-01-05T12:00:00", "total_lists": 2, "total_tasks": 3},
+        "lists": [
+            {"id": 1, "name": "My Daily", "category": "daily", "position": 0,
+             "created_at": "2025-01-01 08:00:00", "tasks": [
+                 {"id": 1, "title": "Groceries", "notes": "", "completed": False, "parent_id": None,
+                  "position": 1, "created_at": "2025-01-03 09:00:00",
+                  "subtasks": [{"id": 2, "title": "Milk", "completed": True, "position": 1}]},
+                 {"id": 3, "title": "Run", "notes": "", "completed": True, "parent_id": None,
+                  "position": 2, "created_at": "2025-01-03 10:00:00", "subtasks": []},
+             ]},
+            {"id": 2, "name": "Work", "category": "monthly", "position": 1,
+             "created_at": "2025-01-02 08:00:00", "tasks": [
+                 {"id": 4, "title": "Report", "notes": "", "completed": False, "parent_id": None,
+                  "position": 1, "created_at": "2025-01-04 11:00:00", "subtasks": []},
+             ]},
+        ]
+    }
+
+
+def _counts(db):
+    conn = db.get_connection()
+    try:
+        return conn.execute('''
+            SELECT (SELECT COUNT(*) FROM task_lists),
+                   (SELECT COUNT(*) FROM tasks),
+                   (SELECT COUNT(*) FROM tasks WHERE parent_id IS NOT NULL)
+        ''').fetchone()
+    finally:
+        conn.close()
+
+
+def test_legacy_backup_round_trips_onto_its_source_database(tmp_path):
+    backup = _create_legacy_database(tmp_path / "momentum.db")
+    backup_path = tmp_path / "legacy_backup.json"
+    backup_path.write_text(json.dumps(backup), encoding="utf-8")
+
+    db = DatabaseManager(str(tmp_path / "momentum.db"), trace=False)
+    manager = BackupManager(db, backup_dir=tmp_path / "backups")
+    assert _counts(db) == (2, 4, 1)
+
+    assert manager.import_from_backup(backup_path, mode="merge")
+    assert _counts(db) == (2, 4, 1)
+
+    assert manager.import_from_backup(backup_path, mode="merge")
+    assert _counts(db) == (2, 4, 1)
+
+
+def test_backup_restores_onto_a_fresh_install_without_duplicate_default_lists(tmp_path):
+    source = DatabaseManager(str(tmp_path / "source.db"), trace=False)
+    daily = next(lst for lst in source.get_all_lists() if lst.category == "daily")
+    parent_id = source.create_task(daily.id, "Groceries")
+    source.create_task(daily.id, "Milk", parent_id=parent_id)
+    backup_path = BackupManager(source, backup_dir=tmp_path / "source_backups").create_full_backup()
+
+    target = DatabaseManager(str(tmp_path / "target.db"), trace=False)
+    lists_before = _counts(target)[0]
+
+    manager = BackupManager(target, backup_dir=tmp_path / "target_backups")
+    assert manager.import_from_backup(backup_path, mode="merge")
+    assert _counts(target) == (lists_before, 2, 1)
@@ -5,26 +5,188 @@ Handles export/import of tasks and lists in multiple formats
 
 import json
 import os
+import threading
+import uuid
 from datetime import datetime
 from pathlib import Path
 
 
+BACKUP_PREFIX = "momentum_backup_"
+BACKUP_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+BACKUP_STATE_FILE = "backup_state.json"
+
+# Serializes auto_backup() across threads and BackupManager instances
+_auto_backup_lock = threading.Lock()
+
+
+class BackupRetentionPolicy:
+    """
+    Grandfather-father-son retention for full backups.
+
+    Keeps the newest `keep_last` backups plus the newest backup in each of the
+    last `hourly` hours, `daily` days and `weekly` ISO weeks that have one.
+    """
+
+    def __init__(self, keep_last=5, hourly=24, daily=7, weekly=4):
+        self.keep_last = keep_last
+        self.hourly = hourly
+        self.daily = daily
+        self.weekly = weekly
+
+    def select_keep(self, backups):
+        """
+        Args:
+            backups: List of (path, datetime) tuples
+
+        Returns:
+            Set of paths to keep
+        """
+        ordered = sorted(backups, key=lambda b: b[1], reverse=True)
+        keep = {path for path, _ in ordered[:self.keep_last]}
+
+        buckets = (
+            (self.hourly, lambda t: (t.year, t.month, t.day, t.hour)),
+            (self.daily, lambda t: t.date()),
+            (self.weekly, lambda t: t.isocalendar()[:2]),
+        )
+
+        for limit, bucket_of in buckets:
+            seen = set()
+            for path, taken_at in ordered:
+                if len(seen) >= limit:
+                    break
+                bucket = bucket_of(taken_at)
+                if bucket not in seen:
+                    seen.add(bucket)
+                    keep.add(path)
+
+        return keep
+
+
 class BackupManager:
     """Manage backups and exports of tasks and lists"""
 
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, retention_policy=None, backup_dir="backups"):
         self.db = db_manager
-        self.backup_dir = Path("backups")
-        self.backup_dir.mkdir(exist_ok=True)
+        self.backup_dir = Path(backup_dir)
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.retention_policy = retention_policy or BackupRetentionPolicy()
+
+    # ===== ATOMIC WRITES =====
+
+    def _atomic_write_json(self, filepath, data, indent=2):
+        """
+        Write JSON crash-safely: temp file in the same directory, fsync, then
+        atomic rename. Readers only ever see the old file or the complete new one.
+        """
+        import tempfile
+
+        filepath = Path(filepath)
+        fd, tmp_path = tempfile.mkstemp(dir=str(filepath.parent), prefix=f".{filepath.name}.",
+                                        suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=indent, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        # Persist the rename itself (not supported on Windows)
+        try:
+            dir_fd = os.open(str(filepath.parent), os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except (OSError, AttributeError):
+            pass
+
+    def verify_backup(self, filepath):
+        """
+        Check that a backup can be restored: it parses completely, matches its
+        own metadata, and merge-import would take every list and task, with
+        unique uuids and every task's list and parent present in the file.
+        """
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            metadata = data["metadata"]
+            lists = data["lists"]
+            tasks = [task for lst in lists for task in lst.get("tasks", [])]
+            subtasks = sum(len(task.get("subtasks", [])) for task in tasks)
+            if metadata["total_lists"] != len(lists) or metadata["total_tasks"] != len(tasks):
+                return False
+            list_rows, task_rows = self._backup_rows(data)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return False
+
+        # Entries the import would skip (no name or title, unknown category,
+        # a parent_id outside a subtask list) would be lost on restore
+        if len(list_rows) != len(lists) or len(task_rows) != len(tasks) + subtasks:
+            return False
+
+        # Duplicate uuids would collapse into one row on import
+        list_uuids = {row["uuid"] for row in list_rows}
+        task_uuids = {row["uuid"] for row in task_rows}
+        if len(list_uuids) != len(list_rows) or len(task_uuids) != len(task_rows):
+            return False
+
+        return all(row["list_uuid"] in list_uuids and
+                   (row["parent_uuid"] is None or row["parent_uuid"] in task_uuids)
+                   for row in task_rows)
+
+    def _load_state(self):
+        try:
+            with open(self.backup_dir / BACKUP_STATE_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _mark_verified(self, filepath):
+        """Remember the newest backup that passed verification"""
+        state = self._load_state()
+        state["last_verified"] = Path(filepath).name
+        state["verified_at"] = datetime.now().isoformat()
+        self._atomic_write_json(self.backup_dir / BACKUP_STATE_FILE, state)
+
+    def _last_verified_backup(self, backups):
+        """Name of the last verified backup, verifying newest-first if unknown"""
+        name = self._load_state().get("last_verified")
+        if name and (self.backup_dir / name).exists():
+            return name
+
+        for path, _ in sorted(backups, key=lambda b: b[1], reverse=True):
+            if self.verify_backup(path):
+                self._mark_verified(path)
+                return path.name
+        return None
+
+    # ===== FULL BACKUPS =====
+
+    def _backup_filepath(self):
+        """New backup path; never reuses an existing name"""
+        timestamp = datetime.now().strftime(BACKUP_TIMESTAMP_FORMAT)
+        filepath = self.backup_dir / f"{BACKUP_PREFIX}{timestamp}.json"
+        suffix = 1
+        while filepath.exists():
+            filepath = self.backup_dir / f"{BACKUP_PREFIX}{timestamp}_{suffix}.json"
+            suffix += 1
+        return filepath
 
     def create_full_backup(self):
-        """Create a complete backup of all data"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"momentum_backup_{timestamp}.json"
-        filepath = self.backup_dir / filename
+        """Create a complete backup of all data (atomic, verified)"""
+        from utils.export_pipeline import ExportRow
+
+        filepath = self._backup_filepath()
 
         try:
-            # Get all data
+            # Two queries: the lists, then every task in one ordered scan
             all_lists = self.db.get_all_lists()
 
             backup_data = {
@@ -38,64 +200,72 @@ class BackupManager:
                 "lists": []
             }
 
-            total_tasks = 0
-
+            lists_by_id = {}
             for task_list in all_lists:
-                # Get tasks for this list
-                tasks = self.db.get_tasks_by_list(task_list.id, show_completed=True)
-                total_tasks += len(tasks)
-
                 list_data = {
                     "id": task_list.id,
+                    "uuid": task_list.uuid,
                     "name": task_list.name,
                     "category": task_list.category,
                     "position": task_list.position,
-                    "created_at": task_list.created_at.isoformat() if hasattr(task_list.created_at,
-                                                                              'isoformat') else str(
-                        task_list.created_at),
+                    "created_at": self._timestamp_str(task_list.created_at),
+                    "modified_at": self._timestamp_str(task_list.modified_at),
                     "tasks": []
                 }
+                lists_by_id[task_list.id] = list_data
+                backup_data["lists"].append(list_data)
 
-                for task in tasks:
+            total_tasks = 0
+            task_data = None
+
+            for raw in self.db.iter_export_rows():
+                row = ExportRow._make(raw)
+                list_data = lists_by_id.get(row.list_id)
+                if row.task_id is None or list_data is None:
+                    continue
+
+                if row.parent_id is None:
                     task_data = {
-                        "id": task.id,
-                        "title": task.title,
-                        "notes": task.notes,
-                        "due_date": task.due_date,
-                        "start_time": task.start_time,
-                        "end_time": task.end_time,
-                        "reminder_time": task.reminder_time,
-                        "motivation": task.motivation,
-                        "completed": task.completed,
-                        "parent_id": task.parent_id,
-                        "position": task.position,
-                        "recurrence_type": task.recurrence_type,
-                        "recurrence_interval": task.recurrence_interval,
-                        "last_completed_date": task.last_completed_date,
-                        "created_at": task.created_at.isoformat() if hasattr(task.created_at, 'isoformat') else str(
-                            task.created_at),
+                        "id": row.task_id,
+                        "uuid": row.uuid,
+                        "title": row.title,
+                        "notes": row.notes or "",
+                        "due_date": row.due_date,
+                        "start_time": row.start_time,
+                        "end_time": row.end_time,
+                        "reminder_time": row.reminder_time,
+                        "motivation": row.motivation or "",
+                        "completed": bool(row.completed),
+                        "parent_id": None,
+                        "position": row.position,
+                        "recurrence_type": row.recurrence_type,
+                        "recurrence_interval": row.recurrence_interval,
+                        "last_completed_date": row.last_completed_date,
+                        "created_at": self._timestamp_str(row.created_at),
+                        "modified_at": self._timestamp_str(row.modified_at),
                         "subtasks": []
                     }
-
-                    # Add subtasks
-                    for subtask in task.subtasks:
-                        subtask_data = {
-                            "id": subtask.id,
-                            "title": subtask.title,
-                            "completed": subtask.completed,
-                            "position": subtask.position
-                        }
-                        task_data["subtasks"].append(subtask_data)
-
                     list_data["tasks"].append(task_data)
-
-                backup_data["lists"].append(list_data)
+                    total_tasks += 1
+                elif task_data is not None:
+                    task_data["subtasks"].append({
+                        "id": row.task_id,
+                        "uuid": row.uuid,
+                        "title": row.title,
+                        "completed": bool(row.completed),
+                        "position": row.position,
+                        "created_at": self._timestamp_str(row.created_at),
+                        "modified_at": self._timestamp_str(row.modified_at)
+                    })
 
             backup_data["metadata"]["total_tasks"] = total_tasks
 
-            # Write to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2, ensure_ascii=False)
+            self._atomic_write_json(filepath, backup_data)
+
+            if self.verify_backup(filepath):
+                self._mark_verified(filepath)
+            else:
+                print(f"⚠️ Backup written but failed verification: {filepath}")
 
             print(f"✅ Full backup created: {filepath}")
             return str(filepath)
@@ -148,8 +318,7 @@ class BackupManager:
                 }
                 export_data["tasks"].append(task_data)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            self._atomic_write_json(filepath, export_data)
 
             print(f"✅ List exported: {filepath}")
             return str(filepath)
@@ -198,8 +367,7 @@ class BackupManager:
 
                 export_data["lists"].append(list_data)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            self._atomic_write_json(filepath, export_data)
 
             print(f"✅ Category exported: {filepath}")
             return str(filepath)
@@ -208,92 +376,205 @@ class BackupManager:
             print(f"❌ Export failed: {e}")
             return None
 
-    def export_to_markdown(self, list_id=None):
-        """Export tasks to readable Markdown format"""
+    def export(self, fmt, list_id=None, category=None, filename=None):
+        """
+        Export tasks with a single ordered query streamed into a formatter.
+
+        Args:
+            fmt: Formatter name ("markdown", "csv", "jsonl", "ics")
+            list_id: Export only this list (optional)
+            category: Export only this category (optional)
+            filename: Override the generated file name (optional)
+
+        Returns:
+            Path of the written file, or None on failure
+        """
+        from utils.export_pipeline import get_formatter, write_export
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
         try:
-            if list_id:
-                # Export single list
-                task_list = self.db.get_list_by_id(list_id)
-                if not task_list:
-                    return None
-
-                safe_name = "".join(c for c in task_list.name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                filename = f"{safe_name}_{timestamp}.md"
-                lists_to_export = [(task_list, self.db.get_tasks_by_list(list_id, show_completed=True))]
-            else:
-                # Export all
-                filename = f"all_tasks_{timestamp}.md"
-                all_lists = self.db.get_all_lists()
-                lists_to_export = [(lst, self.db.get_tasks_by_list(lst.id, show_completed=True)) for lst in all_lists]
+            formatter_cls = get_formatter(fmt)
+
+            if filename is None:
+                list_name = None
+                if list_id:
+                    task_list = self.db.get_list_by_id(list_id)
+                    if not task_list:
+                        print(f"❌ List {list_id} not found")
+                        return None
+                    list_name = task_list.name
+                filename = self._export_filename(formatter_cls, timestamp, list_name=list_name,
+                                                 category=category)
 
             filepath = self.backup_dir / filename
+            rows = self.db.iter_export_rows(list_id=list_id, category=category)
+            count = write_export(rows, formatter_cls, filepath)
 
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"# Momentum Track Export\n\n")
-                f.write(f"**Exported on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-                f.write("---\n\n")
+            print(f"✅ {fmt} exported ({count} tasks): {filepath}")
+            return str(filepath)
 
-                for task_list, tasks in lists_to_export:
-                    f.write(f"## {task_list.name}\n\n")
-                    f.write(f"*Category:* {task_list.category.title()}\n\n")
+        except Exception as e:
+            print(f"❌ {fmt} export failed: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
 
-                    if not tasks:
-                        f.write("*No tasks*\n\n")
-                        continue
+    @staticmethod
+    def _export_filename(formatter_cls, timestamp, list_name=None, category=None):
+        """Build the export file name for a list, a category or everything"""
+        if list_name:
+            stem = "".join(c for c in list_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        elif category:
+            stem = f"category_{category}"
+        else:
+            stem = "all_tasks"
+        return f"{stem}_{timestamp}.{formatter_cls.extension}"
+
+    def export_many(self, formats=("markdown", "csv"), jobs=None, max_workers=None, prefer="process"):
+        """
+        Export several targets in parallel from one consistent snapshot.
+
+        The database is copied once with SQLite's online backup API; every
+        worker then opens its own read-only connection to that snapshot, so all
+        files reflect the same point in time while the app keeps writing.
+
+        Args:
+            formats: Formats to produce when jobs is None
+            jobs: Explicit list of dicts with format and optional list_id /
+                  category. Default: every category and every list in each format
+            max_workers: Pool size (default: number of CPUs)
+            prefer: "process" (default; desktop Linux, and only from a
+                    single-threaded caller such as a CLI) or "thread"
+
+        Returns:
+            Manifest dict with the produced files, or None on failure
+        """
+        import shutil
+        import sqlite3
+        import tempfile
+        import time
+        from database.models import TaskCategory
+        from utils.export_pipeline import get_formatter, run_export_job
+        from utils.executors import create_pool
 
-                    # Completed tasks
-                    completed = [t for t in tasks if t.completed]
-                    pending = [t for t in tasks if not t.completed]
-
-                    if pending:
-                        f.write("### 📝 Pending Tasks\n\n")
-                        for task in pending:
-                            f.write(f"- [ ] **{task.title}**\n")
-                            if task.notes:
-                                f.write(f"  - *Notes:* {task.notes}\n")
-                            if task.start_time:
-                                time_info = f"  - ⏰ {task.start_time}"
-                                if task.end_time:
-                                    time_info += f" - {task.end_time}"
-                                f.write(f"{time_info}\n")
-                            if task.motivation:
-                                f.write(f"  - 💪 *\"{task.motivation}\"*\n")
-                            if task.subtasks:
-                                f.write(f"  - **Subtasks:**\n")
-                                for st in task.subtasks:
-                                    status = "x" if st.completed else " "
-                                    f.write(f"    - [{status}] {st.title}\n")
-                            f.write("\n")
-
-                    if completed:
-                        f.write("### ✅ Completed Tasks\n\n")
-                        for task in completed:
-                            f.write(f"- [x] ~~{task.title}~~\n")
-                            if task.subtasks:
-                                for st in task.subtasks:
-                                    status = "x" if st.completed else " "
-                                    f.write(f"  - [{status}] {st.title}\n")
-                            f.write("\n")
-
-                    f.write("\n---\n\n")
-
-            print(f"✅ Markdown exported: {filepath}")
-            return str(filepath)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_dir = self.backup_dir / f"export_{timestamp}"
+        start = time.perf_counter()
+
+        try:
+            lists = self.db.get_all_lists()
+
+            if jobs is None:
+                jobs = []
+                for fmt in formats:
+                    jobs.append({"format": fmt})
+                    for cat in TaskCategory.get_all():
+                        jobs.append({"format": fmt, "category": cat['id']})
+                    for task_list in lists:
+                        jobs.append({"format": fmt, "list_id": task_list.id})
+
+            names = {task_list.id: task_list.name for task_list in lists}
+            used = set()
+            for job in jobs:
+                if 'filename' not in job:
+                    job['filename'] = self._export_filename(
+                        get_formatter(job['format']), timestamp,
+                        list_name=names.get(job.get('list_id')), category=job.get('category'))
+                    if job['filename'] in used:
+                        # Two lists with the same name
+                        job['filename'] = f"{job['list_id']}_{job['filename']}"
+                used.add(job['filename'])
+
+            workers = max(1, min(len(jobs), max_workers or os.cpu_count() or 2))
+
+            output_dir.mkdir(parents=True, exist_ok=True)
+            snapshot_dir = tempfile.mkdtemp(prefix="momentum_snapshot_")
+            snapshot_path = os.path.join(snapshot_dir, "snapshot.db")
+
+            try:
+                # One consistent copy of the database for all workers
+                source = self.db.get_connection()
+                target = sqlite3.connect(snapshot_path)
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                    source.close()
+                snapshot_at = datetime.now().isoformat()
+
+                executor, kind = create_pool(max_workers=workers, prefer=prefer)
+                files = []
+                errors = []
+                with executor:
+                    futures = [executor.submit(run_export_job, snapshot_path, str(output_dir), job)
+                               for job in jobs]
+                    for job, future in zip(jobs, futures):
+                        try:
+                            files.append(future.result())
+                        except Exception as e:
+                            errors.append({"job": job, "error": str(e)})
+            finally:
+                shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+            manifest = {
+                "snapshot_at": snapshot_at,
+                "output_dir": str(output_dir),
+                "executor": kind,
+                "workers": workers,
+                "seconds": round(time.perf_counter() - start, 4),
+                "files": files,
+                "errors": errors
+            }
+
+            print(f"✅ Exported {len(files)} files with {workers} {kind} workers "
+                  f"in {manifest['seconds']:.2f}s: {output_dir}")
+            if errors:
+                print(f"⚠️ {len(errors)} export jobs failed")
+            return manifest
 
         except Exception as e:
-            print(f"❌ Markdown export failed: {e}")
+            print(f"❌ Parallel export failed: {e}")
             import traceback
             traceback.print_exc()
             return None
 
-    def import_from_backup(self, filepath):
-        """Import data from a backup file"""
+    def export_to_markdown(self, list_id=None):
+        """Export tasks to readable Markdown format"""
+        return self.export("markdown", list_id=list_id)
+
+    def export_to_jsonl(self, list_id=None, category=None):
+        """Export tasks to JSON Lines (one task per line)"""
+        return self.export("jsonl", list_id=list_id, category=category)
+
+    def export_to_ical(self, list_id=None, category=None):
+        """Export tasks as iCalendar VTODO entries"""
+        return self.export("ics", list_id=list_id, category=category)
+
+    @staticmethod
+    def _timestamp_str(value):
+        """Serialize a timestamp that may be a datetime or a DB string"""
+        if value is None:
+            return None
+        return value.isoformat() if hasattr(value, 'isoformat') else str(value)
+
+    def import_from_backup(self, filepath, mode="merge"):
+        """
+        Import data from a backup file
+
+        Args:
+            filepath: Path to a full backup JSON file
+            mode: "merge" upserts lists and tasks by uuid (last-writer-wins on
+                  modified_at), so importing the same backup twice is a no-op.
+                  "append" creates fresh copies of everything.
+        """
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 backup_data = json.load(f)
 
+            if mode == "merge":
+                return self._merge_import(backup_data)
+
             imported_lists = 0
             imported_tasks = 0
 
@@ -342,17 +623,162 @@ class BackupManager:
             traceback.print_exc()
             return False
 
+    def _merge_import(self, backup_data):
+        """Stage backup rows and upsert them by uuid in one transaction"""
+        list_rows, task_rows = self._backup_rows(backup_data)
+        list_changes, task_changes = self.db.merge_import(list_rows, task_rows)
+        print(f"✅ Merge import complete: {len(list_rows)} lists, {len(task_rows)} tasks "
+              f"({list_changes + task_changes} rows changed)")
+        return True
+
+    def _backup_rows(self, backup_data):
+        """Lists and tasks of a backup as merge_import() rows; entries it cannot restore are skipped"""
+        from database.models import TaskCategory
+
+        backup_date = backup_data.get("metadata", {}).get("backup_date", "")
+
+        def stable_uuid(item, kind, list_name):
+            # Backups written before uuids existed only carry local ids. Derive a
+            # deterministic uuid from the backup itself so re-importing the same
+            # legacy file is still idempotent; hand-written entries without an id
+            # fall back to their content.
+            if item.get("uuid"):
+                return item["uuid"]
+            if item.get("id") is None:
+                title = item.get("title") if kind == "task" else ""
+                return uuid.uuid5(uuid.NAMESPACE_URL,
+                                  f"momentum-track:{kind}:{list_name}:{title}:{item.get('created_at')}").hex
+            return uuid.uuid5(uuid.NAMESPACE_URL,
+                              f"momentum-track:{backup_date}:{kind}:{item['id']}").hex
+
+        list_rows = []
+        task_rows = []
+
+        for list_data in backup_data.get("lists", []):
+            if not TaskCategory.is_valid(list_data.get("category")) or not list_data.get("name"):
+                continue
+
+            list_uuid = stable_uuid(list_data, "list", list_data["name"])
+            list_rows.append({
+                "uuid": list_uuid,
+                "name": list_data["name"].strip(),
+                "category": list_data["category"],
+                "position": list_data.get("position", 0),
+                "created_at": list_data.get("created_at"),
+                "modified_at": list_data.get("modified_at")
+            })
+
+            for task_data in list_data.get("tasks", []):
+                if task_data.get("parent_id") is not None or not task_data.get("title"):
+                    continue
+
+                task_uuid = stable_uuid(task_data, "task", list_data["name"])
+                task_rows.append({
+                    "uuid": task_uuid,
+                    "list_uuid": list_uuid,
+                    "parent_uuid": None,
+                    "title": task_data["title"].strip(),
+                    "notes": task_data.get("notes", ""),
+                    "due_date": task_data.get("due_date"),
+                    "start_time": task_data.get("start_time"),
+                    "end_time": task_data.get("end_time"),
+                    "reminder_time": task_data.get("reminder_time"),
+                    "completed": bool(task_data.get("completed", False)),
+                    "position": task_data.get("position", 0),
+                    "recurrence_type": task_data.get("recurrence_type"),
+                    "recurrence_interval": task_data.get("recurrence_interval", 1),
+                    "last_completed_date": task_data.get("last_completed_date"),
+                    "motivation": task_data.get("motivation", ""),
+                    "created_at": task_data.get("created_at"),
+                    "modified_at": task_data.get("modified_at")
+                })
+
+                for subtask_data in task_data.get("subtasks", []):
+                    if not subtask_data.get("title"):
+                        continue
+                    task_rows.append({
+                        "uuid": stable_uuid(subtask_data, "task", list_data["name"]),
+                        "list_uuid": list_uuid,
+                        "parent_uuid": task_uuid,
+                        "title": subtask_data["title"].strip(),
+                        "notes": "",
+                        "due_date": None,
+                        "start_time": None,
+                        "end_time": None,
+                        "reminder_time": None,
+                        "completed": bool(subtask_data.get("completed", False)),
+                        "position": subtask_data.get("position", 0),
+                        "recurrence_type": None,
+                        "recurrence_interval": 1,
+                        "last_completed_date": None,
+                        "motivation": "",
+                        "created_at": subtask_data.get("created_at"),
+                        "modified_at": subtask_data.get("modified_at")
+                    })
+
+        return list_rows, task_rows
+
+    def _list_full_backups(self):
+        """All full backups as (path, taken_at), timestamp parsed from the name"""
+        backups = []
+        for path in self.backup_dir.glob(f"{BACKUP_PREFIX}*.json"):
+            stamp = path.stem[len(BACKUP_PREFIX):len(BACKUP_PREFIX) + 15]
+            try:
+                taken_at = datetime.strptime(stamp, BACKUP_TIMESTAMP_FORMAT)
+            except ValueError:
+                taken_at = datetime.fromtimestamp(path.stat().st_mtime)
+            backups.append((path, taken_at))
+        return backups
+
+    def rotate_backups(self):
+        """
+        Delete backups not selected by the retention policy.
+
+        The last verified backup is always kept, and leftover temp files
+        from interrupted writes are removed.
+        """
+        backups = self._list_full_backups()
+        keep = self.retention_policy.select_keep(backups)
+
+        protected = self._last_verified_backup(backups)
+
+        deleted = 0
+        for path, _ in backups:
+            if path in keep or path.name == protected:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                # Already removed by another rotation
+                continue
+            deleted += 1
+            print(f"🗑️ Deleted old backup: {path.name}")
+
+        stale_before = datetime.now().timestamp() - 3600
+        for tmp in self.backup_dir.glob(".*.tmp"):
+            try:
+                if tmp.stat().st_mtime < stale_before:
+                    tmp.unlink()
+            except OSError:
+                pass
+
+        return deleted
+
     def auto_backup(self):
-        """Create automatic backup (keep last 5)"""
+        """
+        Create automatic backup and rotate old ones by retention policy.
+
+        The startup, weekly and exit backups can overlap (the startup one runs
+        on a background thread); they run one at a time so two rotations never
+        work on the same files.
+        """
         try:
-            backup_file = self.create_full_backup()
+            with _auto_backup_lock:
+                backup_file = self.create_full_backup()
 
-            # Clean old backups (keep last 5)
-            backups = sorted(self.backup_dir.glob("momentum_backup_*.json"))
-            if len(backups) > 5:
-                for old_backup in backups[:-5]:
-                    old_backup.unlink()
-                    print(f"🗑️ Deleted old backup: {old_backup.name}")
+                # Never rotate after a failed backup
+                if backup_file:
+                    self.rotate_backups()
 
             return backup_file
 
@@ -365,6 +791,8 @@ class BackupManager:
         try:
             backups = []
             for backup_file in self.backup_dir.glob("*.json"):
+                if backup_file.name == BACKUP_STATE_FILE:
+                    continue
                 stat = backup_file.stat()
                 backups.append({
                     "filename": backup_file.name,
@@ -380,50 +808,6 @@ class BackupManager:
             return []
 
     def export_to_csv(self, list_id=None):
-        """Export tasks to CSV format"""
+        """Export tasks (including subtasks) to CSV format"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"tasks_export_{timestamp}.csv"
-        filepath = self.backup_dir / filename
-
-        try:
-            import csv
-
-            if list_id:
-                lists_to_export = [self.db.get_list_by_id(list_id)]
-            else:
-                lists_to_export = self.db.get_all_lists()
-
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    "List Name", "Category", "Task Title", "Notes",
-                    "Start Time", "End Time", "Reminder", "Motivation",
-                    "Completed", "Recurrence", "Created"
-                ])
-
-                for task_list in lists_to_export:
-                    if not task_list:
-                        continue
-                    tasks = self.db.get_tasks_by_list(task_list.id, show_completed=True)
-
-                    for task in tasks:
-                        writer.writerow([
-                            task_list.name,
-                            task_list.category,
-                            task.title,
-                            task.notes or "",
-                            task.start_time or "",
-                            task.end_time or "",
-                            task.reminder_time or "",
-                            task.motivation or "",
-                            "Yes" if task.completed else "No",
-                            task.recurrence_type or "None",
-                            task.created_at if hasattr(task, 'created_at') else ""
-                        ])
-
-            print(f"✅ CSV exported: {filepath}")
-            return str(filepath)
-
-        except Exception as e:
-            print(f"❌ CSV export failed: {e}")
-            return None
\ No newline at end of file
+        return self.export("csv", list_id=list_id, filename=f"tasks_export_{timestamp}.csv")
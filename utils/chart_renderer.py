@@ -0,0 +1,236 @@
+"""
+Chart Renderer - matplotlib charts rendered off the UI thread
+
+Importing matplotlib costs hundreds of milliseconds, so the UI thread never
+does it: render_chart() runs in a worker and returns raw RGBA pixels. Inside
+the app that worker is a thread, since forking the multithreaded app is not
+safe (see utils.executors.can_use_processes); a process is only used when
+the renderer is driven from a single-threaded script. The UI
+side turns them into Kivy textures and caches them by
+(chart, data version, theme, size), so a chart is only re-rendered when the
+completion totals change, the theme flips or the widget is resized.
+
+    renderer = get_chart_renderer()
+    renderer.request('heatmap', data, version, "Dark", (w, h), on_texture)
+"""
+
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+
+from utils.constants import CHART_CACHE_SIZE, CHART_DPI, CHART_SIZE_STEP
+
+# chart colors per theme: (background, text, grid/empty cell)
+CHART_THEMES = {
+    "Dark": ("#1f1f1f", "#ffffff", "#333333"),
+    "Light": ("#ffffff", "#000000", "#e6e6e6"),
+}
+ACCENT = "#1a73e8"
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+# ===== WORKER SIDE (runs in the pool; imports matplotlib) =====
+
+def _heatmap(fig, data, colors):
+    """Weeks as columns, weekdays as rows; data['days'] is [(day, count)] oldest first"""
+    from matplotlib.colors import LinearSegmentedColormap
+
+    background, text, empty = colors
+    days = data['days']
+    if not days:
+        return
+
+    first = date.fromisoformat(days[0][0])
+    weeks = (first.weekday() + len(days) + 6) // 7
+    grid = [[0] * weeks for _ in range(7)]
+    for offset, (_day, count) in enumerate(days):
+        slot = first.weekday() + offset
+        grid[slot % 7][slot // 7] = count
+
+    ax = fig.add_subplot(111)
+    cmap = LinearSegmentedColormap.from_list("momentum", [empty, ACCENT])
+    ax.imshow(grid, cmap=cmap, aspect='auto', vmin=0, vmax=max(1, max(c for _, c in days)))
+    ax.set_yticks(range(7))
+    ax.set_yticklabels(WEEKDAYS, color=text, fontsize=8)
+    ax.set_xticks([])
+    ax.set_title("Completions per day", color=text, fontsize=10)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+
+
+def _trends(fig, data, colors):
+    """One line per category; data['categories'] is {category: [count per day]}"""
+    background, text, grid = colors
+    ax = fig.add_subplot(111)
+    ax.set_facecolor(background)
+
+    for category, counts in sorted(data['categories'].items()):
+        ax.plot(range(len(counts)), counts, label=data.get('names', {}).get(category, category), linewidth=1.5)
+
+    ax.set_title("Completions by category", color=text, fontsize=10)
+    ax.tick_params(colors=text, labelsize=8)
+    ax.grid(color=grid, linewidth=0.5)
+    for spine in ax.spines.values():
+        spine.set_color(grid)
+    if data['categories']:
+        ax.legend(fontsize=8, facecolor=background, edgecolor=grid, labelcolor=text)
+
+
+CHARTS = {
+    'heatmap': _heatmap,
+    'trends': _trends,
+}
+
+
+def render_chart(kind, data, theme_style, size, dpi=CHART_DPI):
+    """
+    Render one chart with the Agg backend.
+
+    Returns:
+        Tuple of (width, height, rgba bytes), rows top to bottom
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    colors = CHART_THEMES.get(theme_style, CHART_THEMES["Dark"])
+    width, height = size
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi, facecolor=colors[0])
+    canvas = FigureCanvasAgg(fig)
+    CHARTS[kind](fig, data, colors)
+    fig.tight_layout()
+    canvas.draw()
+
+    pixel_width, pixel_height = canvas.get_width_height()
+    return pixel_width, pixel_height, bytes(canvas.buffer_rgba())
+
+
+# ===== UI SIDE =====
+
+def chart_size(width, height):
+    """Pixel size rounded to CHART_SIZE_STEP so small resizes reuse a texture"""
+    step = CHART_SIZE_STEP
+    return (max(step, int(width) // step * step), max(step, int(height) // step * step))
+
+
+class ChartRenderer:
+    """
+    Submits render jobs to a single long-lived worker (matplotlib is imported
+    there once; a thread in the app, see the module docstring) and caches the
+    resulting textures (LRU).
+    """
+
+    def __init__(self, max_textures=CHART_CACHE_SIZE):
+        self.max_textures = max_textures
+        self._textures = OrderedDict()
+        self._pending = {}  # key -> callbacks waiting for that render
+        self._lock = Lock()
+        self._executor = None
+        self.kind = None
+        self._stats = {'hits': 0, 'renders': 0, 'failures': 0}
+
+    def _pool(self):
+        if self._executor is None:
+            from utils.executors import create_pool
+            self._executor, self.kind = create_pool(1, prefer="process")
+            print(f"📊 Chart renderer started ({self.kind} worker)")
+        return self._executor
+
+    def request(self, kind, data, version, theme_style, size, callback):
+        """
+        Deliver a texture for the chart to callback(texture) on the UI thread.
+
+        Cached textures are delivered immediately; otherwise the chart is
+        rendered in the background (one render per key, however many
+        requests). callback(None) means the render failed.
+        """
+        size = chart_size(*size)
+        key = (kind, version, theme_style, size)
+
+        with self._lock:
+            texture = self._textures.get(key)
+            if texture is not None:
+                self._textures.move_to_end(key)
+                self._stats['hits'] += 1
+            elif key in self._pending:
+                self._pending[key].append(callback)
+                return
+            else:
+                self._pending[key] = [callback]
+
+        if texture is not None:
+            callback(texture)
+            return
+
+        try:
+            future = self._pool().submit(render_chart, kind, data, theme_style, size)
+        except Exception as e:
+            print(f"⚠️ Chart render could not start: {e}")
+            self._finish(key, None)
+            return
+        future.add_done_callback(lambda f: self._on_rendered(key, f))
+
+    def _on_rendered(self, key, future):
+        """Worker thread: hand the pixels to the UI thread"""
+        from kivy.clock import Clock
+
+        try:
+            result = future.result()
+        except Exception as e:
+            print(f"⚠️ Chart render failed: {e}")
+            result = None
+        Clock.schedule_once(lambda dt: self._finish(key, result), 0)
+
+    def _finish(self, key, result):
+        texture = None
+        if result is not None:
+            from kivy.graphics.texture import Texture
+
+            width, height, pixels = result
+            texture = Texture.create(size=(width, height), colorfmt='rgba')
+            texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+            texture.flip_vertical()
+
+        with self._lock:
+            callbacks = self._pending.pop(key, [])
+            if texture is None:
+                self._stats['failures'] += 1
+            else:
+                self._stats['renders'] += 1
+                self._textures[key] = texture
+                while len(self._textures) > self.max_textures:
+                    self._textures.popitem(last=False)
+
+        for callback in callbacks:
+            try:
+                callback(texture)
+            except Exception as e:
+                print(f"❌ Chart callback error: {e}")
+
+    def get_stats(self):
+        with self._lock:
+            return {**self._stats, 'textures': len(self._textures), 'executor': self.kind}
+
+    def shutdown(self):
+        """Stop the worker (renders in progress are abandoned)"""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global renderer instance
+_renderer = None
+
+
+def get_chart_renderer():
+    """Get the global chart renderer (its worker starts on the first request)"""
+    global _renderer
+    if _renderer is None:
+        _renderer = ChartRenderer()
+    return _renderer
+
+
+def shutdown_chart_renderer():
+    if _renderer is not None:
+        _renderer.shutdown()
@@ -27,6 +27,33 @@ RECURRENCE_CUSTOM = "custom"
 # Database
 DB_NAME = "momentum_track.db"
 
+# Query tracing (opt-in: set MOMENTUM_TRACE=1; profiling turns it on too)
+QUERY_TRACE_ENV_VAR = "MOMENTUM_TRACE"
+SLOW_QUERY_MS = 100
+SLOW_QUERY_LOG = "slow_queries.log"  # written next to the database file
+QUERY_TRACE_SAMPLES = 256  # recent timings kept per statement for percentiles
+
+# Startup: delay after the first frame before optimization, backup and notifications
+STARTUP_DEFER_SECONDS = 1.0
+
+# UI profiler (opt-in: set MOMENTUM_PROFILE=1)
+PROFILE_ENV_VAR = "MOMENTUM_PROFILE"
+PROFILE_TRACE_FILE = "momentum_trace.json"
+PROFILE_MAX_FRAMES = 600
+PROFILE_MAX_EVENTS = 200000
+JANK_FRAME_MS = 33
+
+# Event listeners with a main-thread or worker policy
+EVENT_QUEUE_SIZE = 256  # pending deliveries per listener before the oldest is dropped
+EVENT_WORKER_THREADS = 2
+
+# Precomputed task rows kept by the view-model cache
+ROW_CACHE_SIZE = 5000
+
+# Task lists kept by TaskService (least recently used are dropped first)
+LIST_CACHE_SIZE = 12
+PREFETCH_RADIUS = 1  # lists on each side of the current one loaded in the background
+
 # Default list
 DEFAULT_LIST_NAME = "My Tasks"
 
@@ -39,4 +66,27 @@ DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 MAX_TASKS_PER_LIST = 100
 TASK_ITEM_HEIGHT = 90
 SUBTASK_ITEM_HEIGHT = 70
-ANIMATION_DURATION = 0.3
\ No newline at end of file
+ANIMATION_DURATION = 0.3
+
+# Ids per IN (...) clause in bulk statements (SQLite allows 999 variables on old builds)
+SQL_CHUNK_SIZE = 400
+
+# Archiving completed tasks: rows moved per transaction, and the age after
+# which completed tasks in any list leave the live table. The age purge also
+# takes monthly/yearly items, so it is off (None) unless set to a number of days
+ARCHIVE_CHUNK_SIZE = 500
+ARCHIVE_AFTER_DAYS = None
+
+# Swipe actions wait this long (seconds) for undo, then commit as one batch
+UNDO_WINDOW = 4.0
+
+# Fractional task positions: a sibling group is renumbered in the background
+# once a move leaves less than this between neighbours
+POSITION_MIN_GAP = 1e-6
+
+# Statistics screen charts (rendered off the UI thread, cached as textures)
+HEATMAP_WEEKS = 12
+TREND_DAYS = 28
+CHART_CACHE_SIZE = 8  # textures kept (chart x theme x size)
+CHART_DPI = 100
+CHART_SIZE_STEP = 20  # px; sizes are rounded down so small resizes reuse a texture
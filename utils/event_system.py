@@ -3,53 +3,417 @@ Event System - Thread-safe event dispatching for decoupled communication
 """
 
 from typing import Callable, Dict, List, Any
-from threading import Lock
+from threading import Lock, RLock, local
+from collections import deque, namedtuple
+from contextlib import contextmanager
 from weakref import WeakMethod, ref
+import itertools
+import time
 import traceback
 
+from utils.constants import EVENT_QUEUE_SIZE, EVENT_WORKER_THREADS
+
+
+def _first_arg(args, kwargs):
+    """Default coalescing key: the first positional argument (usually an id)"""
+    return args[0] if args else None
+
+
+class _EventWindow:
+    """
+    Events collected during a batch or until the next frame.
+    Events with the same name and key are merged; order of first
+    appearance is kept.
+    """
+
+    def __init__(self):
+        self.events = {}
+
+    def add(self, event_name, key, args, kwargs, merge=None):
+        slot = (event_name, key)
+        previous = self.events.get(slot)
+        if previous is not None and merge is not None:
+            args, kwargs = merge(previous, (args, kwargs))
+        self.events[slot] = (args, kwargs)
+
+    def __len__(self):
+        return len(self.events)
+
+    def grouped(self):
+        """{event_name: [(args, kwargs), ...]} in dispatch order"""
+        groups = {}
+        for (event_name, _), event in self.events.items():
+            groups.setdefault(event_name, []).append(event)
+        return groups
+
+
+class ChangeEvent:
+    """
+    One change to an entity, delivered as TaskEvents.CHANGED.
+
+    before/after hold the values of the fields that changed (before is None
+    for a create, after is None for a delete). seq comes from the dispatcher
+    that emitted the event and increases by one per change; an event that
+    coalesced several changes covers first_seq..seq and has count > 1.
+    """
+
+    CREATE = 'create'
+    UPDATE = 'update'
+    DELETE = 'delete'
+
+    __slots__ = ('seq', 'first_seq', 'count', 'entity', 'entity_id', 'list_id',
+                 'op', 'before', 'after', 'timestamp')
+
+    def __init__(self, seq, entity, entity_id, op, list_id=None, before=None, after=None):
+        self.seq = seq
+        self.first_seq = seq
+        self.count = 1
+        self.entity = entity
+        self.entity_id = entity_id
+        self.list_id = list_id
+        self.op = op
+        self.before = before
+        self.after = after
+        self.timestamp = time.time()
+
+    @property
+    def key(self):
+        return (self.entity, self.entity_id)
+
+    @property
+    def fields(self):
+        """Names of the fields this change touched"""
+        return set(self.before or ()) | set(self.after or ())
+
+    @property
+    def list_ids(self):
+        """Every list the change affects (a move touches two)"""
+        ids = {self.list_id}
+        for values in (self.before, self.after):
+            if values and 'list_id' in values:
+                ids.add(values['list_id'])
+        ids.discard(None)
+        return ids
+
+    def merge(self, later):
+        """Combine with a later change to the same entity"""
+        if later.op == self.DELETE:
+            op = self.DELETE
+        elif self.op == self.CREATE:
+            op = self.CREATE
+        else:
+            op = later.op
+
+        before = None
+        if op != self.CREATE:
+            # Oldest value of every field wins
+            before = dict(later.before or {})
+            before.update(self.before or {})
+
+        after = None
+        if op != self.DELETE:
+            after = dict(self.after or {})
+            after.update(later.after or {})
+
+        merged = ChangeEvent(later.seq, self.entity, self.entity_id, op,
+                             later.list_id if later.list_id is not None else self.list_id,
+                             before, after)
+        merged.first_seq = self.first_seq
+        merged.count = self.count + later.count
+        return merged
+
+    def __repr__(self):
+        return (f"<ChangeEvent #{self.seq} {self.op} {self.entity} {self.entity_id} "
+                f"list={self.list_id} fields={sorted(self.fields)}>")
+
+
+class ChangeTracker:
+    """
+    Detects missed change events from sequence gaps.
+
+        tracker = ChangeTracker()
+
+        def on_changes(events):            # batched listener
+            if not tracker.accept(events):
+                reload_everything()        # something was missed
+            else:
+                apply_deltas(events)
+    """
+
+    def __init__(self):
+        self.last_seq = None
+
+    def accept(self, events):
+        """
+        Record a delivery of ChangeEvents.
+
+        Returns:
+            True if the events continue the sequence without a gap
+        """
+        if not events:
+            return True
+
+        first = min(e.first_seq for e in events)
+        last = max(e.seq for e in events)
+        contiguous = (last - first + 1) == sum(e.count for e in events)
+        if self.last_seq is not None:
+            contiguous = contiguous and first == self.last_seq + 1
+
+        if self.last_seq is None or last > self.last_seq:
+            self.last_seq = last
+        return contiguous
+
+
+class ListenerPolicy:
+    """Where a listener runs"""
+
+    INLINE = 'inline'   # on the dispatching thread, before dispatch() returns
+    MAIN = 'main'       # on the Kivy main thread, next frame
+    WORKER = 'worker'   # on the shared background worker pool
+
+    ALL = (INLINE, MAIN, WORKER)
+
+
+# Shared pool for WORKER listeners, created on first use
+_worker_pool = None
+_worker_pool_lock = Lock()
+
+
+def _get_worker_pool():
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            from utils.executors import create_pool
+            _worker_pool, _ = create_pool(EVENT_WORKER_THREADS, prefer="thread")
+        return _worker_pool
+
+
+def shutdown_event_workers():
+    """Stop the worker pool (pending deliveries are finished first)"""
+    global _worker_pool
+    with _worker_pool_lock:
+        pool, _worker_pool = _worker_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
+
+
+def _invoke(event_name, callback, batched, events):
+    """Call one listener with a list of (args, kwargs) events"""
+    try:
+        if batched:
+            callback([args for args, _ in events])
+        else:
+            for args, kwargs in events:
+                callback(*args, **kwargs)
+        return True
+    except Exception as e:
+        print(f"⚠️ Error in event listener for '{event_name}': {e}")
+        traceback.print_exc()
+        return False
+
+
+class _QueuedListener:
+    """
+    Bounded queue in front of a MAIN or WORKER listener.
+    Deliveries run in order, one drain at a time; when the queue is full the
+    oldest delivery is dropped so the dispatching thread never blocks.
+    """
+
+    def __init__(self, event_name, weak_ref, batched, policy, max_queue):
+        self.event_name = event_name
+        self.weak_ref = weak_ref
+        self.batched = batched
+        self.policy = policy
+        self.max_queue = max_queue
+
+        self._queue = deque()
+        self._lock = Lock()
+        self._draining = False
+
+        self.queued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.wait_total = 0.0
+        self.run_total = 0.0
+
+    def submit(self, events):
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+            self._queue.append((time.perf_counter(), events))
+            self.queued += 1
+            self.max_depth = max(self.max_depth, len(self._queue))
+
+            schedule = not self._draining
+            self._draining = True
+
+        if schedule:
+            self._schedule()
+
+    def _schedule(self):
+        if self.policy == ListenerPolicy.WORKER:
+            _get_worker_pool().submit(self._drain)
+            return
+
+        try:
+            from kivy.clock import Clock
+        except ImportError:
+            # No event loop: run on the dispatching thread
+            self._drain()
+            return
+        Clock.schedule_once(self._drain, 0)
+
+    def _drain(self, *args):
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._draining = False
+                    return
+                queued_at, events = self._queue.popleft()
+
+            callback = self.weak_ref()
+            if callback is None:
+                with self._lock:
+                    self._queue.clear()
+                    self._draining = False
+                return
+
+            start = time.perf_counter()
+            ok = _invoke(self.event_name, callback, self.batched, events)
+            end = time.perf_counter()
+
+            with self._lock:
+                self.delivered += 1
+                self.errors += 0 if ok else 1
+                self.wait_total += start - queued_at
+                self.run_total += end - start
+
+    def stats(self):
+        callback = self.weak_ref()
+        with self._lock:
+            return {
+                'event': self.event_name,
+                'listener': getattr(callback, '__qualname__', repr(callback)),
+                'policy': self.policy,
+                'depth': len(self._queue),
+                'max_depth': self.max_depth,
+                'capacity': self.max_queue,
+                'queued': self.queued,
+                'delivered': self.delivered,
+                'dropped': self.dropped,
+                'errors': self.errors,
+                'avg_wait_ms': self.wait_total / self.delivered * 1000 if self.delivered else 0.0,
+                'avg_run_ms': self.run_total / self.delivered * 1000 if self.delivered else 0.0,
+            }
+
+
+# One registered listener; a tuple so dispatch can unpack it cheaply
+_Subscription = namedtuple('_Subscription', ('weak_ref', 'batched', 'queue', 'token', 'identity'))
+
+
+def _identity(callback):
+    """Comparable identity of a callback that does not keep it alive"""
+    if hasattr(callback, '__self__'):
+        return (id(callback.__self__), id(callback.__func__))
+    return (None, id(callback))
+
 
 class EventDispatcher:
     """
     Thread-safe event dispatcher using weak references to prevent memory leaks.
 
+    Listeners are kept per event as immutable tuples that are replaced
+    (copy-on-write) when someone subscribes or unsubscribes, so dispatch()
+    takes no lock and copies nothing.
+
     Usage:
         dispatcher = EventDispatcher()
 
         # Register listener
-        dispatcher.on('event_name', my_callback)
+        token = dispatcher.on('event_name', my_callback)
 
         # Dispatch event
         dispatcher.dispatch('event_name', arg1, arg2)
 
         # Unregister
-        dispatcher.off('event_name', my_callback)
+        dispatcher.off('event_name', my_callback)    # or dispatcher.unsubscribe(token)
+
+        # Coalesce: listeners run once per (event, key) when the block ends
+        with dispatcher.batch():
+            for task_id in task_ids:
+                dispatcher.dispatch('on_task_completed', task_id, True)
+
+        # Batched listeners get every coalesced event in one call
+        dispatcher.on('on_task_completed', refresh, batched=True)   # refresh(events)
+
+        # Slow consumers run off the dispatching thread
+        dispatcher.on('on_change', record_analytics, policy=ListenerPolicy.WORKER)
     """
 
     def __init__(self):
-        self._listeners: Dict[str, List[Any]] = {}
-        self._lock = Lock()
-
-    def on(self, event_name: str, callback: Callable):
+        # event name -> tuple of _Subscription; only replaced under _lock
+        self._listeners: Dict[str, tuple] = {}
+        self._tokens: Dict[int, str] = {}
+        self._next_token = itertools.count(1)
+        # Reentrant: weak-ref cleanup can run from gc while this thread holds it
+        self._lock = RLock()
+        self._coalescers: Dict[str, Any] = {}
+        self._local = local()
+        self._deferred = None
+        self._deferred_scheduled = False
+        self._change_seq = itertools.count(1)
+        self._seq_lock = Lock()
+
+        # Changes to one entity inside a window merge into one delta
+        self.coalesce(
+            TaskEvents.CHANGED,
+            key=lambda args, kwargs: args[0].key,
+            merge=lambda earlier, later: ((earlier[0][0].merge(later[0][0]),), later[1])
+        )
+
+    def on(self, event_name: str, callback: Callable, batched: bool = False,
+           policy: str = ListenerPolicy.INLINE, max_queue: int = EVENT_QUEUE_SIZE) -> int:
         """
         Register an event listener.
 
         Args:
             event_name: Name of the event
             callback: Callback function to invoke
+            batched: If True, callback(events) is called once per flush with
+                the list of coalesced positional-argument tuples
+            policy: ListenerPolicy.INLINE, MAIN or WORKER
+            max_queue: Pending deliveries kept for MAIN/WORKER listeners
+
+        Returns:
+            Token for unsubscribe()
         """
-        with self._lock:
-            if event_name not in self._listeners:
-                self._listeners[event_name] = []
+        if policy not in ListenerPolicy.ALL:
+            raise ValueError(f"Unknown listener policy: {policy}")
 
-            # Use weak references to prevent memory leaks
-            if hasattr(callback, '__self__'):
-                # Method - use WeakMethod
-                weak_callback = WeakMethod(callback, self._cleanup_callback(event_name))
-            else:
-                # Function - use regular ref
-                weak_callback = ref(callback, self._cleanup_callback(event_name))
+        token = next(self._next_token)
+
+        # Use weak references to prevent memory leaks
+        if hasattr(callback, '__self__'):
+            # Method - use WeakMethod
+            weak_callback = WeakMethod(callback, self._cleanup_callback(token))
+        else:
+            # Function - use regular ref
+            weak_callback = ref(callback, self._cleanup_callback(token))
+
+        queue = None
+        if policy != ListenerPolicy.INLINE:
+            queue = _QueuedListener(event_name, weak_callback, batched, policy, max_queue)
+
+        subscription = _Subscription(weak_callback, batched, queue, token, _identity(callback))
+
+        with self._lock:
+            self._listeners[event_name] = self._listeners.get(event_name, ()) + (subscription,)
+            self._tokens[token] = event_name
 
-            self._listeners[event_name].append(weak_callback)
+        return token
 
     def off(self, event_name: str, callback: Callable = None):
         """
@@ -59,74 +423,219 @@ class EventDispatcher:
             event_name: Name of the event
             callback: Callback to remove (if None, removes all for this event)
         """
+        identity = _identity(callback) if callback is not None else None
+
         with self._lock:
-            if event_name not in self._listeners:
+            subscriptions = self._listeners.get(event_name)
+            if not subscriptions:
                 return
 
-            if callback is None:
+            if identity is None:
                 # Remove all listeners for this event
-                del self._listeners[event_name]
+                removed = subscriptions
+                remaining = ()
             else:
                 # Remove specific listener
-                self._listeners[event_name] = [
-                    weak_ref for weak_ref in self._listeners[event_name]
-                    if weak_ref() != callback
-                ]
+                removed = tuple(sub for sub in subscriptions if sub.identity == identity)
+                remaining = tuple(sub for sub in subscriptions if sub.identity != identity)
+
+            self._publish(event_name, remaining)
+            for sub in removed:
+                self._tokens.pop(sub.token, None)
+
+    def unsubscribe(self, token: int) -> bool:
+        """
+        Remove the listener registered under token.
+
+        Returns:
+            True if it was still registered
+        """
+        with self._lock:
+            event_name = self._tokens.pop(token, None)
+            if event_name is None:
+                return False
+            subscriptions = self._listeners.get(event_name, ())
+            self._publish(event_name, tuple(sub for sub in subscriptions if sub.token != token))
+            return True
+
+    def _publish(self, event_name, subscriptions):
+        """Swap in a new listener tuple (caller holds _lock)"""
+        if subscriptions:
+            self._listeners[event_name] = subscriptions
+        else:
+            self._listeners.pop(event_name, None)
+
+    def coalesce(self, event_name: str, key: Callable = None, merge: Callable = None):
+        """
+        Configure how an event is coalesced inside a batch or frame window.
 
-                # Clean up empty list
-                if not self._listeners[event_name]:
-                    del self._listeners[event_name]
+        Args:
+            event_name: Name of the event
+            key: key(args, kwargs) -> hashable; events with equal keys are
+                merged (default: first positional argument)
+            merge: merge((args, kwargs), (args, kwargs)) -> (args, kwargs)
+                combining an earlier and a later event (default: later wins)
+        """
+        with self._lock:
+            self._coalescers[event_name] = (key or _first_arg, merge)
+
+    def _add_to_window(self, window, event_name, args, kwargs):
+        key, merge = self._coalescers.get(event_name, (_first_arg, None))
+        try:
+            event_key = key(args, kwargs)
+            hash(event_key)
+        except TypeError:
+            # Unhashable key - keep the event on its own
+            event_key = object()
+        window.add(event_name, event_key, args, kwargs, merge)
 
     def dispatch(self, event_name: str, *args, **kwargs):
         """
         Dispatch an event to all registered listeners.
+        Inside a batch() block the event is queued and coalesced instead.
 
         Args:
             event_name: Name of the event
             *args: Positional arguments to pass to callbacks
             **kwargs: Keyword arguments to pass to callbacks
         """
-        with self._lock:
-            if event_name not in self._listeners:
-                return
-
-            # Get current listeners (copy to avoid modification during iteration)
-            listeners = self._listeners[event_name].copy()
-
-        # Call listeners outside of lock to prevent deadlocks
-        for weak_ref in listeners:
+        window = getattr(self._local, 'window', None)
+        if window is not None:
+            self._add_to_window(window, event_name, args, kwargs)
+            return
+
+        # The tuple is immutable, so iterating it needs neither lock nor copy
+        subscriptions = self._listeners.get(event_name)
+        if not subscriptions:
+            return
+
+        for weak_ref, batched, queue, _, _ in subscriptions:
+            if queue is not None:
+                queue.submit([(args, kwargs)])
+                continue
+            callback = weak_ref()
+            if callback is None:
+                continue
+            if batched:
+                _invoke(event_name, callback, True, [(args, kwargs)])
+                continue
             try:
-                callback = weak_ref()
-                if callback is not None:
-                    callback(*args, **kwargs)
+                callback(*args, **kwargs)
             except Exception as e:
                 print(f"⚠️ Error in event listener for '{event_name}': {e}")
                 traceback.print_exc()
 
-    def _cleanup_callback(self, event_name: str):
-        """Create a cleanup function for dead weak references"""
+    def emit_change(self, entity: str, entity_id, op: str, list_id=None,
+                    before: Dict[str, Any] = None, after: Dict[str, Any] = None) -> ChangeEvent:
+        """
+        Dispatch a ChangeEvent with the next sequence number.
+
+        Args:
+            entity: 'task' or 'list'
+            entity_id: ID of the changed entity
+            op: ChangeEvent.CREATE, UPDATE or DELETE
+            list_id: List the entity belongs to
+            before: Previous values of the changed fields
+            after: New values of the changed fields
+        """
+        with self._seq_lock:
+            event = ChangeEvent(next(self._change_seq), entity, entity_id, op, list_id, before, after)
+        self.dispatch(TaskEvents.CHANGED, event)
+        return event
+
+    @contextmanager
+    def batch(self):
+        """
+        Coalescing window for the current thread: events dispatched inside
+        are merged by (name, key) and delivered when the outermost block exits.
+        """
+        outermost = getattr(self._local, 'window', None) is None
+        if outermost:
+            self._local.window = _EventWindow()
+        try:
+            yield self
+        finally:
+            if outermost:
+                window = self._local.window
+                self._local.window = None
+                self._flush(window)
+
+    def dispatch_later(self, event_name: str, *args, **kwargs):
+        """
+        Queue an event for the next Kivy frame. Everything queued before
+        that frame is coalesced and delivered together on the main thread.
+        Without Kivy the event is dispatched immediately.
+        """
+        try:
+            from kivy.clock import Clock
+        except ImportError:
+            self.dispatch(event_name, *args, **kwargs)
+            return
+
+        with self._lock:
+            if self._deferred is None:
+                self._deferred = _EventWindow()
+            self._add_to_window(self._deferred, event_name, args, kwargs)
+            schedule = not self._deferred_scheduled
+            self._deferred_scheduled = True
+
+        if schedule:
+            Clock.schedule_once(self._flush_deferred, 0)
+
+    def _flush_deferred(self, dt=None):
+        with self._lock:
+            window = self._deferred
+            self._deferred = None
+            self._deferred_scheduled = False
+        if window:
+            self._flush(window)
+
+    def _flush(self, window):
+        for event_name, events in window.grouped().items():
+            self._deliver(event_name, events)
+
+    def _deliver(self, event_name, events):
+        for sub in self._listeners.get(event_name, ()):
+            if sub.queue is not None:
+                sub.queue.submit(events)
+                continue
+            callback = sub.weak_ref()
+            if callback is not None:
+                _invoke(event_name, callback, sub.batched, events)
+
+    def _cleanup_callback(self, token: int):
+        """Create a cleanup function that drops a listener once its target is collected"""
 
         def cleanup(weak_ref):
-            with self._lock:
-                if event_name in self._listeners:
-                    self._listeners[event_name] = [
-                        ref for ref in self._listeners[event_name]
-                        if ref != weak_ref
-                    ]
-                    if not self._listeners[event_name]:
-                        del self._listeners[event_name]
+            self.unsubscribe(token)
 
         return cleanup
 
+    def listener_count(self, event_name: str) -> int:
+        """Number of listeners registered for an event"""
+        return len(self._listeners.get(event_name, ()))
+
+    def listener_counts(self) -> Dict[str, int]:
+        """Listener count per event"""
+        with self._lock:
+            return {name: len(subs) for name, subs in self._listeners.items()}
+
+    def listener_stats(self) -> List[Dict[str, Any]]:
+        """Queue depth, drops and latency for every MAIN/WORKER listener"""
+        with self._lock:
+            queues = [sub.queue for subs in self._listeners.values()
+                      for sub in subs if sub.queue is not None]
+        return [queue.stats() for queue in queues]
+
     def has_listeners(self, event_name: str) -> bool:
         """Check if event has any listeners"""
-        with self._lock:
-            return event_name in self._listeners and len(self._listeners[event_name]) > 0
+        return bool(self._listeners.get(event_name))
 
     def clear(self):
         """Remove all event listeners"""
         with self._lock:
             self._listeners.clear()
+            self._tokens.clear()
 
 
 class TaskEvents:
@@ -146,6 +655,9 @@ class TaskEvents:
 
     REMINDER_TRIGGERED = 'on_reminder_triggered'
 
+    # Change feed: one ChangeEvent argument
+    CHANGED = 'on_change'
+
 
 class EventBus:
     """
@@ -169,18 +681,47 @@ class EventBus:
             cls._instance._dispatcher = EventDispatcher()
         return cls._instance
 
-    def on(self, event_name: str, callback: Callable):
-        """Register event listener"""
-        self._dispatcher.on(event_name, callback)
+    def on(self, event_name: str, callback: Callable, batched: bool = False,
+           policy: str = ListenerPolicy.INLINE, max_queue: int = EVENT_QUEUE_SIZE) -> int:
+        """Register event listener, returns an unsubscribe token"""
+        return self._dispatcher.on(event_name, callback, batched, policy, max_queue)
 
     def off(self, event_name: str, callback: Callable = None):
         """Unregister event listener"""
         self._dispatcher.off(event_name, callback)
 
+    def unsubscribe(self, token: int) -> bool:
+        """Unregister the listener behind a token"""
+        return self._dispatcher.unsubscribe(token)
+
     def dispatch(self, event_name: str, *args, **kwargs):
         """Dispatch event"""
         self._dispatcher.dispatch(event_name, *args, **kwargs)
 
+    def dispatch_later(self, event_name: str, *args, **kwargs):
+        """Dispatch event on the next frame, coalesced"""
+        self._dispatcher.dispatch_later(event_name, *args, **kwargs)
+
+    def emit_change(self, entity: str, entity_id, op: str, list_id=None, before=None, after=None):
+        """Dispatch a ChangeEvent"""
+        return self._dispatcher.emit_change(entity, entity_id, op, list_id, before, after)
+
+    def batch(self):
+        """Coalescing window (context manager)"""
+        return self._dispatcher.batch()
+
+    def coalesce(self, event_name: str, key: Callable = None, merge: Callable = None):
+        """Configure coalescing for an event"""
+        self._dispatcher.coalesce(event_name, key, merge)
+
+    def listener_counts(self) -> Dict[str, int]:
+        """Listener count per event"""
+        return self._dispatcher.listener_counts()
+
+    def listener_stats(self) -> List[Dict[str, Any]]:
+        """Backpressure metrics of queued listeners"""
+        return self._dispatcher.listener_stats()
+
     def has_listeners(self, event_name: str) -> bool:
         """Check if event has listeners"""
         return self._dispatcher.has_listeners(event_name)
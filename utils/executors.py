@@ -0,0 +1,57 @@
+"""
+Worker Pools - Pick a process or thread pool that is safe for this platform
+"""
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def is_android():
+    """python-for-android sets ANDROID_ARGUMENT for the app process"""
+    return 'ANDROID_ARGUMENT' in os.environ or hasattr(sys, 'getandroidapilevel')
+
+
+def can_use_processes():
+    """
+    Process pools are only used where the 'fork' start method exists and is
+    reliable (desktop Linux). 'spawn' re-imports main.py in every worker, which
+    would open a Kivy window, and Android does not support multiprocessing.
+
+    Forking is also refused once the process has other threads: the child
+    only inherits the forking thread, and a lock some other thread held at
+    that moment (logging, the allocator, SQLite, the scheduler) stays locked
+    forever there. Python 3.12+ warns about exactly this. The running app
+    always has threads (scheduler, event workers, prefetch, startup
+    maintenance), so inside the app this means threads; headless/CLI callers
+    that create their pool up front still get processes.
+    """
+    if is_android() or not sys.platform.startswith('linux'):
+        return False
+    if threading.active_count() > 1:
+        return False
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def create_pool(max_workers=None, prefer="process"):
+    """
+    Create an executor for background work.
+
+    Args:
+        max_workers: Pool size (default: number of CPUs)
+        prefer: "process" for CPU-bound work, "thread" to force threads.
+                "process" falls back to threads wherever forking is unsafe
+                (see can_use_processes()), which includes the running app.
+
+    Returns:
+        Tuple of (executor, kind) where kind is "process" or "thread"
+    """
+    max_workers = max_workers or os.cpu_count() or 2
+
+    if prefer == "process" and can_use_processes():
+        context = multiprocessing.get_context('fork')
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=context), "process"
+
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="MomentumWorker"), "thread"
@@ -0,0 +1,406 @@
+"""
+Export Pipeline - Single-pass, streaming exporters
+Runs one ordered query over lists and tasks and streams the rows into a
+pluggable formatter (Markdown, CSV, JSON Lines, iCalendar VTODO).
+"""
+
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from pathlib import Path
+from database.db_manager import EXPORT_COLUMNS, fetch_export_rows
+
+# Write buffer for export files (bytes)
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+ExportRow = namedtuple('ExportRow', EXPORT_COLUMNS)
+
+
+class ExportFormatter:
+    """
+    Base formatter. The pipeline calls the hooks in stream order:
+
+        begin() -> (start_list() -> task()* -> end_list())* -> finish()
+
+    task() receives top-level tasks and subtasks alike; a subtask always
+    follows its parent and has row.parent_id set.
+    """
+
+    name = None
+    extension = "txt"
+    newline = None  # passed to open(); csv needs ''
+
+    def __init__(self, f):
+        self.f = f
+
+    def begin(self):
+        pass
+
+    def start_list(self, row):
+        pass
+
+    def task(self, row):
+        pass
+
+    def end_list(self, row, task_count):
+        pass
+
+    def finish(self):
+        pass
+
+
+class MarkdownFormatter(ExportFormatter):
+    """Readable Markdown with pending and completed sections per list"""
+
+    name = "markdown"
+    extension = "md"
+
+    def begin(self):
+        self.f.write("# Momentum Track Export\n\n")
+        self.f.write(f"**Exported on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        self.f.write("---\n\n")
+
+    def start_list(self, row):
+        self.f.write(f"## {row.list_name}\n\n")
+        self.f.write(f"*Category:* {row.category.title()}\n\n")
+        self._section = None
+        self._parent = None
+        self._wrote_subtask_header = False
+
+    def _close_task(self):
+        if self._parent is not None:
+            self.f.write("\n")
+            self._parent = None
+
+    def task(self, row):
+        write = self.f.write
+
+        if row.parent_id is not None:
+            status = "x" if row.completed else " "
+            if self._parent is not None and self._parent.completed:
+                write(f"  - [{status}] {row.title}\n")
+            else:
+                if not self._wrote_subtask_header:
+                    write("  - **Subtasks:**\n")
+                    self._wrote_subtask_header = True
+                write(f"    - [{status}] {row.title}\n")
+            return
+
+        self._close_task()
+        self._parent = row
+        self._wrote_subtask_header = False
+
+        if row.completed:
+            if self._section != "completed":
+                write("### ✅ Completed Tasks\n\n")
+                self._section = "completed"
+            write(f"- [x] ~~{row.title}~~\n")
+            return
+
+        if self._section != "pending":
+            write("### 📝 Pending Tasks\n\n")
+            self._section = "pending"
+        write(f"- [ ] **{row.title}**\n")
+        if row.notes:
+            write(f"  - *Notes:* {row.notes}\n")
+        if row.start_time:
+            time_info = f"  - ⏰ {row.start_time}"
+            if row.end_time:
+                time_info += f" - {row.end_time}"
+            write(f"{time_info}\n")
+        if row.motivation:
+            write(f"  - 💪 *\"{row.motivation}\"*\n")
+
+    def end_list(self, row, task_count):
+        if not task_count:
+            self.f.write("*No tasks*\n\n")
+            return
+        self._close_task()
+        self.f.write("\n---\n\n")
+
+
+class CSVFormatter(ExportFormatter):
+    """Flat CSV, one row per task or subtask"""
+
+    name = "csv"
+    extension = "csv"
+    newline = ''
+
+    def begin(self):
+        self.writer = csv.writer(self.f)
+        self.writer.writerow([
+            "List Name", "Category", "Task Title", "Notes",
+            "Start Time", "End Time", "Reminder", "Motivation",
+            "Completed", "Recurrence", "Created", "Parent Task"
+        ])
+        self._parent_title = ""
+
+    def task(self, row):
+        if row.parent_id is None:
+            self._parent_title = row.title
+        self.writer.writerow([
+            row.list_name,
+            row.category,
+            row.title,
+            row.notes or "",
+            row.start_time or "",
+            row.end_time or "",
+            row.reminder_time or "",
+            row.motivation or "",
+            "Yes" if row.completed else "No",
+            row.recurrence_type or "None",
+            row.created_at or "",
+            self._parent_title if row.parent_id is not None else ""
+        ])
+
+
+class JSONLinesFormatter(ExportFormatter):
+    """One JSON object per task or subtask"""
+
+    name = "jsonl"
+    extension = "jsonl"
+
+    def task(self, row):
+        record = {
+            "uuid": row.uuid,
+            "parent_uuid": row.parent_uuid,
+            "list": row.list_name,
+            "list_uuid": row.list_uuid,
+            "category": row.category,
+            "title": row.title,
+            "notes": row.notes or "",
+            "due_date": row.due_date,
+            "start_time": row.start_time,
+            "end_time": row.end_time,
+            "reminder_time": row.reminder_time,
+            "motivation": row.motivation or "",
+            "completed": bool(row.completed),
+            "position": row.position,
+            "recurrence_type": row.recurrence_type,
+            "recurrence_interval": row.recurrence_interval,
+            "last_completed_date": row.last_completed_date,
+            "created_at": row.created_at,
+            "modified_at": row.modified_at
+        }
+        self.f.write(json.dumps(record, ensure_ascii=False))
+        self.f.write("\n")
+
+
+class ICalendarFormatter(ExportFormatter):
+    """iCalendar (RFC 5545) VTODO components"""
+
+    name = "ics"
+    extension = "ics"
+    newline = ''
+
+    RRULE_FREQ = {
+        "today": "DAILY",
+        "week": "WEEKLY",
+        "month": "MONTHLY",
+        "year": "YEARLY",
+        "custom": "DAILY"
+    }
+
+    def _line(self, text):
+        """Write a content line folded at 75 octets, CRLF terminated"""
+        data = text.encode('utf-8')
+        if len(data) <= 75:
+            self.f.write(text + "\r\n")
+            return
+
+        chunks = []
+        current = ""
+        limit = 75
+        for char in text:
+            if len((current + char).encode('utf-8')) > limit:
+                chunks.append(current)
+                current = char
+                limit = 74  # continuation lines start with a space
+            else:
+                current += char
+        chunks.append(current)
+        self.f.write("\r\n ".join(chunks) + "\r\n")
+
+    @staticmethod
+    def _escape(text):
+        return (str(text).replace("\\", "\\\\").replace(";", "\\;")
+                .replace(",", "\\,").replace("\n", "\\n"))
+
+    @staticmethod
+    def _utc_stamp(value):
+        """DB timestamps are CURRENT_TIMESTAMP (UTC) strings"""
+        try:
+            return datetime.fromisoformat(str(value)).strftime("%Y%m%dT%H%M%SZ")
+        except (TypeError, ValueError):
+            return None
+
+    def begin(self):
+        self._dtstamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self._line("BEGIN:VCALENDAR")
+        self._line("VERSION:2.0")
+        self._line("PRODID:-//Momentum Track//Task Export//EN")
+
+    def task(self, row):
+        line = self._line
+        line("BEGIN:VTODO")
+        line(f"UID:{row.uuid or row.task_id}@momentumtrack")
+        line(f"DTSTAMP:{self._dtstamp}")
+        line(f"SUMMARY:{self._escape(row.title)}")
+
+        description = row.notes or ""
+        if row.motivation:
+            description = f"{description}\n💪 {row.motivation}" if description else f"💪 {row.motivation}"
+        if description:
+            line(f"DESCRIPTION:{self._escape(description)}")
+
+        line(f"CATEGORIES:{self._escape(row.category)},{self._escape(row.list_name)}")
+        line(f"STATUS:{'COMPLETED' if row.completed else 'NEEDS-ACTION'}")
+
+        if row.due_date:
+            day = str(row.due_date).replace("-", "")
+            if row.start_time:
+                line(f"DTSTART:{day}T{row.start_time.replace(':', '')}00")
+            if row.end_time:
+                line(f"DUE:{day}T{row.end_time.replace(':', '')}00")
+            elif not row.start_time:
+                line(f"DUE;VALUE=DATE:{day}")
+
+        if row.recurrence_type:
+            freq = self.RRULE_FREQ.get(row.recurrence_type, "DAILY")
+            line(f"RRULE:FREQ={freq};INTERVAL={row.recurrence_interval or 1}")
+
+        if row.parent_uuid:
+            line(f"RELATED-TO:{row.parent_uuid}@momentumtrack")
+
+        created = self._utc_stamp(row.created_at)
+        if created:
+            line(f"CREATED:{created}")
+        modified = self._utc_stamp(row.modified_at)
+        if modified:
+            line(f"LAST-MODIFIED:{modified}")
+
+        line("END:VTODO")
+
+    def finish(self):
+        self._line("END:VCALENDAR")
+
+
+FORMATTERS = {
+    MarkdownFormatter.name: MarkdownFormatter,
+    CSVFormatter.name: CSVFormatter,
+    JSONLinesFormatter.name: JSONLinesFormatter,
+    ICalendarFormatter.name: ICalendarFormatter,
+}
+
+
+def register_formatter(formatter_cls):
+    """Register an additional ExportFormatter subclass by its name"""
+    FORMATTERS[formatter_cls.name] = formatter_cls
+    return formatter_cls
+
+
+def get_formatter(name):
+    """Look up a formatter class by name"""
+    if name not in FORMATTERS:
+        raise ValueError(f"Unknown export format: {name}")
+    return FORMATTERS[name]
+
+
+def write_export(rows, formatter_cls, filepath):
+    """
+    Stream export rows into a formatter writing to filepath.
+
+    Args:
+        rows: Iterable of raw rows in EXPORT_COLUMNS order (one ordered scan)
+        formatter_cls: ExportFormatter subclass
+        filepath: Destination file
+
+    Returns:
+        Number of task rows written
+    """
+    task_total = 0
+
+    with open(filepath, 'w', encoding='utf-8', newline=formatter_cls.newline,
+              buffering=EXPORT_BUFFER_SIZE) as f:
+        formatter = formatter_cls(f)
+        formatter.begin()
+
+        current = None
+        task_count = 0
+
+        for raw in rows:
+            row = ExportRow._make(raw)
+
+            if current is None or row.list_id != current.list_id:
+                if current is not None:
+                    formatter.end_list(current, task_count)
+                current = row
+                task_count = 0
+                formatter.start_list(row)
+
+            if row.task_id is not None:
+                formatter.task(row)
+                task_count += 1
+                task_total += 1
+
+        if current is not None:
+            formatter.end_list(current, task_count)
+
+        formatter.finish()
+
+    return task_total
+
+
+def open_snapshot(snapshot_path):
+    """Open a read-only connection to an immutable database snapshot"""
+    uri = Path(snapshot_path).resolve().as_uri() + "?mode=ro&immutable=1"
+    return sqlite3.connect(uri, uri=True)
+
+
+def run_export_job(snapshot_path, output_dir, job):
+    """
+    Run one export job in a worker (process or thread).
+
+    Each worker opens its own read-only connection to the shared snapshot,
+    so every job sees exactly the same data.
+
+    Args:
+        snapshot_path: Path of the database snapshot
+        output_dir: Directory to write into
+        job: Dict with format, filename and optional list_id / category
+
+    Returns:
+        Manifest entry dict for the written file
+    """
+    start = time.perf_counter()
+    formatter_cls = get_formatter(job['format'])
+    filepath = Path(output_dir) / job['filename']
+
+    conn = open_snapshot(snapshot_path)
+    try:
+        rows = fetch_export_rows(conn, list_id=job.get('list_id'), category=job.get('category'))
+        task_count = write_export(rows, formatter_cls, filepath)
+    finally:
+        conn.close()
+
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(EXPORT_BUFFER_SIZE), b''):
+            digest.update(chunk)
+
+    return {
+        'format': job['format'],
+        'list_id': job.get('list_id'),
+        'category': job.get('category'),
+        'path': str(filepath),
+        'tasks': task_count,
+        'bytes': os.path.getsize(filepath),
+        'sha256': digest.hexdigest(),
+        'seconds': round(time.perf_counter() - start, 4),
+        'worker_pid': os.getpid()
+    }
@@ -0,0 +1,270 @@
+"""
+UI Profiler - frame times, hot-path sections and DB time per frame
+
+Opt-in: run with MOMENTUM_PROFILE=1. When disabled, @profiled returns the
+function unchanged and nothing is hooked, so there is no overhead.
+
+    @profiled("MainScreen.load_tasks_for_list")
+    def load_tasks_for_list(self, list_id): ...
+
+Frames are measured with a Kivy Clock callback that runs once per frame;
+section and DB time recorded between two callbacks is attributed to that
+frame. Everything is also kept as Chrome trace events (chrome://tracing,
+ui.perfetto.dev) and can be dumped with dump_trace().
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from utils.constants import (JANK_FRAME_MS, PROFILE_ENV_VAR, PROFILE_MAX_EVENTS,
+                             PROFILE_MAX_FRAMES, PROFILE_TRACE_FILE)
+
+
+# Trace track for frame events
+FRAMES_TID = 0
+
+
+def profiling_enabled():
+    return os.environ.get(PROFILE_ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+class FrameRecord:
+    """Timing of one frame and what ran inside it"""
+
+    __slots__ = ('start', 'duration', 'sections', 'db_ms', 'db_count')
+
+    def __init__(self, start, duration, sections, db_ms, db_count):
+        self.start = start
+        self.duration = duration
+        self.sections = sections
+        self.db_ms = db_ms
+        self.db_count = db_count
+
+    @property
+    def ms(self):
+        return self.duration * 1000
+
+
+class UIProfiler:
+    """Collects frames, sections, DB calls and widget counts"""
+
+    def __init__(self, enabled=None):
+        self.enabled = profiling_enabled() if enabled is None else enabled
+
+        self.frames = deque(maxlen=PROFILE_MAX_FRAMES)
+        self.events = deque(maxlen=PROFILE_MAX_EVENTS)
+        self.widget_counts = {}
+
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._main_thread = threading.get_ident()
+        self._frame_start = None
+        self._frame_sections = {}
+        self._frame_db_ms = 0.0
+        self._frame_db_count = 0
+        self._db = None
+        self._running = False
+
+    # ===== RECORDING =====
+
+    def _ts(self, moment):
+        """Trace timestamps are microseconds since the profiler started"""
+        return (moment - self._origin) * 1e6
+
+    def _add_event(self, name, category, start, duration, tid=None, args=None):
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': self._ts(start),
+            'dur': duration * 1e6,
+            'pid': self._pid,
+            'tid': tid if tid is not None else threading.get_ident(),
+        }
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    @contextmanager
+    def section(self, name):
+        """Time a block and attribute it to the current frame"""
+        if not self._running:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._add_event(name, 'ui', start, elapsed)
+            if threading.get_ident() == self._main_thread:
+                self._frame_sections[name] = self._frame_sections.get(name, 0.0) + elapsed * 1000
+
+    def _on_query(self, sql, elapsed, rows):
+        # Called by the QueryTracer from whichever thread ran the query
+        end = time.perf_counter()
+        self._add_event(sql[:80], 'db', end - elapsed, elapsed, args={'rows': rows})
+        if threading.get_ident() == self._main_thread:
+            self._frame_db_ms += elapsed * 1000
+            self._frame_db_count += 1
+
+    def _on_frame(self, dt):
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            duration = now - self._frame_start
+            self.frames.append(FrameRecord(
+                self._frame_start, duration, self._frame_sections,
+                self._frame_db_ms, self._frame_db_count
+            ))
+            self._add_event('frame', 'frame', self._frame_start, duration, tid=FRAMES_TID,
+                            args={'db_ms': round(self._frame_db_ms, 3)} if self._frame_db_count else None)
+
+        self._frame_start = now
+        self._frame_sections = {}
+        self._frame_db_ms = 0.0
+        self._frame_db_count = 0
+
+    def count_widgets(self, *args):
+        """Widget count per screen, recorded as a trace counter"""
+        from kivy.app import App
+
+        app = App.get_running_app()
+        root = app.root if app else None
+        if root is None:
+            return
+
+        screens = getattr(root, 'screens', None) or [root]
+        counts = {}
+        for screen in screens:
+            counts[getattr(screen, 'name', None) or type(screen).__name__] = sum(1 for _ in screen.walk())
+
+        self.widget_counts = counts
+        self.events.append({
+            'name': 'widgets', 'ph': 'C', 'ts': self._ts(time.perf_counter()),
+            'pid': self._pid, 'args': counts,
+        })
+
+    # ===== LIFECYCLE =====
+
+    def start(self, db_manager=None, overlay=True):
+        """Hook the Kivy Clock (and the query tracer) and show the overlay"""
+        if not self.enabled or self._running:
+            return
+
+        from kivy.clock import Clock
+
+        self._running = True
+        self._main_thread = threading.get_ident()
+        Clock.schedule_interval(self._on_frame, 0)
+        Clock.schedule_interval(self.count_widgets, 1.0)
+
+        if db_manager is not None and getattr(db_manager, 'tracer', None):
+            self._db = db_manager
+            db_manager.tracer.add_listener(self._on_query)
+
+        if overlay:
+            from utils.profiler_overlay import ProfilerOverlay
+            ProfilerOverlay(self).attach()
+
+        print(f"🔬 UI profiler running (F12: dump trace to {PROFILE_TRACE_FILE})")
+
+    def stop(self):
+        if not self._running:
+            return
+
+        from kivy.clock import Clock
+
+        Clock.unschedule(self._on_frame)
+        Clock.unschedule(self.count_widgets)
+        if self._db is not None:
+            self._db.tracer.remove_listener(self._on_query)
+            self._db = None
+        self._running = False
+
+    # ===== REPORTING =====
+
+    def summary(self, last=120):
+        """Frame statistics over the last `last` frames"""
+        frames = list(self.frames)[-last:]
+        if not frames:
+            return {'frames': 0}
+
+        durations = sorted(f.ms for f in frames)
+        sections = {}
+        for frame in frames:
+            for name, ms in frame.sections.items():
+                sections[name] = sections.get(name, 0.0) + ms
+
+        total = sum(durations)
+        worst = max(frames, key=lambda f: f.duration)
+        return {
+            'frames': len(frames),
+            'fps': len(frames) / (total / 1000) if total else 0.0,
+            'frame_ms': frames[-1].ms,
+            'p50_ms': durations[len(durations) // 2],
+            'p95_ms': durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+            'max_ms': durations[-1],
+            'janky': sum(1 for d in durations if d > JANK_FRAME_MS),
+            'db_ms': sum(f.db_ms for f in frames),
+            'db_count': sum(f.db_count for f in frames),
+            'sections': sections,
+            'worst': worst,
+            'widgets': dict(self.widget_counts),
+        }
+
+    def dump_trace(self, filepath=PROFILE_TRACE_FILE):
+        """Write all events in Chrome trace-event format"""
+        events = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': self._main_thread,
+             'args': {'name': 'main'}},
+            {'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': FRAMES_TID,
+             'args': {'name': 'frames'}},
+        ]
+        events.extend(self.events)
+
+        try:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+            print(f"🔬 Trace written: {filepath} ({len(events)} events)")
+            return filepath
+        except OSError as e:
+            print(f"❌ Could not write trace: {e}")
+            return None
+
+
+# Global profiler instance
+_profiler = None
+
+
+def get_profiler():
+    """Get global profiler instance"""
+    global _profiler
+    if _profiler is None:
+        _profiler = UIProfiler()
+    return _profiler
+
+
+def profiled(name=None):
+    """
+    Decorator recording a function as a profiler section.
+    Returns the function untouched unless profiling is enabled.
+    """
+    def decorator(func):
+        if not profiling_enabled():
+            return func
+
+        section_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_profiler().section(section_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -0,0 +1,92 @@
+"""
+Profiler Overlay - live frame/section/DB numbers drawn over the app
+F11 toggles the overlay, F12 dumps a Chrome trace file.
+"""
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp
+from kivy.uix.label import Label
+
+KEY_F11 = 292
+KEY_F12 = 293
+
+
+class ProfilerOverlay(Label):
+    """Semi-transparent text panel pinned to the top-left corner"""
+
+    def __init__(self, profiler, **kwargs):
+        super().__init__(
+            font_size=dp(11),
+            halign='left',
+            valign='top',
+            size_hint=(None, None),
+            color=(1, 1, 1, 1),
+            **kwargs
+        )
+        self.profiler = profiler
+
+        with self.canvas.before:
+            Color(0, 0, 0, 0.65)
+            self._bg = Rectangle(pos=self.pos, size=self.size)
+
+        self.bind(texture_size=self._resize, pos=self._update_bg, size=self._update_bg)
+        Window.bind(size=self._reposition)
+
+    def attach(self):
+        Window.add_widget(self)
+        Window.bind(on_key_down=self._on_key_down)
+        Clock.schedule_interval(self.refresh, 0.5)
+        self._reposition()
+
+    def _resize(self, *args):
+        self.size = (self.texture_size[0] + dp(12), self.texture_size[1] + dp(8))
+        self._reposition()
+
+    def _reposition(self, *args):
+        self.pos = (dp(4), Window.height - self.height - dp(4))
+
+    def _update_bg(self, *args):
+        self._bg.pos = self.pos
+        self._bg.size = self.size
+
+    def _on_key_down(self, window, key, *args):
+        if key == KEY_F12:
+            self.profiler.dump_trace()
+            return True
+        if key == KEY_F11:
+            self.opacity = 0 if self.opacity else 1
+            return True
+        return False
+
+    def refresh(self, dt):
+        if not self.opacity:
+            return
+
+        stats = self.profiler.summary()
+        if not stats['frames']:
+            self.text = "profiler: waiting for frames"
+            return
+
+        lines = [
+            f"{stats['fps']:.0f} fps  frame {stats['frame_ms']:.1f}ms  "
+            f"p50 {stats['p50_ms']:.1f}  p95 {stats['p95_ms']:.1f}  max {stats['max_ms']:.1f}",
+            f"janky {stats['janky']}/{stats['frames']}  db {stats['db_count']} q / {stats['db_ms']:.1f}ms",
+        ]
+
+        # Time per section over the window, largest first
+        for name, ms in sorted(stats['sections'].items(), key=lambda item: -item[1])[:5]:
+            lines.append(f"  {name}: {ms:.1f}ms")
+
+        worst = stats['worst']
+        if worst.sections or worst.db_count:
+            parts = [f"{name} {ms:.1f}" for name, ms in worst.sections.items()]
+            if worst.db_count:
+                parts.append(f"db {worst.db_ms:.1f} ({worst.db_count} q)")
+            lines.append(f"worst {worst.ms:.1f}ms: " + ", ".join(parts))
+
+        if stats['widgets']:
+            lines.append("widgets " + "  ".join(f"{name}={count}" for name, count in stats['widgets'].items()))
+
+        self.text = "\n".join(lines)
@@ -0,0 +1,122 @@
+"""
+Startup Timeline - records import and initialization phases up to first frame
+Also provides lazy_import() for modules that should not be paid for at launch.
+
+    from utils.startup import timeline, lazy_import
+
+    with timeline.phase("import kivymd"):
+        from kivymd.app import MDApp
+
+    dialogs = lazy_import("components.dialogs")   # imported on first attribute access
+"""
+
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupTimeline:
+    """Phases (name, start, end, modules imported) relative to the first import of this module"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases = []
+        self.first_frame_at = None
+        self._lock = threading.Lock()
+
+    def _offset_ms(self, moment):
+        return (moment - self.origin) * 1000
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block; also records how many modules it imported"""
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append((name, start, end, len(sys.modules) - modules_before))
+
+    def mark(self, name):
+        """Record an instant (zero-length phase)"""
+        now = time.perf_counter()
+        with self._lock:
+            self.phases.append((name, now, now, 0))
+
+    def first_frame(self):
+        """Call once the first frame has been presented"""
+        if self.first_frame_at is None:
+            self.first_frame_at = time.perf_counter()
+            self.mark("first frame")
+
+    def snapshot(self):
+        """Phases as dicts, in start order"""
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[1])
+        return [
+            {
+                'name': name,
+                'start_ms': self._offset_ms(start),
+                'duration_ms': (end - start) * 1000,
+                'modules': modules,
+                'before_first_frame': self.first_frame_at is None or start < self.first_frame_at,
+            }
+            for name, start, end, modules in phases
+        ]
+
+    def print_report(self):
+        print("\n" + "=" * 60)
+        print("🚀 Startup Timeline")
+        print("=" * 60)
+        for entry in self.snapshot():
+            if entry['duration_ms']:
+                print(f"  {entry['start_ms']:8.1f}ms  +{entry['duration_ms']:7.1f}ms  "
+                      f"{entry['name']} ({entry['modules']} modules)")
+            else:
+                print(f"  {entry['start_ms']:8.1f}ms  ● {entry['name']}")
+        if self.first_frame_at is not None:
+            print(f"\n  First frame after {self._offset_ms(self.first_frame_at):.1f}ms")
+        print("=" * 60 + "\n")
+
+
+# Global startup timeline
+timeline = StartupTimeline()
+
+
+class LazyModule:
+    """Module proxy that imports on first attribute access"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    with timeline.phase(f"lazy import {self._name}"):
+                        self._module = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name} ({state})>"
+
+
+def lazy_import(name):
+    """Return a proxy for module `name`; the import happens on first use"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
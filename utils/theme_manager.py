@@ -2,6 +2,7 @@ from kivymd.app import MDApp
 from utils.constants import Colors
 import json
 import os
+import weakref
 
 
 class ThemeManager:
@@ -11,7 +12,7 @@ class ThemeManager:
 
     def __init__(self):
         self.app = MDApp.get_running_app()
-        self.observers = set()  # Widgets that observe theme changes
+        self.observers = weakref.WeakSet()  # Widgets that observe theme changes (never kept alive)
         self.current_theme = "Dark"
         self.auto_theme = False
         self.theme_colors = {}
@@ -72,9 +73,11 @@ class ThemeManager:
 
         self.current_theme = theme_style
 
-        # Update KivyMD theme
+        # Update KivyMD theme; widgets bound to the theme tokens follow it
         if self.app:
             self.app.theme_cls.theme_style = theme_style
+        from utils.theme_tokens import get_theme_tokens
+        get_theme_tokens().theme_style = theme_style
 
         # Update color palette
         self.update_theme_colors()
@@ -91,7 +94,7 @@ class ThemeManager:
         self.set_theme(new_theme)
 
     def _notify_observers(self):
-        """Notify all registered observers of theme change"""
+        """Notify registered observers (widgets not bound to theme tokens)"""
         # Batch update to avoid multiple redraws
         for observer in list(self.observers):  # Use list to avoid modification during iteration
             try:
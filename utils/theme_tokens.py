@@ -0,0 +1,93 @@
+"""
+Theme Tokens - shared, observable style properties
+
+Widgets bind their colors to a token instead of being walked on every theme
+change:
+
+    tokens = get_theme_tokens()
+    tokens.bind(card=self._on_card)        # weak: does not keep the widget alive
+
+A theme flip is a single change of tokens.theme_style; every token is an
+AliasProperty of it, so Kivy notifies exactly the widgets bound to the
+tokens that changed - including rows in slides that are not on screen.
+"""
+
+from kivy.event import EventDispatcher
+from kivy.properties import AliasProperty, OptionProperty
+
+from utils.constants import Colors
+
+# token name -> (dark value, light value)
+TOKEN_VALUES = {
+    'bg': (Colors.DARK_BG, Colors.LIGHT_BG),
+    'card': (Colors.DARK_CARD, Colors.LIGHT_CARD),
+    'text': (Colors.DARK_TEXT, Colors.LIGHT_TEXT),
+    'hint': (Colors.HINT_TEXT_DARK, Colors.HINT_TEXT_LIGHT),
+    'border': ((0.3, 0.3, 0.3, 1), (0.9, 0.9, 0.9, 1)),
+    'tab_inactive': ((0.7, 0.7, 0.7, 1), (0.4, 0.4, 0.4, 1)),
+    'selected': ((0.16, 0.27, 0.45, 1), (0.84, 0.9, 1, 1)),
+}
+
+
+def _token(name):
+    dark, light = TOKEN_VALUES[name]
+
+    def getter(self):
+        return dark if self.theme_style == "Dark" else light
+
+    return AliasProperty(getter, None, bind=['theme_style'], cache=True)
+
+
+class ThemeTokens(EventDispatcher):
+    """Style properties derived from the theme style"""
+
+    theme_style = OptionProperty("Dark", options=["Light", "Dark"])
+
+    bg = _token('bg')
+    card = _token('card')
+    text = _token('text')
+    hint = _token('hint')
+    border = _token('border')
+    tab_inactive = _token('tab_inactive')
+    selected = _token('selected')
+
+    # Theme independent
+    primary = Colors.PRIMARY_BLUE
+    completed_text = (0.5, 0.5, 0.5, 1)
+    motivation = (0.1, 0.6, 0.3, 1)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._app_bound = False
+
+    @property
+    def is_dark(self):
+        return self.theme_style == "Dark"
+
+    def follow_app(self):
+        """Track the running app's theme_cls.theme_style (once an app exists)"""
+        if self._app_bound:
+            return
+
+        from kivymd.app import MDApp
+
+        app = MDApp.get_running_app()
+        if app is None or app.theme_cls is None:
+            return
+
+        self.theme_style = app.theme_cls.theme_style
+        app.theme_cls.bind(theme_style=self.setter('theme_style'))
+        self._app_bound = True
+
+
+# Global token instance
+_tokens = None
+
+
+def get_theme_tokens():
+    """Get global theme tokens, following the app theme when one is running"""
+    global _tokens
+    if _tokens is None:
+        _tokens = ThemeTokens()
+    _tokens.follow_app()
+    return _tokens